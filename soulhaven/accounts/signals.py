@@ -20,7 +20,7 @@ def create_user_profile(sender, instance, created, **kwargs):
         
         UserProfile.objects.create(user=instance, nickname=instance.username)
 
-        award_stars(instance, action_name='Registration Reward', amount=10)
+        award_stars(instance, action_name='Registration Reward', amount=10, reward_key='registration')
 
 
 @receiver(post_save, sender=User)
@@ -52,4 +52,9 @@ def reward_login_if_first_today(sender, request, user, **kwargs):
         profile.log_ins.append(today)
         profile.save()
 
-        award_stars(user=request.user, action_name='Daily Login Reward', amount=50)
+        award_stars(
+            user=request.user,
+            action_name='Daily Login Reward',
+            amount=50,
+            reward_key=f'daily-login:{today.isoformat()}',
+        )
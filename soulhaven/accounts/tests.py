@@ -1,3 +1,67 @@
-from django.test import TestCase
+from datetime import datetime, timedelta
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from stars.models import StarAction, StarHistory
+from .views import star_history_view
+
+
+class StarHistoryViewTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user(username='nora', password='pass')
+        self.game = StarAction.objects.create(name='Game Completion: firefly', amount=5)
+        self.login = StarAction.objects.create(name='Daily Login Reward', amount=10)
+
+    def _add(self, action, earned_at, count=1):
+        entries = StarHistory.objects.bulk_create(
+            StarHistory(user=self.user, action=action, amount=action.amount) for _ in range(count)
+        )
+        # earned_at is auto_now_add, so set it afterwards.
+        StarHistory.objects.filter(pk__in=[entry.pk for entry in entries]).update(earned_at=earned_at)
+        return entries
+
+    def _get(self, **params):
+        request = self.factory.get('/accounts/star-history/', params)
+        request.user = self.user
+        return star_history_view(request)
+
+    def test_cursor_walks_every_entry_once_across_timestamp_ties(self):
+        moment = timezone.now().replace(microsecond=0)
+        self._add(self.game, moment, count=5)
+        self._add(self.login, moment - timedelta(hours=1), count=2)
+
+        seen = []
+        cursor = None
+        while True:
+            params = {'limit': 2, **({'cursor': cursor} if cursor else {})}
+            with self.assertNumQueries(1):
+                payload = self._get(**params).json()
+            seen.extend(entry['action'] for entry in payload['history'])
+            cursor = payload['next_cursor']
+            if cursor is None:
+                break
+
+        self.assertEqual(seen, [self.game.name] * 5 + [self.login.name] * 2)
+
+    def test_malformed_parameters_return_400(self):
+        for params in ({'cursor': 'garbage'}, {'limit': 'ten'}, {'start': '2026-13-01'}):
+            with self.subTest(params=params):
+                self.assertEqual(self._get(**params).status_code, 400)
+
+    def test_date_range_and_action_prefix_filters(self):
+        def day(d):
+            return timezone.make_aware(datetime(2026, 10, d, 12))
+
+        self._add(self.game, day(1))
+        self._add(self.login, day(2))
+        self._add(self.game, day(3))
+        self._add(self.game, day(5))
+
+        history = self._get(start='2026-10-02', end='2026-10-03').json()['history']
+        self.assertEqual([entry['action'] for entry in history], [self.game.name, self.login.name])
+
+        history = self._get(action='Game Completion', end='2026-10-03').json()['history']
+        self.assertEqual([entry['earned_at'][:10] for entry in history], ['2026-10-03', '2026-10-01'])
@@ -10,6 +10,11 @@ from stars.models import StarHistory
 from achievements.models import UserAchievement
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from main.pagination import decode_cursor, encode_cursor, parse_page_size
+from main.utils import parse_day, start_of_day
+from datetime import timedelta
 import json
 
 
@@ -184,24 +189,77 @@ def calendar_view(request):
 @login_required
 def star_history_view(request):
     """
-    API endpoint to return user's star earning history.
+    API endpoint to return a page of the user's star earning history.
 
     - Requires login.
-    - Returns a list of actions with timestamps and amount of stars.
+    - Newest entries first, paginated by keyset on (earned_at, id), so each
+      page costs the same however long the history is.
+
+    Query parameters (all optional):
+    - limit: Page size (default 50, max 200).
+    - cursor: `next_cursor` value from the previous page.
+    - start / end: Inclusive date range (YYYY-MM-DD).
+    - action: Only entries whose action name starts with this prefix
+              (e.g. "Game Completion").
+
+    Returns:
+    - 200: {'history': [...], 'next_cursor': str or None}
+    - 400: Invalid limit, cursor or date
 
     Method: GET
     """
-    history = StarHistory.objects.filter(user=request.user).select_related('action').order_by('-earned_at')
+    try:
+        limit = parse_page_size(request.GET.get('limit'))
+        start = parse_day(request.GET.get('start'))
+        end = parse_day(request.GET.get('end'))
+    except ValueError:
+        return JsonResponse({'error': 'Invalid limit or date'}, status=400)
+
+    history = StarHistory.objects.filter(user=request.user)
+
+    if start:
+        history = history.filter(earned_at__gte=start_of_day(start))
+    if end:
+        history = history.filter(earned_at__lt=start_of_day(end + timedelta(days=1)))
+
+    action_prefix = request.GET.get('action')
+    if action_prefix:
+        history = history.filter(action__name__startswith=action_prefix)
+
+    cursor = request.GET.get('cursor')
+    if cursor:
+        try:
+            earned_at, entry_id = decode_cursor(cursor, 2)
+            earned_at = parse_datetime(earned_at)
+            entry_id = int(entry_id)
+            if earned_at is None:
+                raise ValueError('Invalid cursor')
+        except (ValueError, TypeError):
+            return JsonResponse({'error': 'Invalid cursor'}, status=400)
+        history = history.filter(
+            Q(earned_at__lt=earned_at) | Q(earned_at=earned_at, id__lt=entry_id)
+        )
+
+    entries = list(
+        history.order_by('-earned_at', '-id').values('id', 'action__name', 'amount', 'earned_at')[:limit + 1]
+    )
+
+    next_cursor = None
+    if len(entries) > limit:
+        entries = entries[:limit]
+        last = entries[-1]
+        next_cursor = encode_cursor(last['earned_at'].isoformat(), last['id'])
 
     return JsonResponse({
         'history': [
             {
-                'action': entry.action.name,
-                'amount': entry.action.amount,
-                'earned_at': entry.earned_at.isoformat()
+                'action': entry['action__name'],
+                'amount': entry['amount'],
+                'earned_at': entry['earned_at'].isoformat()
             }
-            for entry in history
-        ]
+            for entry in entries
+        ],
+        'next_cursor': next_cursor,
     })
 
 
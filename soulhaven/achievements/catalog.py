@@ -0,0 +1,78 @@
+import threading
+
+from django.db import transaction
+
+from main.caching import bump_version, get_version
+from .models import Achievement
+
+CATALOG_NAMESPACE = 'achievements.catalog'
+
+
+class AchievementCatalog:
+    """
+    Per-process map of achievement names to ids.
+
+    - The whole Achievement table (a small, admin-managed catalog) is loaded
+      in one query the first time it is needed and kept for the worker's lifetime.
+    - It is reloaded when the shared catalog version (see main.caching) changes,
+      which happens whenever an achievement is edited or deleted.
+    """
+
+    def __init__(self):
+        self._ids = None
+        self._version = None
+        self._lock = threading.Lock()
+
+    def _ensure_loaded(self):
+        version = get_version(CATALOG_NAMESPACE)
+        if self._ids is None or version != self._version:
+            self._ids = dict(Achievement.objects.values_list('name', 'id'))
+            self._version = version
+
+    def ids(self):
+        """
+        Returns:
+        - dict: {achievement name: id} for every known achievement.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            return dict(self._ids)
+
+    def get_id(self, name, description=None, image=None):
+        """
+        Returns the id of the achievement called `name`, creating it if it does not exist.
+
+        Parameters:
+        - name (str): Unique achievement name.
+        - description (str, optional): Used only if the achievement is created.
+        - image (str, optional): Image path, used only if the achievement is created.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            achievement_id = self._ids.get(name)
+        if achievement_id is not None:
+            return achievement_id
+
+        achievement, created = Achievement.objects.get_or_create(
+            name=name,
+            defaults={'description': description or '', 'image': image}
+        )
+        # Only remember rows that are known to be committed.
+        transaction.on_commit(lambda: self._remember(name, achievement.id))
+        return achievement.id
+
+    def _remember(self, name, achievement_id):
+        with self._lock:
+            if self._ids is not None:
+                self._ids[name] = achievement_id
+
+    def invalidate(self):
+        """
+        Drops this worker's copy and bumps the shared version so every worker reloads.
+        """
+        with self._lock:
+            self._ids = None
+            self._version = bump_version(CATALOG_NAMESPACE)
+
+
+achievement_catalog = AchievementCatalog()
@@ -0,0 +1,202 @@
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+
+# Model imports happen inside functions: spawned workers import this module
+# before django.setup() has run in them.
+
+INSERT_BATCH_SIZE = 1000
+
+
+def _init_worker():
+    """
+    Prepares a freshly spawned worker: sets Django up so it opens its own
+    database connection on first use.
+    """
+    django.setup()
+
+
+class _InProcessExecutor:
+    """
+    Runs every submitted chunk right away in this process. Used for --workers 1,
+    which needs neither a pool nor extra database connections.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as exc:
+            future.set_exception(exc)
+        return future
+
+
+def _recompute_chunk(user_ids, achievement_ids, rule_names, dry_run):
+    """
+    Recomputes achievements for one chunk of users inside a worker process.
+
+    Parameters:
+    - user_ids (list): The users in this chunk.
+    - achievement_ids (dict): {rule name: achievement id}.
+    - rule_names (list): Names of the rules to evaluate.
+    - dry_run (bool): Count missing achievements without inserting them.
+
+    Returns:
+    - tuple: (number of users, number of missing achievements found or inserted)
+    """
+    from achievements.models import UserAchievement
+    from achievements.utils import insert_user_achievements, reached_rules, rules_for, snapshot_for
+
+    rules = [rule for rule in rules_for() if rule['name'] in rule_names]
+    snapshot = snapshot_for(user_ids, rules)
+    rows = [
+        (user_id, achievement_ids[rule['name']])
+        for user_id, stats in snapshot.items()
+        for rule in reached_rules(stats, rules)
+    ]
+
+    if dry_run:
+        owned = set(UserAchievement.objects.filter(
+            user_id__in=user_ids, achievement_id__in=achievement_ids.values()
+        ).values_list('user_id', 'achievement_id'))
+        return len(user_ids), len(set(rows) - owned)
+
+    inserted = 0
+    for offset in range(0, len(rows), INSERT_BATCH_SIZE):
+        inserted += len(insert_user_achievements(rows[offset:offset + INSERT_BATCH_SIZE]))
+    return len(user_ids), inserted
+
+
+class Command(BaseCommand):
+    """
+    Re-evaluates every achievement rule for every user and awards what is missing.
+
+    Run after adding or changing an achievement rule. Users are walked in primary-key
+    chunks and fanned out over a process pool (one database connection per worker);
+    with --workers 1 the chunks run in this process.
+
+    Examples:
+    - python manage.py recompute_achievements --dry-run
+    - python manage.py recompute_achievements --workers 8 --checkpoint /tmp/achievements.json
+    - python manage.py recompute_achievements --achievement "Course Explorer"
+    """
+    help = 'Recompute achievements for all users and bulk-insert the missing ones.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Users per chunk (default 1000).')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes (default: CPU count).')
+        parser.add_argument('--achievement', action='append', dest='achievements', help='Only this rule (repeatable).')
+        parser.add_argument('--dry-run', action='store_true', help='Report missing achievements without inserting them.')
+        parser.add_argument('--checkpoint', help='JSON file recording the last fully processed user id; resumes from it (not written on dry runs).')
+
+    def handle(self, *args, **options):
+        from django.contrib.auth.models import User
+        from achievements.catalog import achievement_catalog
+        from achievements.utils import rules_for
+
+        rules = rules_for()
+        if options['achievements']:
+            rules = [rule for rule in rules if rule['name'] in options['achievements']]
+            unknown = set(options['achievements']) - {rule['name'] for rule in rules}
+            if unknown:
+                raise CommandError(f"Unknown achievement rule(s): {', '.join(sorted(unknown))}")
+
+        if options['dry_run']:
+            # Achievements not created yet get distinct placeholder ids no user can own.
+            known = achievement_catalog.ids()
+            achievement_ids = {rule['name']: known.get(rule['name'], -index) for index, rule in enumerate(rules, 1)}
+        else:
+            achievement_ids = {
+                rule['name']: achievement_catalog.get_id(rule['name'], rule['description'], rule['image'])
+                for rule in rules
+            }
+        rule_names = [rule['name'] for rule in rules]
+
+        last_id = self._load_checkpoint(options['checkpoint'])
+        if last_id:
+            self.stdout.write(f'Resuming after user id {last_id}.')
+
+        started = time.monotonic()
+        users = found = 0
+        pending = {}
+        finished = {}
+        next_index = committed_index = 0
+        chunk_ends = {}
+
+        if options['workers'] == 1:
+            executor = _InProcessExecutor()
+        else:
+            executor = ProcessPoolExecutor(
+                max_workers=options['workers'], mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+            )
+        with executor as pool:
+            cursor = last_id
+            exhausted = False
+            while pending or not exhausted:
+                while not exhausted and len(pending) < options['workers'] * 2:
+                    chunk = list(
+                        User.objects.filter(pk__gt=cursor).order_by('pk').values_list('pk', flat=True)[:options['chunk_size']]
+                    )
+                    if not chunk:
+                        exhausted = True
+                        break
+                    cursor = chunk[-1]
+                    future = pool.submit(_recompute_chunk, chunk, achievement_ids, rule_names, options['dry_run'])
+                    pending[future] = next_index
+                    chunk_ends[next_index] = cursor
+                    next_index += 1
+
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    chunk_users, chunk_found = future.result()
+                    users += chunk_users
+                    found += chunk_found
+                    finished[index] = True
+
+                # The checkpoint only moves past chunks whose predecessors are all done.
+                while finished.pop(committed_index, False):
+                    end = chunk_ends.pop(committed_index)
+                    if not options['dry_run']:
+                        self._save_checkpoint(options['checkpoint'], end)
+                    committed_index += 1
+
+                seconds = time.monotonic() - started
+                self.stdout.write(f'  {users} users processed, {found} missing ({users / seconds:.0f} users/s)')
+
+        seconds = time.monotonic() - started
+        verb = 'would be inserted' if options['dry_run'] else 'inserted'
+        self.stdout.write(self.style.SUCCESS(
+            f'{users} users processed in {seconds:.2f}s '
+            f'({users / seconds if seconds else 0:.0f} users/s); {found} achievements {verb}.'
+        ))
+
+    def _load_checkpoint(self, path):
+        if not path or not os.path.exists(path):
+            return 0
+        try:
+            with open(path) as fh:
+                return int(json.load(fh)['last_user_id'])
+        except (OSError, ValueError, KeyError) as exc:
+            raise CommandError(f'Could not read checkpoint {path}: {exc}')
+
+    def _save_checkpoint(self, path, last_user_id):
+        if not path:
+            return
+        with open(path, 'w') as fh:
+            json.dump({'last_user_id': last_user_id}, fh)
@@ -0,0 +1,93 @@
+from games.models import GameType
+
+# Achievement rules as data.
+#
+# Each rule is unlocked once the user's `stat` (see achievements.stats) reaches
+# `threshold`. Rules sharing a stat share its query, so adding a rule for an
+# existing stat adds no per-request queries.
+ACHIEVEMENT_RULES = [
+    {
+        'name': "First Course Completed",
+        'description': "You completed your first full course!",
+        'image': "achievements/first_course.png",
+        'stat': 'courses_completed',
+        'threshold': 1,
+    },
+    {
+        'name': "Course Explorer",
+        'description': "You’ve completed 3 courses — great learning streak!",
+        'image': "achievements/three_courses.png",
+        'stat': 'courses_completed',
+        'threshold': 3,
+    },
+    {
+        'name': "First Challenge Completed",
+        'description': "You completed your first challenge!",
+        'image': "achievements/first_challenge.png",
+        'stat': 'challenges_completed',
+        'threshold': 1,
+    },
+    {
+        'name': "Challenge Streak",
+        'description': "You’ve completed 3 challenges. Keep it up!",
+        'image': "achievements/challenge_streak.png",
+        'stat': 'challenges_completed',
+        'threshold': 3,
+    },
+    {
+        'name': "Challenge Master",
+        'description': "You’ve completed 10 challenges — you're unstoppable!",
+        'image': "achievements/challenge_master.png",
+        'stat': 'challenges_completed',
+        'threshold': 10,
+    },
+    {
+        'name': "Weekly Completionist",
+        'description': "You've completed all challenges of the week!",
+        'image': "achievements/weekly_completionist.png",
+        'stat': 'weekly_challenges_completed',
+        'threshold': 1,
+    },
+    {
+        'name': "Challenge Consistency",
+        'description': "You completed a challenge every day for 14 days!",
+        'image': "achievements/consistency_14.png",
+        'stat': 'challenge_streak_days',
+        'threshold': 14,
+    },
+    {
+        'name': "Puzzle Starter",
+        'description': "You played a puzzle game for the first time!",
+        'image': "achievements/puzzle_starter.png",
+        'stat': f'games_played:{GameType.PUZZLES.value}',
+        'threshold': 1,
+    },
+    {
+        'name': "Mandala Beginner",
+        'description': "You colored your first mandala!",
+        'image': "achievements/mandala_beginner.png",
+        'stat': f'games_played:{GameType.MANDALAS.value}',
+        'threshold': 1,
+    },
+    {
+        'name': "Bubble Popper",
+        'description': "You popped your first bubble!",
+        'image': "achievements/bubble_popper.png",
+        'stat': f'games_played:{GameType.POP_BUBBLES.value}',
+        'threshold': 1,
+    },
+    {
+        'name': "Rhythm Rider",
+        'description': "You chased your first firefly!",
+        'image': "achievements/rhythm_rider.png",
+        'stat': f'games_played:{GameType.FIREFLY.value}',
+        'threshold': 1,
+    },
+    {
+        'name': "Phrase Crafter",
+        'description': "You built your first phrase!",
+        'image': "achievements/phrase_crafter.png",
+        'stat': f'games_played:{GameType.PHRASES.value}',
+        'threshold': 1,
+    },
+]
@@ -0,0 +1,20 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .catalog import achievement_catalog
+from .models import Achievement
+
+
+@receiver(post_save, sender=Achievement)
+@receiver(post_delete, sender=Achievement)
+def invalidate_achievement_catalog(sender, instance, created=False, **kwargs):
+    """
+    Signal: Reloads every worker's achievement catalog when an achievement is
+    renamed or deleted (e.g. through the admin).
+
+    - Newly created achievements are picked up on the first lookup that misses.
+    - The reload is deferred until the transaction commits, so no worker can
+      cache the pre-commit table after the version was bumped.
+    """
+    if not created:
+        transaction.on_commit(achievement_catalog.invalidate)
@@ -0,0 +1,94 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db.models import Count
+from django.utils import timezone
+from challenges.models import ChallengeStreak, ProgressCounter, UserChallenge
+from challenges.registry import active_challenges
+from games.models import GamePlayStats
+
+# Every stat source answers one kind of stat for many users with a single
+# grouped query, so a snapshot costs a fixed number of queries no matter how
+# many rules or users it serves.
+
+
+def _courses_completed(user_ids, now):
+    # Maintained per course completion (see challenges.counters), so the cost
+    # does not grow with the number of courses a user has finished.
+    rows = ProgressCounter.objects.filter(user_id__in=user_ids, courses_completed__gt=0).values_list(
+        'user_id', 'courses_completed'
+    )
+    return {user_id: {'courses_completed': n} for user_id, n in rows}
+
+
+def _challenges_completed(user_ids, now):
+    rows = UserChallenge.objects.filter(user_id__in=user_ids, completed=True).values('user_id').annotate(
+        n=Count('id')
+    ).order_by()
+    return {row['user_id']: {'challenges_completed': row['n']} for row in rows}
+
+
+def _weekly_challenges_completed(user_ids, now):
+    weekly = [challenge.id for challenge in active_challenges.weekly()]
+    total = len(weekly)
+    if not total:
+        return {}
+    rows = UserChallenge.objects.filter(
+        user_id__in=user_ids, completed=True, challenge_id__in=weekly
+    ).values('user_id').annotate(n=Count('id')).order_by()
+    return {row['user_id']: {'weekly_challenges_completed': int(row['n'] >= total)} for row in rows}
+
+
+def _challenge_streak_days(user_ids, now):
+    # A streak that last grew yesterday is still alive today; older ones are broken.
+    yesterday = timezone.localdate(now) - timedelta(days=1)
+    rows = ChallengeStreak.objects.filter(
+        user_id__in=user_ids, last_active_day__gte=yesterday
+    ).values_list('user_id', 'current_streak')
+    return {user_id: {'challenge_streak_days': streak} for user_id, streak in rows}
+
+
+def _games_played(user_ids, now):
+    stats = defaultdict(dict)
+    rows = GamePlayStats.objects.filter(user_id__in=user_ids).values_list('user_id', 'game_type', 'play_count')
+    for user_id, game_type, play_count in rows:
+        stats[user_id][f"games_played:{game_type}"] = play_count
+    return stats
+
+
+# stat group -> (event that can change it, source function)
+STAT_SOURCES = {
+    'courses_completed': ('course', _courses_completed),
+    'challenges_completed': ('challenge', _challenges_completed),
+    'weekly_challenges_completed': ('challenge', _weekly_challenges_completed),
+    'challenge_streak_days': ('challenge', _challenge_streak_days),
+    'games_played': ('game', _games_played),
+}
+
+
+def stat_group(stat):
+    """
+    Returns the source group of a stat name ("games_played:puzzles" -> "games_played").
+    """
+    return stat.split(':', 1)[0]
+
+
+def collect_stats(user_ids, groups):
+    """
+    Builds a stats snapshot for many users at once.
+
+    Parameters:
+    - user_ids (iterable of int): Users to snapshot.
+    - groups (iterable of str): Stat groups to fetch (keys of STAT_SOURCES).
+
+    Returns:
+    - dict: {user_id: {stat name: value}}; missing stats count as 0.
+    """
+    user_ids = list(user_ids)
+    now = timezone.now()
+    snapshot = {user_id: {} for user_id in user_ids}
+    for group in groups:
+        _, source = STAT_SOURCES[group]
+        for user_id, stats in source(user_ids, now).items():
+            snapshot[user_id].update(stats)
+    return snapshot
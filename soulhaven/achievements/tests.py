@@ -1 +1,136 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
 from django.test import TestCase
+from django.utils import timezone
+
+from games.models import GameType
+from games.stats import record_game_play
+from .catalog import achievement_catalog
+from .models import Achievement, UserAchievement
+from .utils import award_achievement, evaluate_achievements, evaluate_counter_achievements
+
+
+class AwardAchievementTests(TestCase):
+    def setUp(self):
+        achievement_catalog.invalidate()
+        self.user = User.objects.create_user(username='dana', password='pass')
+        Achievement.objects.create(name='First Course Completed', description='...')
+
+    def test_award_is_granted_once(self):
+        self.assertTrue(award_achievement(self.user, 'First Course Completed'))
+        self.assertFalse(award_achievement(self.user, 'First Course Completed'))
+        self.assertEqual(UserAchievement.objects.filter(user=self.user).count(), 1)
+
+    def test_known_achievement_costs_one_query(self):
+        achievement_catalog.ids()
+
+        with self.assertNumQueries(1):
+            award_achievement(self.user, 'First Course Completed')
+
+    def test_rename_reloads_catalog_after_commit(self):
+        achievement = Achievement.objects.get(name='First Course Completed')
+        achievement_catalog.ids()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            achievement.name = 'Course Graduate'
+            achievement.save()
+            self.assertIn('First Course Completed', achievement_catalog.ids())
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(achievement_catalog.ids(), {'Course Graduate': achievement.id})
+
+    def test_unknown_achievement_is_created(self):
+        self.assertTrue(award_achievement(self.user, 'Bubble Popper', 'You popped your first bubble!'))
+        self.assertEqual(Achievement.objects.get(name='Bubble Popper').description, 'You popped your first bubble!')
+
+
+class EvaluateAchievementsTests(TestCase):
+    def setUp(self):
+        achievement_catalog.invalidate()
+        self.user = User.objects.create_user(username='erin', password='pass')
+
+    def test_game_rules_unlock_once(self):
+        record_game_play(self.user.pk, GameType.PUZZLES, timezone.now())
+
+        unlocked = evaluate_achievements(self.user, trigger='game')
+        self.assertEqual([a['name'] for a in unlocked], ['Puzzle Starter'])
+        self.assertEqual(evaluate_achievements(self.user, trigger='game'), [])
+
+    def test_query_count_does_not_grow_with_rules(self):
+        achievement_catalog.ids()
+        record_game_play(self.user.pk, GameType.PUZZLES, timezone.now())
+        evaluate_achievements(self.user, trigger='game')
+
+        # One grouped stats query plus one insert, however many game rules exist.
+        with self.assertNumQueries(2):
+            evaluate_achievements(self.user, trigger='game')
+
+
+class CounterAchievementsTests(TestCase):
+    def setUp(self):
+        achievement_catalog.invalidate()
+        self.user = User.objects.create_user(username='finn', password='pass')
+
+    def test_awarded_only_when_threshold_is_crossed(self):
+        achievement_catalog.ids()
+        stat = f'games_played:{GameType.MANDALAS.value}'
+
+        unlocked = evaluate_counter_achievements(self.user, stat, 1)
+        self.assertEqual([a['name'] for a in unlocked], ['Mandala Beginner'])
+        with self.assertNumQueries(0):
+            self.assertEqual(evaluate_counter_achievements(self.user, stat, 2), [])
+
+
+class RecomputeAchievementsCommandTests(TestCase):
+    def setUp(self):
+        achievement_catalog.invalidate()
+        self.users = [User.objects.create_user(username=f'gamer{i}', password='pass') for i in range(5)]
+        for user in self.users:
+            record_game_play(user.pk, GameType.PUZZLES, timezone.now())
+        record_game_play(self.users[0].pk, GameType.MANDALAS, timezone.now())
+
+    def _recompute(self, *args):
+        out = StringIO()
+        call_command('recompute_achievements', '--workers', '1', '--chunk-size', '2', *args, stdout=out)
+        return out.getvalue()
+
+    def _awarded(self):
+        return set(UserAchievement.objects.values_list('user__username', 'achievement__name'))
+
+    def test_missing_achievements_are_inserted_in_chunks(self):
+        award_achievement(self.users[1], 'Puzzle Starter')
+
+        self.assertIn('5 achievements inserted', self._recompute())
+        self.assertEqual(len(self._awarded()), 6)
+        self.assertIn(('gamer0', 'Mandala Beginner'), self._awarded())
+        self.assertIn('0 achievements inserted', self._recompute())
+
+    def test_dry_run_reports_without_writing(self):
+        self.assertIn('6 achievements would be inserted', self._recompute('--dry-run'))
+        self.assertEqual(UserAchievement.objects.count(), 0)
+
+    def test_checkpoint_resumes_after_the_recorded_user(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'checkpoint.json')
+            with open(path, 'w') as fh:
+                json.dump({'last_user_id': self.users[2].pk}, fh)
+
+            output = self._recompute('--checkpoint', path)
+
+            with open(path) as fh:
+                self.assertEqual(json.load(fh), {'last_user_id': User.objects.order_by('pk').last().pk})
+
+        self.assertIn(f'Resuming after user id {self.users[2].pk}.', output)
+        self.assertEqual(self._awarded(), {('gamer3', 'Puzzle Starter'), ('gamer4', 'Puzzle Starter')})
+
+    def test_achievement_filter(self):
+        self._recompute('--achievement', 'Mandala Beginner')
+        self.assertEqual(self._awarded(), {('gamer0', 'Mandala Beginner')})
+
+        with self.assertRaises(CommandError):
+            self._recompute('--achievement', 'No Such Achievement')
@@ -1,4 +1,45 @@
-from .models import Achievement, UserAchievement
+from django.db import connection
+from django.utils import timezone
+from .catalog import achievement_catalog
+from .models import UserAchievement
+from .rules import ACHIEVEMENT_RULES
+from .stats import STAT_SOURCES, collect_stats, stat_group
+
+
+def insert_user_achievements(rows):
+    """
+    Inserts UserAchievement rows in one statement, skipping ones the user already has.
+
+    Parameters:
+    - rows (list): (user_id, achievement_id) pairs.
+
+    Logic:
+    - INSERT ... ON CONFLICT DO NOTHING against the (user, achievement)
+      unique_together constraint, so concurrent requests cannot award twice.
+
+    Returns:
+    - list: (user_id, achievement_id) for every row actually inserted.
+    """
+    if not rows:
+        return []
+
+    opts = UserAchievement._meta
+    qn = connection.ops.quote_name
+    user_column = qn(opts.get_field('user').column)
+    achievement_column = qn(opts.get_field('achievement').column)
+    values = ', '.join(['(%s, %s, %s)'] * len(rows))
+    now = timezone.now()
+    params = [value for row in rows for value in (*row, now)]
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {qn(opts.db_table)} ({user_column}, {achievement_column}, {qn(opts.get_field('awarded_at').column)}) "
+            f"VALUES {values} ON CONFLICT ({user_column}, {achievement_column}) DO NOTHING "
+            f"RETURNING {user_column}, {achievement_column}",
+            params,
+        )
+        return cursor.fetchall()
+
 
 def award_achievement(user, name, description=None, image=None):
     """
@@ -10,19 +51,141 @@ def award_achievement(user, name, description=None, image=None):
     - description (optional): Description of the achievement (used if created).
     - image (optional): Image path or object associated with the achievement (used if created).
 
+    Logic:
+    - Resolves the achievement id from the per-worker catalog (no query once loaded).
+    - Inserts the UserAchievement with a single INSERT ... ON CONFLICT DO NOTHING.
+
     Returns:
     - True if the achievement was awarded.
     - False if the user already had this achievement.
     """
-    achievement, _ = Achievement.objects.get_or_create(
-        name=name,
-        defaults={
-            'description': description or '',
-            'image': image  
-        }
-    )
+    achievement_id = achievement_catalog.get_id(name, description, image)
+    return bool(insert_user_achievements([(user.pk, achievement_id)]))
+
+
+def rules_for(trigger=None):
+    """
+    Returns the achievement rules whose stat can change on `trigger`
+    ("course", "game" or "challenge"), or every rule if trigger is None.
+    """
+    return [
+        rule for rule in ACHIEVEMENT_RULES
+        if trigger is None or STAT_SOURCES[stat_group(rule['stat'])][0] == trigger
+    ]
+
+
+def snapshot_for(user_ids, rules):
+    """
+    Fetches the stats `rules` need for many users, one query set per stat group.
+
+    Returns:
+    - dict: {user_id: {stat name: value}} (see achievements.stats.collect_stats).
+    """
+    groups = {stat_group(rule['stat']) for rule in rules}
+    return collect_stats(user_ids, groups)
+
+
+def reached_rules(stats, rules):
+    """
+    Returns the rules whose threshold is reached by one user's stats.
+    """
+    return [rule for rule in rules if stats.get(rule['stat'], 0) >= rule['threshold']]
+
+
+def evaluate_achievements(user, trigger=None):
+    """
+    Evaluates achievement rules for a user and awards every newly reached one.
+
+    Parameters:
+    - user: The User instance to evaluate.
+    - trigger (str, optional): The event that just happened ("course", "game" or
+                               "challenge"); limits evaluation to rules it can affect.
+
+    Logic:
+    - Builds one stats snapshot with a fixed number of grouped queries (one per
+      stat group involved, independent of the number of rules).
+    - Inserts all reached achievements with one INSERT ... ON CONFLICT DO NOTHING;
+      achievements the user already holds are skipped by the database.
+
+    Returns:
+    - list: [{'name', 'description', 'image'}, ...] for newly unlocked achievements,
+            ready for the frontend.
+    """
+    rules = rules_for(trigger)
+    stats = snapshot_for([user.pk], rules)[user.pk]
+    return _award_rules(user, reached_rules(stats, rules))
+
+
+def evaluate_achievements_many(user_ids, trigger=None):
+    """
+    Bulk form of evaluate_achievements for many users (e.g. users credited by a
+    challenge re-evaluation).
+
+    Parameters:
+    - user_ids (list of int): The users to evaluate.
+    - trigger (str, optional): As for evaluate_achievements.
+
+    Logic:
+    - One stats snapshot for all users and one INSERT ... ON CONFLICT DO NOTHING
+      for every reached achievement.
+
+    Returns:
+    - list: (user_id, achievement_id) for every achievement newly awarded.
+    """
+    rules = rules_for(trigger)
+    achievement_ids = {
+        rule['name']: achievement_catalog.get_id(rule['name'], rule['description'], rule['image'])
+        for rule in rules
+    }
+    rows = [
+        (user_id, achievement_ids[rule['name']])
+        for user_id, stats in snapshot_for(user_ids, rules).items()
+        for rule in reached_rules(stats, rules)
+    ]
+    return insert_user_achievements(rows)
+
+
+def evaluate_counter_achievements(user, stat, value):
+    """
+    Awards the achievements an incrementing counter stat has just reached.
 
-    if not UserAchievement.objects.filter(user=user, achievement=achievement).exists():
-        UserAchievement.objects.create(user=user, achievement=achievement)
-        return True 
-    return False
\ No newline at end of file
+    Parameters:
+    - user: The User instance to evaluate.
+    - stat (str): The stat that was just incremented by one (e.g. "games_played:puzzles").
+    - value (int): Its new value, as returned by the counter's upsert.
+
+    Logic:
+    - A counter that grows by one crosses a threshold exactly when it equals it,
+      so only rules on this stat with threshold == value are awarded.
+    - No stats queries; no queries at all when no threshold is crossed.
+      Achievements missed this way (e.g. rules added later) are caught up by
+      the recompute_achievements command.
+
+    Returns:
+    - list: Newly unlocked achievements, as evaluate_achievements().
+    """
+    rules = [rule for rule in ACHIEVEMENT_RULES if rule['stat'] == stat and rule['threshold'] == value]
+    return _award_rules(user, rules)
+
+
+def _award_rules(user, rules):
+    """
+    Inserts the achievements of `rules` for a user in one statement and returns
+    the newly unlocked ones for the frontend.
+    """
+    if not rules:
+        return []
+    reached = {
+        achievement_catalog.get_id(rule['name'], rule['description'], rule['image']): rule
+        for rule in rules
+    }
+
+    inserted = insert_user_achievements([(user.pk, achievement_id) for achievement_id in reached])
+    return [
+        {
+            'name': reached[achievement_id]['name'],
+            'description': reached[achievement_id]['description'],
+            'image': reached[achievement_id]['image'],
+        }
+        for _, achievement_id in inserted
+    ]
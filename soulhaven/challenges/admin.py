@@ -1,6 +1,82 @@
-from django.contrib import admin
-from .models import Challenge, UserChallenge
+from django.contrib import admin, messages
+from django.db import transaction
+from django.utils import timezone
+from .models import Challenge, ChallengeType, UserChallenge
+from .reevaluate import challenge_counts, reevaluate_challenge
+from .registry import WEEK, active_challenges, week_start
 
+# Challenges with more candidate users than this are evaluated by the
+# reevaluate_challenges command rather than inside the admin request.
+ADMIN_EVALUATE_MAX_USERS = 5000
 
-admin.site.register(Challenge)
-admin.site.register(UserChallenge)
\ No newline at end of file
+
+@admin.register(Challenge)
+class ChallengeAdmin(admin.ModelAdmin):
+    """
+    Admin for challenges.
+
+    Single edits reload the active-challenge registry through the model signals;
+    the bulk actions below use one UPDATE, which sends no signals, so they
+    invalidate the registry themselves.
+    """
+    list_display = ('name', 'type', 'target_value', 'star_reward', 'active', 'starts_at', 'ends_at')
+    list_filter = ('type', 'active')
+    search_fields = ('name',)
+    actions = ('activate', 'deactivate', 'schedule_this_week', 'activate_and_evaluate')
+
+    @admin.action(description='Activate selected challenges')
+    def activate(self, request, queryset):
+        updated = queryset.update(active=True)
+        transaction.on_commit(active_challenges.invalidate)
+        self.message_user(request, f'{updated} challenge(s) activated.')
+
+    @admin.action(description='Deactivate selected challenges')
+    def deactivate(self, request, queryset):
+        updated = queryset.update(active=False)
+        transaction.on_commit(active_challenges.invalidate)
+        self.message_user(request, f'{updated} challenge(s) deactivated.')
+
+    @admin.action(description='Schedule selected challenges for the current week')
+    def schedule_this_week(self, request, queryset):
+        """
+        Sets the window to the current Monday-to-Monday week, making the challenges
+        count towards weekly rules (e.g. challenges created before windows existed).
+        """
+        week = week_start(timezone.now())
+        updated = queryset.update(starts_at=week, ends_at=week + WEEK)
+        transaction.on_commit(active_challenges.invalidate)
+        self.message_user(request, f'{updated} challenge(s) scheduled for the week of {week:%Y-%m-%d}.')
+
+    @admin.action(description='Activate and evaluate selected challenges for all users')
+    def activate_and_evaluate(self, request, queryset):
+        """
+        Activates the challenges and immediately credits users who already qualify.
+
+        Only challenges with at most ADMIN_EVALUATE_MAX_USERS candidate users are
+        evaluated inside the request; larger ones are left to the
+        reevaluate_challenges command, which the message names.
+        """
+        queryset.update(active=True)
+        transaction.on_commit(active_challenges.invalidate)
+        deferred = []
+        for challenge in queryset.exclude(type=ChallengeType.CUSTOM).order_by('pk'):
+            counts = challenge_counts(challenge)
+            if counts is not None and len(counts[:ADMIN_EVALUATE_MAX_USERS + 1]) > ADMIN_EVALUATE_MAX_USERS:
+                deferred.append(challenge)
+                continue
+            result = reevaluate_challenge(challenge)
+            self.message_user(
+                request,
+                f"{challenge}: {result['written']} progress rows written "
+                f"({result['rows_per_second']:.0f} rows/s), {result['completed']} completed.",
+            )
+        if deferred:
+            self.message_user(
+                request,
+                f"Too many users to evaluate here; run: python manage.py reevaluate_challenges "
+                f"{' '.join(str(challenge.pk) for challenge in deferred)}",
+                level=messages.WARNING,
+            )
+
+
+admin.site.register(UserChallenge)
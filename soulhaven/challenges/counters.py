@@ -0,0 +1,143 @@
+from django.db import connection
+from django.db.models import Count
+from courses.models import CourseProgress
+from games.partitions import played_game_types
+from .models import ProgressCounter
+
+
+def _columns():
+    opts = ProgressCounter._meta
+    qn = connection.ops.quote_name
+    return (
+        qn(opts.db_table),
+        *(qn(opts.get_field(name).column) for name in ('user', 'courses_completed', 'game_types')),
+    )
+
+
+def record_course_completed(user_id):
+    """
+    Counts one more distinct completed course for a user.
+
+    Called once per (user, course) when the course's test part is first completed;
+    CourseProgress's unique (user, course, part) guarantees that.
+
+    Returns:
+    - int: The user's new number of completed courses.
+    """
+    table, user_column, courses, game_types = _columns()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} ({user_column}, {courses}, {game_types}) VALUES (%s, 1, '{{}}') "
+            f"ON CONFLICT ({user_column}) DO UPDATE SET {courses} = {table}.{courses} + 1 "
+            f"RETURNING {courses}",
+            [user_id],
+        )
+        return cursor.fetchone()[0]
+
+
+def record_game_played(user_id, game_type):
+    """
+    Adds a game type to the set of game types a user has played.
+
+    Logic:
+    - One INSERT ... ON CONFLICT DO UPDATE; the type is appended only if it is
+      not in the array yet, so replaying a game changes nothing.
+
+    Returns:
+    - int: The user's new number of distinct game types played.
+    """
+    table, user_column, courses, game_types = _columns()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} ({user_column}, {courses}, {game_types}) VALUES (%s, 0, ARRAY[%s]::varchar[]) "
+            f"ON CONFLICT ({user_column}) DO UPDATE SET {game_types} = CASE "
+            f"WHEN EXCLUDED.{game_types} <@ {table}.{game_types} THEN {table}.{game_types} "
+            f"ELSE {table}.{game_types} || EXCLUDED.{game_types} END "
+            f"RETURNING cardinality({game_types})",
+            [user_id, game_type],
+        )
+        return cursor.fetchone()[0]
+
+
+def progress_counts(user):
+    """
+    Returns (courses_completed, game_types_played) for a user from their counter row.
+    """
+    row = ProgressCounter.objects.filter(user=user).values_list('courses_completed', 'game_types').first()
+    if row is None:
+        return 0, 0
+    return row[0], len(row[1])
+
+
+def actual_counters(user_ids):
+    """
+    Recomputes progress counters from the source tables for many users.
+
+    Parameters:
+    - user_ids (iterable of int): Users to recompute.
+
+    Logic:
+    - Grouped queries: distinct courses with a completed test part, and
+      distinct game types played, including months already archived out of
+      CompletedGame into GameMonthlySummary (see games.partitions).
+
+    Returns:
+    - dict: {user_id: (courses_completed, sorted list of game types)} for users with any history.
+    """
+    user_ids = list(user_ids)
+    courses = dict(
+        CourseProgress.objects.filter(user_id__in=user_ids, part='test').values('user_id').annotate(
+            n=Count('course', distinct=True)
+        ).order_by().values_list('user_id', 'n')
+    )
+    game_types = {user_id: sorted(types) for user_id, types in played_game_types(user_ids).items()}
+
+    return {
+        user_id: (courses.get(user_id, 0), game_types.get(user_id, []))
+        for user_id in courses.keys() | game_types.keys()
+    }
+
+
+def counter_drift(user_ids):
+    """
+    Compares stored progress counters with the source tables.
+
+    Parameters:
+    - user_ids (iterable of int): Users to check.
+
+    Returns:
+    - dict: {user_id: (stored, actual)} for every user whose counters disagree,
+            each side a (courses_completed, sorted list of game types) tuple.
+    """
+    user_ids = list(user_ids)
+    actual = actual_counters(user_ids)
+    stored = {
+        user_id: (courses, sorted(game_types))
+        for user_id, courses, game_types in ProgressCounter.objects.filter(
+            user_id__in=user_ids
+        ).values_list('user_id', 'courses_completed', 'game_types')
+    }
+    empty = (0, [])
+    return {
+        user_id: (stored.get(user_id, empty), actual.get(user_id, empty))
+        for user_id in stored.keys() | actual.keys()
+        if stored.get(user_id, empty) != actual.get(user_id, empty)
+    }
+
+
+def repair_counters(drift):
+    """
+    Overwrites the stored counters of drifted users with their actual values.
+
+    Parameters:
+    - drift (dict): The result of counter_drift().
+    """
+    ProgressCounter.objects.bulk_create(
+        [
+            ProgressCounter(user_id=user_id, courses_completed=courses, game_types=game_types)
+            for user_id, (_, (courses, game_types)) in drift.items()
+        ],
+        update_conflicts=True,
+        unique_fields=['user'],
+        update_fields=['courses_completed', 'game_types'],
+    )
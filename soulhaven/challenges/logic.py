@@ -1,10 +1,21 @@
+from django.db import connection
 from django.utils import timezone
-from challenges.models import Challenge, UserChallenge, ChallengeType
-from stars.models import StarAction, StarHistory
-from courses.models import CourseProgress
-from django.utils import timezone
-from games.models import CompletedGame
-from stars.utils import award_stars
+from challenges.counters import progress_counts
+from challenges.models import ChallengeStreak, UserChallenge, ChallengeType
+from challenges.registry import active_challenges
+from stars.utils import award_stars, award_stars_many
+
+
+def _challenge_reward(challenge):
+    """
+    Returns the (action_name, amount, reward_key) star award for completing a challenge.
+    """
+    return (
+        f"Challenge Completion: {challenge.name}",
+        challenge.star_reward,
+        f"challenge:{challenge.id}",
+    )
+
 
 def give_stars(user, challenge):
     """
@@ -15,48 +26,221 @@ def give_stars(user, challenge):
     - challenge: The Challenge instance that has been completed.
 
     Notes:
-    - Uses a StarHistory check to prevent duplicate star rewards.
+    - Uses the reward key "challenge:<id>" so the stars are granted at most once,
+      in a single insert, even when completions race.
     """
-    if not StarHistory.objects.filter(user=user, action__name=f"Challenge Completion: {challenge.name}").exists():
-        award_stars(user, f"Challenge Completion: {challenge.name}", amount=challenge.star_reward)
+    action_name, amount, reward_key = _challenge_reward(challenge)
+    award_stars(user, action_name, amount=amount, reward_key=reward_key)
 
-def check_course_challenges(user, completed_course):
+
+def give_stars_many(user, challenges):
     """
-    Checks and updates the progress of active course-related challenges for a user.
+    Awards the stars of several completed challenges in one batch
+    (one history insert and one profile update), skipping any already rewarded.
+    """
+    if challenges:
+        award_stars_many(user, [_challenge_reward(challenge) for challenge in challenges])
+
+
+def upsert_user_challenges(rows):
+    """
+    Inserts or updates UserChallenge rows in one statement.
+
+    Parameters:
+    - rows (list): (user_id, challenge_id, progress, completed, completed_at) tuples.
+
+    Logic:
+    - INSERT ... ON CONFLICT (user, challenge) DO UPDATE, but only for rows that
+      are not completed yet, so a stale request can never reopen a completed
+      challenge or complete it twice.
+
+    Returns:
+    - list: (user_id, challenge_id, completed) for every row inserted or updated.
+    """
+    if not rows:
+        return []
+
+    opts = UserChallenge._meta
+    qn = connection.ops.quote_name
+    table = qn(opts.db_table)
+    user_column = qn(opts.get_field('user').column)
+    challenge_column = qn(opts.get_field('challenge').column)
+    progress, completed, completed_at = (
+        qn(opts.get_field(name).column) for name in ('progress', 'completed', 'completed_at')
+    )
+    values = ', '.join(['(%s, %s, %s, %s, %s)'] * len(rows))
+    params = [value for row in rows for value in row]
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} ({user_column}, {challenge_column}, {progress}, {completed}, {completed_at}) "
+            f"VALUES {values} "
+            f"ON CONFLICT ({user_column}, {challenge_column}) DO UPDATE SET "
+            f"{progress} = EXCLUDED.{progress}, {completed} = EXCLUDED.{completed}, "
+            f"{completed_at} = EXCLUDED.{completed_at} "
+            f"WHERE NOT {table}.{completed} "
+            f"RETURNING {user_column}, {challenge_column}, {completed}",
+            params,
+        )
+        return cursor.fetchall()
+
+
+def record_challenge_activity(user, day=None):
+    """
+    Updates the user's challenge streak for a day on which they completed a challenge.
+
+    Parameters:
+    - user: The User instance who completed a challenge.
+    - day (date, optional): The day of the completion; defaults to today.
+
+    Logic:
+    - One INSERT ... ON CONFLICT DO UPDATE (see record_challenge_activity_many):
+        - same day as last_active_day: unchanged,
+        - the day after last_active_day: streak + 1,
+        - an earlier day (late event): unchanged,
+        - any later day: streak restarts at 1.
+    - longest_streak keeps the maximum ever reached.
+
+    Returns:
+    - int: The current streak length after the update.
+    """
+    return record_challenge_activity_many([user.pk], day)[user.pk]
+
+
+def record_challenge_activity_many(user_ids, day=None):
+    """
+    Updates the challenge streaks of many users who completed a challenge on the same day.
+
+    Parameters:
+    - user_ids (iterable of int): Distinct users who completed a challenge.
+    - day (date, optional): The day of the completions; defaults to today.
+
+    Logic:
+    - One multi-row INSERT ... ON CONFLICT DO UPDATE with the streak rules of
+      record_challenge_activity, so bulk and per-event completions agree.
+
+    Returns:
+    - dict: {user_id: current streak length after the update}
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return {}
+    day = day or timezone.localdate()
+    opts = ChallengeStreak._meta
+    qn = connection.ops.quote_name
+    table = qn(opts.db_table)
+    user_column = qn(opts.get_field('user').column)
+    current, longest, last_day = (
+        qn(opts.get_field(name).column) for name in ('current_streak', 'longest_streak', 'last_active_day')
+    )
+    next_streak = (
+        f"CASE WHEN {table}.{last_day} >= EXCLUDED.{last_day} THEN {table}.{current} "
+        f"WHEN {table}.{last_day} = EXCLUDED.{last_day} - 1 THEN {table}.{current} + 1 "
+        f"ELSE 1 END"
+    )
+    values = ', '.join(['(%s, 1, 1, %s)'] * len(user_ids))
+    params = [value for user_id in user_ids for value in (user_id, day)]
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} ({user_column}, {current}, {longest}, {last_day}) VALUES {values} "
+            f"ON CONFLICT ({user_column}) DO UPDATE SET "
+            f"{current} = {next_streak}, "
+            f"{longest} = GREATEST({table}.{longest}, {next_streak}), "
+            f"{last_day} = GREATEST({table}.{last_day}, EXCLUDED.{last_day}) "
+            f"RETURNING {user_column}, {current}",
+            params,
+        )
+        return dict(cursor.fetchall())
+
+
+def evaluate_challenges(user, challenges, count, matches_target):
+    """
+    Updates a user's progress on many challenges of one type with a fixed number of queries.
 
     Parameters:
     - user: The User instance to evaluate.
-    - completed_course: The Course instance that was just completed.
+    - challenges (sequence): Active Challenge instances of one type (see challenges.registry).
+    - count (callable): Returns the user's current count for N-item challenges
+                        (e.g. distinct completed courses); called at most once.
+    - matches_target (callable): Returns True if the event that just happened
+                                 satisfies a single-item challenge.
 
     Logic:
-    - If the challenge has a specific course title and target of 1, match it directly.
-    - Otherwise, compare total completed test parts (distinct courses) to the challenge's target.
-    - Updates progress and awards stars upon challenge completion.
+    - Loads the user's existing UserChallenge rows for these challenges in one query.
+    - Computes new progress in memory; single-item challenges complete when the
+      event matches, N-item challenges when the count reaches the target.
+    - Writes all changed rows in one upsert and awards the stars of newly
+      completed challenges in one batch.
+    - Extends the user's challenge streak if anything was completed.
+
+    Returns:
+    - list: The Challenge instances completed by this call.
     """
-    challenges = Challenge.objects.filter(type=ChallengeType.FINISH_COURSES, active=True)
+    if not challenges:
+        return []
+
+    existing = {
+        uc.challenge_id: uc
+        for uc in UserChallenge.objects.filter(user=user, challenge__in=challenges)
+    }
+    now = timezone.now()
+    current = None
+    rows = []
+
     for challenge in challenges:
-        uc, _ = UserChallenge.objects.get_or_create(user=user, challenge=challenge)
-        if uc.completed:
+        uc = existing.get(challenge.id)
+        if uc is not None and uc.completed:
             continue
 
-        if challenge.target_value == 1 and challenge.course_title:
-            if completed_course.title == challenge.course_title:
-                uc.completed = True
-                uc.completed_at = timezone.now()
-                uc.progress = 1
-                uc.save()
-                give_stars(user, challenge)
+        if challenge.is_single_item:
+            if not matches_target(challenge):
+                continue
+            progress = 1
         else:
-            completed_count = CourseProgress.objects.filter(user=user, part='test').values('course').distinct().count()
-            if completed_count >= challenge.target_value:
-                uc.completed = True
-                uc.completed_at = timezone.now()
-                uc.progress = challenge.target_value
-                uc.save()
-                give_stars(user, challenge)
-            else:
-                uc.progress = completed_count
-                uc.save()
+            if current is None:
+                current = count()
+            progress = min(current, challenge.target_value)
+
+        completed = progress >= challenge.target_value
+        if uc is not None and not completed and uc.progress == progress:
+            continue
+        rows.append((user.pk, challenge.id, progress, completed, now if completed else None))
+
+    by_id = {challenge.id: challenge for challenge in challenges}
+    newly_completed = [
+        by_id[challenge_id]
+        for _, challenge_id, completed in upsert_user_challenges(rows)
+        if completed
+    ]
+    give_stars_many(user, newly_completed)
+    if newly_completed:
+        record_challenge_activity(user, timezone.localdate(now))
+    return newly_completed
+
+
+def check_course_challenges(user, completed_course):
+    """
+    Checks and updates the progress of active course-related challenges for a user.
+
+    Parameters:
+    - user: The User instance to evaluate.
+    - completed_course: The Course instance that was just completed (may be None).
+
+    Logic:
+    - If the challenge targets a specific course with a target of 1, compare its resolved course id.
+    - Otherwise, compare the user's completed-course counter to the challenge's target;
+      the counter row is read once for all challenges.
+    - Updates progress and awards stars upon challenge completion (see evaluate_challenges).
+    """
+    challenges = active_challenges.of_type(ChallengeType.FINISH_COURSES)
+    return evaluate_challenges(
+        user,
+        challenges,
+        count=lambda: progress_counts(user)[0],
+        matches_target=lambda challenge: completed_course is not None and completed_course.pk == challenge.target_course_id,
+    )
+
 
 def check_game_challenges(user, completed_game_type: str):
     """
@@ -68,34 +252,13 @@ def check_game_challenges(user, completed_game_type: str):
 
     Logic:
     - If the challenge targets a specific game and target_value is 1, match directly.
-    - Otherwise, count how many unique game types the user has completed.
-    - Updates progress and awards stars upon challenge completion.
+    - Otherwise, compare the user's distinct-game-types counter to the target (read once for all challenges).
+    - Updates progress and awards stars upon challenge completion (see evaluate_challenges).
     """
-    challenges = Challenge.objects.filter(type=ChallengeType.FINISH_GAMES, active=True)
-
-    for challenge in challenges:
-        uc, _ = UserChallenge.objects.get_or_create(user=user, challenge=challenge)
-        if uc.completed:
-            continue
-
-        if challenge.target_value == 1 and challenge.course_title:
-            if completed_game_type == challenge.course_title:
-                uc.completed = True
-                uc.completed_at = timezone.now()
-                uc.progress = 1
-                uc.save()
-                give_stars(user, challenge)
-        else:
-            game_count = CompletedGame.objects.filter(
-                user=user
-            ).values('game_type').distinct().count()
-
-            if game_count >= challenge.target_value:
-                uc.completed = True
-                uc.completed_at = timezone.now()
-                uc.progress = game_count
-                uc.save()
-                give_stars(user, challenge)
-            else:
-                uc.progress = game_count
-                uc.save()
\ No newline at end of file
+    challenges = active_challenges.of_type(ChallengeType.FINISH_GAMES)
+    return evaluate_challenges(
+        user,
+        challenges,
+        count=lambda: progress_counts(user)[1],
+        matches_target=lambda challenge: completed_game_type == challenge.target_game_type,
+    )
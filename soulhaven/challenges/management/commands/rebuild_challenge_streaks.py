@@ -0,0 +1,71 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models.functions import TruncDate
+from challenges.models import ChallengeStreak, UserChallenge
+
+
+def _streaks(days):
+    """
+    Returns (current_streak, longest_streak, last_active_day) for an ascending list of distinct days.
+    """
+    current = longest = 0
+    previous = None
+    for day in days:
+        current = current + 1 if previous is not None and day - previous == timedelta(days=1) else 1
+        longest = max(longest, current)
+        previous = day
+    return current, longest, previous
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds every ChallengeStreak row from completed UserChallenge history.
+
+    Use once after deploying streak tracking, or to repair drift. Completion days
+    are streamed in (user, day) order, so memory stays bounded by one user's days.
+    """
+    help = 'Rebuild challenge streak state for all users from completed challenges.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Streak rows written per statement (default 1000).')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        rows = UserChallenge.objects.filter(completed=True, completed_at__isnull=False).annotate(
+            day=TruncDate('completed_at')
+        ).values_list('user_id', 'day').distinct().order_by('user_id', 'day')
+
+        batch = []
+        total = 0
+
+        with transaction.atomic():
+            ChallengeStreak.objects.all().delete()
+
+            user_id, days = None, []
+            for row_user_id, day in rows.iterator(chunk_size=options['chunk_size']):
+                if row_user_id != user_id and days:
+                    current, longest, last_day = _streaks(days)
+                    batch.append(ChallengeStreak(
+                        user_id=user_id, current_streak=current, longest_streak=longest, last_active_day=last_day
+                    ))
+                    days = []
+                    if len(batch) >= options['chunk_size']:
+                        ChallengeStreak.objects.bulk_create(batch)
+                        total += len(batch)
+                        batch = []
+                user_id = row_user_id
+                days.append(day)
+
+            if days:
+                current, longest, last_day = _streaks(days)
+                batch.append(ChallengeStreak(
+                    user_id=user_id, current_streak=current, longest_streak=longest, last_active_day=last_day
+                ))
+            ChallengeStreak.objects.bulk_create(batch)
+            total += len(batch)
+
+        seconds = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt streaks for {total} users in {seconds:.2f}s.'))
@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand, CommandError
+from challenges.models import Challenge, ChallengeType
+from challenges.reevaluate import reevaluate_challenge
+
+
+class Command(BaseCommand):
+    """
+    Computes every user's progress on the given challenges and awards the ones already earned.
+
+    Run after activating a FINISH_COURSES or FINISH_GAMES challenge, so users who
+    already qualify do not have to wait for their next course or game event.
+    Challenges given by id that are inactive or outside their window are skipped
+    with a warning unless --force is passed.
+
+    Examples:
+    - python manage.py reevaluate_challenges 12 15
+    - python manage.py reevaluate_challenges --live --batch-size 5000
+    - python manage.py reevaluate_challenges 12 --force
+    """
+    help = 'Set-wise re-evaluation of challenges for all users, with bulk upserts and awards.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('challenge_ids', nargs='*', type=int, help='Challenges to evaluate.')
+        parser.add_argument('--live', action='store_true', help='Evaluate every live challenge.')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Users per transaction (default 1000).')
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Also evaluate challenges given by id that are inactive or outside their window.',
+        )
+
+    def handle(self, *args, **options):
+        if options['live']:
+            challenges = Challenge.objects.live()
+        elif options['challenge_ids']:
+            challenges = Challenge.objects.filter(pk__in=options['challenge_ids'])
+            missing = set(options['challenge_ids']) - set(challenges.values_list('pk', flat=True))
+            if missing:
+                raise CommandError(f"Unknown challenge id(s): {', '.join(map(str, sorted(missing)))}")
+            if not options['force']:
+                live = set(challenges.live().values_list('pk', flat=True))
+                skipped = set(options['challenge_ids']) - live
+                if skipped:
+                    self.stdout.write(self.style.WARNING(
+                        f"Skipping challenge(s) that are inactive or outside their window: "
+                        f"{', '.join(map(str, sorted(skipped)))} (pass --force to evaluate them anyway)."
+                    ))
+                challenges = challenges.live()
+        else:
+            raise CommandError('Pass challenge ids or --live.')
+
+        for challenge in challenges.exclude(type=ChallengeType.CUSTOM).order_by('pk'):
+            self.stdout.write(f'{challenge} (#{challenge.pk}):')
+            result = reevaluate_challenge(
+                challenge,
+                batch_size=options['batch_size'],
+                on_batch=lambda users, written: self.stdout.write(f'  {users} users scanned, {written} rows written'),
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f"  {result['written']} rows written for {result['users']} users in {result['seconds']:.2f}s "
+                f"({result['rows_per_second']:.0f} rows/s); {result['completed']} completed, "
+                f"{result['awarded']} awarded, {result['achievements']} achievements unlocked."
+            ))
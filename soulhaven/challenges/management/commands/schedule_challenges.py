@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from challenges.models import Challenge
+from challenges.registry import WEEK, active_challenges, week_start
+
+
+class Command(BaseCommand):
+    """
+    Maintains the challenge schedule. Intended to run periodically (e.g. hourly from cron).
+
+    - Switches off challenges whose window ended before the current week,
+      keeping the partial active-challenge index small (challenges that ended
+      this week stay on, as they still count towards the weekly rules).
+    - Prints the activations and expiries due within the horizon, so operators
+      can check the upcoming schedule.
+    - Stores the challenge lists of the current week and of the week of the next
+      boundary in the shared cache, so workers switching over at that boundary
+      read them from the cache instead of the database.
+    - Warns about active open-ended challenges created this week: weekly rules
+      only count challenges with an explicit window inside the week (the
+      "Schedule for the current week" admin action sets one).
+
+    Workers pick up window boundaries on their own (see challenges.registry);
+    the registry is only invalidated when this command changes rows.
+    """
+    help = 'Retire ended challenges and list upcoming challenge activations.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--horizon-days', type=int, default=7, help='How far ahead to list the schedule (default 7).')
+        parser.add_argument('--dry-run', action='store_true', help='Only list; do not retire ended challenges.')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        horizon = now + timedelta(days=options['horizon_days'])
+
+        ended = Challenge.objects.filter(active=True, ends_at__lte=week_start(now))
+        if options['dry_run']:
+            retired = ended.count()
+        else:
+            with transaction.atomic():
+                retired = ended.update(active=False)
+                if retired:
+                    transaction.on_commit(active_challenges.invalidate)
+
+        upcoming = Challenge.objects.filter(active=True).filter(
+            Q(starts_at__gt=now, starts_at__lte=horizon) | Q(ends_at__gt=now, ends_at__lte=horizon)
+        ).order_by('starts_at').values_list('name', 'starts_at', 'ends_at')
+
+        events = []
+        for name, starts_at, ends_at in upcoming:
+            if now < starts_at <= horizon:
+                events.append((starts_at, 'starts', name))
+            if ends_at is not None and now < ends_at <= horizon:
+                events.append((ends_at, 'ends', name))
+        for moment, event, name in sorted(events):
+            self.stdout.write(f'  {moment:%Y-%m-%d %H:%M} {event:<6} {name}')
+
+        week = week_start(now)
+        next_boundary = min((moment for moment, _, _ in events), default=week + WEEK)
+        for start in sorted({week, week_start(next_boundary)}):
+            count = active_challenges.warm(start)
+            self.stdout.write(f'  cached {count} challenge(s) for the week of {start:%Y-%m-%d}')
+
+        unscheduled = Challenge.objects.filter(active=True, ends_at__isnull=True, created_at__gte=week).count()
+        if unscheduled:
+            self.stdout.write(self.style.WARNING(
+                f'{unscheduled} active challenge(s) created this week have no end; '
+                f'they do not count as weekly until scheduled for the week.'
+            ))
+
+        verb = 'would be retired' if options['dry_run'] else 'retired'
+        self.stdout.write(self.style.SUCCESS(
+            f'{retired} ended challenge(s) {verb}; {len(events)} schedule change(s) in the next {options["horizon_days"]} days.'
+        ))
@@ -0,0 +1,50 @@
+# Generated by Django 5.2 on 2026-10-18 10:51
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_counters(apps, schema_editor):
+    """
+    Computes the counters of existing users from their course and game history.
+    """
+    CourseProgress = apps.get_model('courses', 'CourseProgress')
+    CompletedGame = apps.get_model('games', 'CompletedGame')
+    ProgressCounter = apps.get_model('challenges', 'ProgressCounter')
+
+    counters = {}
+    courses = CourseProgress.objects.filter(part='test').values('user_id').annotate(
+        n=Count('course', distinct=True)
+    ).order_by().values_list('user_id', 'n')
+    for user_id, n in courses.iterator():
+        counters[user_id] = ProgressCounter(user_id=user_id, courses_completed=n, game_types=[])
+    games = CompletedGame.objects.values_list('user_id', 'game_type').distinct().order_by('user_id', 'game_type')
+    for user_id, game_type in games.iterator():
+        counters.setdefault(user_id, ProgressCounter(user_id=user_id, game_types=[])).game_types.append(game_type)
+
+    ProgressCounter.objects.bulk_create(counters.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('challenges', '0003_challengestreak'),
+        ('courses', '0001_initial'),
+        ('games', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProgressCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('courses_completed', models.PositiveIntegerField(default=0)),
+                ('game_types', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=50), blank=True, default=list, size=None)),
+            ],
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2 on 2026-10-18 10:53
+
+from datetime import timedelta
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+from django.utils import timezone
+
+
+def start_at_creation(apps, schema_editor):
+    """
+    Existing challenges have been available since they were created.
+
+    - Weekly rules (e.g. Weekly Completionist) used to count the active
+      challenges created in the current week; they now count challenges whose
+      window lies inside the week. Challenges created this week therefore get
+      the end of the week as ends_at, so the rule keeps working. They end with
+      the week, and schedule_challenges switches them off the week after.
+    - Older challenges stay open-ended and, as before, do not count as weekly.
+      To make one count, set its window with the "Schedule selected challenges
+      for the current week" admin action.
+    """
+    Challenge = apps.get_model('challenges', 'Challenge')
+    Challenge.objects.update(starts_at=F('created_at'))
+
+    now = timezone.localtime()
+    week = (now - timedelta(days=now.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+    Challenge.objects.filter(created_at__gte=week).update(ends_at=week + timedelta(days=7))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenges', '0004_progresscounter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='challenge',
+            name='ends_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='challenge',
+            name='starts_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(start_at_creation, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='challenge',
+            index=models.Index(condition=models.Q(('active', True)), fields=['starts_at', 'ends_at'], name='challenges_window_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2 on 2026-10-18 10:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copy of games.models.GameType values at the time of this migration.
+GAME_TYPES = {'puzzles', 'mandalas', 'pop_bubbles', 'firefly', 'phrases'}
+
+
+def resolve_targets(apps, schema_editor):
+    """
+    Resolves the course_title of existing single-item challenges to a course id
+    (the oldest course with that title) or a game type.
+    """
+    Challenge = apps.get_model('challenges', 'Challenge')
+    Course = apps.get_model('courses', 'Course')
+
+    challenges = list(Challenge.objects.filter(target_value=1, course_title__isnull=False).exclude(course_title=''))
+    titles = {c.course_title for c in challenges if c.type == 'finish_courses'}
+    course_ids = {}
+    for course_id, title in Course.objects.filter(title__in=titles).order_by('-id').values_list('id', 'title'):
+        course_ids[title] = course_id
+
+    for challenge in challenges:
+        if challenge.type == 'finish_courses':
+            challenge.target_course_id = course_ids.get(challenge.course_title)
+        elif challenge.type == 'finish_games' and challenge.course_title in GAME_TYPES:
+            challenge.target_game_type = challenge.course_title
+    Challenge.objects.bulk_update(challenges, ['target_course', 'target_game_type'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenges', '0005_challenge_window'),
+        ('courses', '0002_courseprogresssummary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='challenge',
+            name='target_course',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='courses.course'),
+        ),
+        migrations.AddField(
+            model_name='challenge',
+            name='target_game_type',
+            field=models.CharField(blank=True, choices=[('puzzles', 'Puzzles'), ('mandalas', 'Mandalas'), ('pop_bubbles', 'Pop the Bubble'), ('firefly', 'Firefly Rhythm'), ('phrases', 'Phrase Builder')], editable=False, max_length=50, null=True),
+        ),
+        migrations.RunPython(resolve_targets, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,10 @@
-from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.postgres.fields import ArrayField
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+from courses.models import Course
+from games.models import GameType
 
 class ChallengeType(models.TextChoices):
     """
@@ -14,6 +19,17 @@ class ChallengeType(models.TextChoices):
     FINISH_GAMES = 'finish_games', 'Finish N Games'
     CUSTOM = 'custom', 'Manual Trigger'
 
+class ChallengeQuerySet(models.QuerySet):
+    def live(self, at=None):
+        """
+        Filters to challenges that are switched on and whose window contains `at` (default: now).
+
+        Served by the partial (starts_at, ends_at) index on active challenges.
+        """
+        at = at or timezone.now()
+        return self.filter(active=True, starts_at__lte=at).filter(Q(ends_at__isnull=True) | Q(ends_at__gt=at))
+
+
 class Challenge(models.Model):
     """
     Represents a challenge that users can complete for rewards.
@@ -24,11 +40,23 @@ class Challenge(models.Model):
     - type: Type of challenge from ChallengeType (e.g., FINISH_COURSES).
     - target_value: The goal amount (e.g., complete 3 courses/games).
     - course_title: (Optional) Specific course or game title to match (used for single-item challenges).
+    - target_course: The Course that course_title resolves to (FINISH_COURSES single-item challenges).
+    - target_game_type: The GameType that course_title resolves to (FINISH_GAMES single-item challenges).
+      Both are derived from course_title on every save (see resolve_target), so
+      progress checks compare ids instead of strings.
     - star_reward: Number of stars awarded upon completion.
-    - active: Whether the challenge is currently available.
+    - active: Whether the challenge is switched on; it is available only inside its window.
+    - starts_at: When the challenge becomes available (defaults to creation time).
+    - ends_at: (Optional) When the challenge stops being available; open-ended if empty.
     - created_at: Timestamp of when the challenge was created.
 
+    Meta:
+    - Partial index on (starts_at, ends_at) over active challenges, for window lookups.
+
     Methods:
+    - is_single_item: Whether the challenge targets one specific course or game.
+    - resolve_target(): Fills target_course / target_game_type from course_title.
+    - is_live(at): Whether the challenge is available at a given moment.
     - __str__(): Returns the challenge's name for easy identification.
     """
     name = models.CharField(max_length=255)
@@ -36,10 +64,40 @@ class Challenge(models.Model):
     type = models.CharField(max_length=50, choices=ChallengeType.choices)
     target_value = models.PositiveIntegerField()
     course_title = models.CharField(max_length=255, blank=True, null=True)
+    target_course = models.ForeignKey(
+        Course, on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='+'
+    )
+    target_game_type = models.CharField(max_length=50, choices=GameType.choices, null=True, blank=True, editable=False)
     star_reward = models.PositiveIntegerField()
     active = models.BooleanField(default=False)
+    starts_at = models.DateTimeField(default=timezone.now)
+    ends_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = ChallengeQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['starts_at', 'ends_at'], condition=Q(active=True), name='challenges_window_idx'),
+        ]
+
+    @property
+    def is_single_item(self):
+        return self.target_value == 1 and bool(self.course_title)
+
+    def resolve_target(self):
+        self.target_course = None
+        self.target_game_type = None
+        if not self.is_single_item:
+            return
+        if self.type == ChallengeType.FINISH_COURSES:
+            self.target_course = Course.objects.filter(title=self.course_title).order_by('id').first()
+        elif self.type == ChallengeType.FINISH_GAMES and self.course_title in GameType.values:
+            self.target_game_type = self.course_title
+
+    def is_live(self, at):
+        return self.active and self.starts_at <= at and (self.ends_at is None or self.ends_at > at)
+
     def __str__(self):
         return self.name
 
@@ -65,3 +123,47 @@ class UserChallenge(models.Model):
 
     class Meta:
         unique_together = ('user', 'challenge')
+
+
+class ChallengeStreak(models.Model):
+    """
+    Tracks a user's run of consecutive days with at least one completed challenge.
+
+    Updated incrementally every time a challenge is completed, so streak-based
+    achievements read a single row instead of scanning completion dates.
+
+    Fields:
+    - user: The user the streak belongs to (also the primary key).
+    - current_streak: Consecutive active days ending on last_active_day.
+    - longest_streak: Longest streak the user has ever had.
+    - last_active_day: Most recent day a challenge was completed.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True)
+    current_streak = models.PositiveIntegerField(default=0)
+    longest_streak = models.PositiveIntegerField(default=0)
+    last_active_day = models.DateField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.user.username} - {self.current_streak} day streak"
+
+
+class ProgressCounter(models.Model):
+    """
+    Per-user counters that challenge progress is computed from.
+
+    Maintained by the course-completion and game-completion signals (see
+    challenges.signals), so evaluating a challenge reads one row instead of
+    recounting the user's whole course and game history. Use the
+    check_progress_counters command to compare them with the source tables.
+
+    Fields:
+    - user: The user the counters belong to (also the primary key).
+    - courses_completed: Number of distinct courses whose test part the user completed.
+    - game_types: Distinct game types (GameType values) the user has played.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True)
+    courses_completed = models.PositiveIntegerField(default=0)
+    game_types = ArrayField(models.CharField(max_length=50), default=list, blank=True)
+
+    def __str__(self):
+        return f"{self.user.username} - {self.courses_completed} courses, {len(self.game_types)} game types"
@@ -0,0 +1,156 @@
+import time
+
+from django.db import transaction
+from django.db.models import F, Func, IntegerField, Value
+from django.utils import timezone
+from achievements.utils import evaluate_achievements_many
+from courses.models import CourseProgress
+from games.models import CompletedGame
+from stars.utils import award_stars_to_users
+from .logic import _challenge_reward, record_challenge_activity_many, upsert_user_challenges
+from .models import ChallengeType, ProgressCounter, UserChallenge
+
+
+def _cardinality(field):
+    return Func(F(field), function='cardinality', output_field=IntegerField())
+
+
+ONE = Value(1, output_field=IntegerField())
+
+
+def challenge_counts(challenge):
+    """
+    Builds the query giving every user's current count towards a challenge.
+
+    Parameters:
+    - challenge: A FINISH_COURSES or FINISH_GAMES Challenge.
+
+    Logic:
+    - Single-item challenges (target 1 with a course_title): users who completed
+      the target course's test or played the target game type inside the
+      challenge's window, each with a count of 1 (nobody while the target is
+      unresolved). The per-event path only credits events that happen while
+      the challenge is live, so earlier activity does not count here either.
+    - N-item challenges: the users' lifetime progress counters (see
+      challenges.counters), the same values the per-event evaluation compares
+      with the target; activity before the window counts in both paths.
+
+    Returns:
+    - QuerySet or None: (user_id, count) rows ordered by user id, only users with
+      a non-zero count; None for challenge types that cannot be evaluated in bulk.
+    """
+    single = challenge.is_single_item
+    if challenge.type == ChallengeType.FINISH_COURSES:
+        if single:
+            rows = _in_window(CourseProgress.objects.filter(
+                part='test', course_id=challenge.target_course_id
+            ), 'completed_at', challenge).annotate(n=ONE)
+        else:
+            rows = ProgressCounter.objects.filter(courses_completed__gt=0).annotate(n=F('courses_completed'))
+    elif challenge.type == ChallengeType.FINISH_GAMES:
+        if single:
+            rows = _in_window(CompletedGame.objects.filter(
+                game_type=challenge.target_game_type
+            ), 'played_at', challenge).annotate(n=ONE).distinct()
+        else:
+            rows = ProgressCounter.objects.annotate(n=_cardinality('game_types')).filter(n__gt=0)
+    else:
+        return None
+    return rows.order_by('user_id').values_list('user_id', 'n')
+
+
+def _in_window(queryset, field, challenge):
+    queryset = queryset.filter(**{f'{field}__gte': challenge.starts_at})
+    if challenge.ends_at is not None:
+        queryset = queryset.filter(**{f'{field}__lt': challenge.ends_at})
+    return queryset
+
+
+def reevaluate_challenge(challenge, batch_size=1000, on_batch=None):
+    """
+    Brings every user's progress on one challenge up to date, e.g. right after it is activated.
+
+    Parameters:
+    - challenge: The Challenge to evaluate (FINISH_COURSES or FINISH_GAMES).
+    - batch_size (int, optional): Users handled per transaction.
+    - on_batch (callable, optional): Called as on_batch(users_seen, rows_written) after each batch.
+
+    Logic:
+    - Streams (user, count) rows from one query (see challenge_counts).
+    - Per batch, in one transaction:
+        - loads the batch's existing UserChallenge rows and drops users whose
+          progress would not change (or who already completed the challenge),
+        - writes the rest with one upsert (see upsert_user_challenges),
+        - grants the challenge's stars to the newly completed users with one
+          keyed bulk award ("challenge:<id>", shared with the per-event path),
+        - extends their challenge streaks and awards the challenge-triggered
+          achievements they reached, as the per-event path does.
+
+    Returns:
+    - dict: {
+        'challenge': int — challenge id,
+        'users': int — users with a non-zero count,
+        'written': int — UserChallenge rows inserted or updated,
+        'completed': int — users who newly completed the challenge,
+        'awarded': int — users who received the stars,
+        'achievements': int — achievements newly awarded,
+        'seconds': float — wall-clock duration,
+        'rows_per_second': float — UserChallenge rows written per second
+      }
+    """
+    started = time.monotonic()
+    result = {'challenge': challenge.id, 'users': 0, 'written': 0, 'completed': 0, 'awarded': 0, 'achievements': 0}
+    counts = challenge_counts(challenge)
+
+    if counts is not None:
+        action_name, amount, reward_key = _challenge_reward(challenge)
+        batch = []
+        for row in counts.iterator(chunk_size=batch_size):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                _apply_batch(challenge, batch, action_name, amount, reward_key, result)
+                batch = []
+                if on_batch:
+                    on_batch(result['users'], result['written'])
+        if batch:
+            _apply_batch(challenge, batch, action_name, amount, reward_key, result)
+            if on_batch:
+                on_batch(result['users'], result['written'])
+
+    seconds = time.monotonic() - started
+    result['seconds'] = seconds
+    result['rows_per_second'] = result['written'] / seconds if seconds else 0.0
+    return result
+
+
+def _apply_batch(challenge, batch, action_name, amount, reward_key, result):
+    existing = {
+        user_id: (progress, completed)
+        for user_id, progress, completed in UserChallenge.objects.filter(
+            challenge=challenge, user_id__in=[user_id for user_id, _ in batch]
+        ).values_list('user_id', 'progress', 'completed')
+    }
+    now = timezone.now()
+    rows = []
+    for user_id, count in batch:
+        progress = min(count, challenge.target_value)
+        completed = progress >= challenge.target_value
+        current = existing.get(user_id)
+        if current is not None and (current[1] or current[0] == progress):
+            continue
+        rows.append((user_id, challenge.id, progress, completed, now if completed else None))
+
+    with transaction.atomic():
+        written = upsert_user_challenges(rows)
+        newly_completed = [user_id for user_id, _, completed in written if completed]
+        awarded = achievements = []
+        if newly_completed:
+            awarded = award_stars_to_users(newly_completed, action_name, amount, reward_key)
+            record_challenge_activity_many(newly_completed, timezone.localdate(now))
+            achievements = evaluate_achievements_many(newly_completed, trigger='challenge')
+
+    result['users'] += len(batch)
+    result['written'] += len(written)
+    result['completed'] += len(newly_completed)
+    result['awarded'] += len(awarded)
+    result['achievements'] += len(achievements)
@@ -0,0 +1,157 @@
+import threading
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from main.caching import bump_version, get_version
+from .models import Challenge
+
+REGISTRY_NAMESPACE = 'challenges.active'
+WEEK = timedelta(days=7)
+# Week snapshots are keyed by version, so superseded ones simply expire.
+SNAPSHOT_TIMEOUT = int(2 * WEEK.total_seconds())
+
+
+def week_start(moment):
+    """
+    Returns the Monday 00:00 (local time) that starts the week containing `moment`.
+    """
+    moment = timezone.localtime(moment)
+    return (moment - timedelta(days=moment.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _snapshot_key(week, version):
+    return f'challenges:registry:v{version}:{week.date().isoformat()}'
+
+
+def _week_challenges(week):
+    return list(
+        Challenge.objects.filter(active=True, starts_at__lt=week + WEEK).filter(
+            Q(ends_at__isnull=True) | Q(ends_at__gt=week)
+        ).order_by('id')
+    )
+
+
+class ActiveChallengeRegistry:
+    """
+    Per-process registry of live challenges, grouped by ChallengeType.
+
+    - Every challenge that is live now or scheduled within the current week is
+      loaded in one query and kept until the shared registry version
+      (see main.caching) changes or the next window boundary passes, whichever
+      comes first; boundaries therefore need no invalidation.
+    - The week's challenges are also kept in the shared cache under the version,
+      so a reload at a boundary reads the cache; the schedule_challenges command
+      stores the next week's list ahead of time (see warm()).
+    - Challenge saves and deletes bump that version (see challenges.signals),
+      as do the bulk activate/deactivate admin actions.
+    - Weekly challenges are those whose window lies within the current
+      Monday-to-Monday week.
+    - The cached Challenge instances are shared; callers must not modify them.
+    """
+
+    def __init__(self):
+        self._live = None
+        self._by_type = None
+        self._weekly = None
+        self._version = None
+        self._expires_at = None
+        self._lock = threading.Lock()
+
+    def _ensure_loaded(self):
+        now = timezone.now()
+        version = get_version(REGISTRY_NAMESPACE)
+        if self._live is not None and version == self._version and now < self._expires_at:
+            return
+
+        week = week_start(now)
+        week_end = week + WEEK
+        key = _snapshot_key(week, version)
+        challenges = cache.get(key)
+        if challenges is None:
+            challenges = _week_challenges(week)
+            cache.set(key, challenges, SNAPSHOT_TIMEOUT)
+
+        live = []
+        by_type = {}
+        weekly = []
+        expires_at = week_end
+        for challenge in challenges:
+            if challenge.is_live(now):
+                live.append(challenge)
+                by_type.setdefault(challenge.type, []).append(challenge)
+            if challenge.ends_at is not None and challenge.starts_at >= week and challenge.ends_at <= week_end:
+                weekly.append(challenge)
+            for boundary in (challenge.starts_at, challenge.ends_at):
+                if boundary is not None and now < boundary < expires_at:
+                    expires_at = boundary
+
+        self._live = tuple(live)
+        self._by_type = {key: tuple(value) for key, value in by_type.items()}
+        self._weekly = tuple(weekly)
+        self._version = version
+        self._expires_at = expires_at
+
+    def all(self):
+        """
+        Returns:
+        - tuple: Every live Challenge, ordered by id.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            return self._live
+
+    def of_type(self, challenge_type):
+        """
+        Returns:
+        - tuple: Live challenges of one ChallengeType, ordered by id.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            return self._by_type.get(challenge_type, ())
+
+    def weekly(self):
+        """
+        Returns:
+        - tuple: Active challenges whose window lies within the current week,
+                 including ones that have already ended or not started yet.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            return self._weekly
+
+    def next_boundary(self):
+        """
+        Returns:
+        - datetime: When this worker's copy expires: the next challenge start or end,
+                    or the start of next week.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            return self._expires_at
+
+    def warm(self, at):
+        """
+        Stores the challenges of the week containing `at` in the shared cache,
+        so workers reloading at that week's boundaries need no query.
+
+        Returns:
+        - int: Number of challenges stored.
+        """
+        week = week_start(at)
+        challenges = _week_challenges(week)
+        cache.set(_snapshot_key(week, get_version(REGISTRY_NAMESPACE)), challenges, SNAPSHOT_TIMEOUT)
+        return len(challenges)
+
+    def invalidate(self):
+        """
+        Drops this worker's copy and bumps the shared version so every worker reloads.
+        """
+        with self._lock:
+            self._live = None
+            self._version = bump_version(REGISTRY_NAMESPACE)
+
+
+active_challenges = ActiveChallengeRegistry()
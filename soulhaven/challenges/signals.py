@@ -0,0 +1,81 @@
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from courses.models import Course, CoursePart, CourseProgress
+from games.models import CompletedGame
+from .counters import record_course_completed, record_game_played
+from .models import Challenge, ChallengeType
+from .registry import active_challenges
+
+
+@receiver(pre_save, sender=Challenge)
+def resolve_challenge_target(sender, instance, **kwargs):
+    """
+    Signal: Resolves course_title to a course id or game type before every save,
+    so progress checks never match titles as strings.
+    """
+    instance.resolve_target()
+
+
+@receiver(post_save, sender=Course)
+def reresolve_course_challenges(sender, instance, **kwargs):
+    """
+    Signal: Re-resolves single-item course challenges when a course matching
+    their title is created or a targeted course is renamed.
+    """
+    challenges = Challenge.objects.filter(type=ChallengeType.FINISH_COURSES, target_value=1).filter(
+        Q(course_title=instance.title) | Q(target_course=instance)
+    )
+    for challenge in challenges:
+        previous = challenge.target_course_id
+        challenge.resolve_target()
+        if challenge.target_course_id != previous:
+            challenge.save()
+
+
+@receiver(post_delete, sender=Course)
+def reresolve_orphaned_course_challenges(sender, instance, **kwargs):
+    """
+    Signal: Re-resolves single-item course challenges whose target course was
+    deleted (SET_NULL has already cleared it), so they move to another course
+    with the same title if one exists.
+    """
+    challenges = Challenge.objects.filter(
+        type=ChallengeType.FINISH_COURSES, target_value=1, course_title=instance.title, target_course__isnull=True,
+    )
+    for challenge in challenges:
+        challenge.resolve_target()
+        if challenge.target_course_id is not None:
+            challenge.save()
+
+
+@receiver(post_save, sender=Challenge)
+@receiver(post_delete, sender=Challenge)
+def invalidate_active_challenges(sender, instance, **kwargs):
+    """
+    Signal: Reloads every worker's active-challenge registry when a challenge is
+    created, edited or deleted.
+
+    - The reload is deferred until the transaction commits, so no worker can
+      cache the pre-commit state after the version was bumped.
+    """
+    transaction.on_commit(active_challenges.invalidate)
+
+
+@receiver(post_save, sender=CourseProgress)
+def count_completed_course(sender, instance, created, **kwargs):
+    """
+    Signal: Counts a completed course when its test part is first recorded.
+    """
+    if created and instance.part == CoursePart.TEST:
+        record_course_completed(instance.user_id)
+
+
+@receiver(post_save, sender=CompletedGame)
+def count_played_game_type(sender, instance, created, **kwargs):
+    """
+    Signal: Records the game type of every completed game in the player's counters.
+    """
+    if created:
+        record_game_played(instance.user_id, instance.game_type)
@@ -1,2 +1,294 @@
-from django.test import TestCase
+import json
+from datetime import date, timedelta
+from io import StringIO
 
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import UserProfile
+from courses.models import Course, CourseProgress
+from games.models import CompletedGame, GameType
+from stars.catalog import star_action_catalog
+from .counters import counter_drift, progress_counts, repair_counters
+from .logic import check_course_challenges, record_challenge_activity
+from .models import Challenge, ChallengeStreak, ChallengeType, ProgressCounter, UserChallenge
+from .reevaluate import challenge_counts, reevaluate_challenge
+from .registry import ActiveChallengeRegistry, active_challenges, week_start
+from .views import my_challenges_api
+
+
+class CheckCourseChallengesTests(TestCase):
+    def setUp(self):
+        star_action_catalog.invalidate()
+        self.user = User.objects.create_user(username='frank', password='pass')
+        UserProfile.objects.get_or_create(user=self.user)
+        self.courses = [Course.objects.create(title=f'Course {i}', description='') for i in range(3)]
+
+    def _make_challenges(self, count):
+        # Run the commit hooks so the active-challenge registry sees the new rows.
+        with self.captureOnCommitCallbacks(execute=True):
+            return [
+                Challenge.objects.create(
+                    name=f'Finish {i + 1}', description='', type=ChallengeType.FINISH_COURSES,
+                    target_value=i + 1, star_reward=100, active=True,
+                )
+                for i in range(count)
+            ]
+
+    def _complete(self, course):
+        CourseProgress.objects.create(user=self.user, course=course, part='test')
+        with CaptureQueriesContext(connection) as ctx:
+            completed = check_course_challenges(self.user, course)
+        # Catalog lookups for newly created star actions depend on commit hooks
+        # that never run inside TestCase, so they are left out of the count.
+        queries = [q for q in ctx.captured_queries if 'stars_staraction' not in q['sql'] and 'SAVEPOINT' not in q['sql']]
+        return completed, len(queries)
+
+    def test_progress_and_rewards(self):
+        self._make_challenges(3)
+
+        completed, _ = self._complete(self.courses[0])
+        self.assertEqual([c.name for c in completed], ['Finish 1'])
+        completed, _ = self._complete(self.courses[1])
+        self.assertEqual([c.name for c in completed], ['Finish 2'])
+
+        progress = dict(UserChallenge.objects.filter(user=self.user).values_list('challenge__name', 'progress'))
+        self.assertEqual(progress, {'Finish 1': 1, 'Finish 2': 2, 'Finish 3': 2})
+        self.assertEqual(UserProfile.objects.get(user=self.user).stars, 200)
+
+    def test_query_count_is_independent_of_challenge_count(self):
+        self._make_challenges(2)
+        _, few = self._complete(self.courses[0])
+
+        UserChallenge.objects.all().delete()
+        self._make_challenges(20)
+        _, many = self._complete(self.courses[1])
+
+        self.assertEqual(few, many)
+
+
+class ChallengeStreakTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='gina', password='pass')
+
+    def test_streak_grows_resets_and_keeps_longest(self):
+        start = date(2025, 1, 1)
+        for offset in (0, 1, 1, 2):
+            record_challenge_activity(self.user, start + timedelta(days=offset))
+        self.assertEqual(record_challenge_activity(self.user, start + timedelta(days=5)), 1)
+
+        streak = ChallengeStreak.objects.get(user=self.user)
+        self.assertEqual(streak.current_streak, 1)
+        self.assertEqual(streak.longest_streak, 3)
+        self.assertEqual(streak.last_active_day, start + timedelta(days=5))
+
+
+class ProgressCounterTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='hana', password='pass')
+        self.courses = [Course.objects.create(title=f'Course {i}', description='') for i in range(2)]
+
+    def test_counters_follow_completion_events(self):
+        for course in self.courses:
+            CourseProgress.objects.create(user=self.user, course=course, part='theory')
+            CourseProgress.objects.create(user=self.user, course=course, part='test')
+        for game_type in (GameType.PUZZLES, GameType.PUZZLES, GameType.FIREFLY):
+            CompletedGame.objects.create(user=self.user, game_type=game_type)
+
+        self.assertEqual(progress_counts(self.user), (2, 2))
+        self.assertEqual(counter_drift([self.user.pk]), {})
+
+    def test_drift_is_detected_and_repaired(self):
+        CourseProgress.objects.create(user=self.user, course=self.courses[0], part='test')
+        ProgressCounter.objects.filter(user=self.user).update(courses_completed=5, game_types=['mandalas'])
+
+        drift = counter_drift([self.user.pk])
+        self.assertEqual(drift, {self.user.pk: ((5, ['mandalas']), (1, []))})
+
+        repair_counters(drift)
+        self.assertEqual(progress_counts(self.user), (1, 0))
+        self.assertEqual(counter_drift([self.user.pk]), {})
+
+
+class ActiveChallengeRegistryTests(TestCase):
+    def _create(self, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Challenge.objects.create(description='', target_value=1, star_reward=10, **fields)
+
+    def test_grouped_cached_and_reloaded_on_save(self):
+        course = self._create(name='Course', type=ChallengeType.FINISH_COURSES, active=True)
+        self._create(name='Hidden', type=ChallengeType.FINISH_GAMES, active=False)
+
+        self.assertEqual(active_challenges.of_type(ChallengeType.FINISH_COURSES), (course,))
+        with self.assertNumQueries(0):
+            self.assertEqual(active_challenges.of_type(ChallengeType.FINISH_GAMES), ())
+            self.assertEqual(active_challenges.weekly(), ())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            course.active = False
+            course.save()
+        self.assertEqual(active_challenges.all(), ())
+
+
+class MyChallengesApiTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user(username='ivan', password='pass')
+        self.started = Challenge.objects.create(
+            name='Started', description='', type=ChallengeType.FINISH_COURSES,
+            target_value=3, star_reward=10, active=True,
+        )
+        self.fresh = Challenge.objects.create(
+            name='Fresh', description='', type=ChallengeType.FINISH_GAMES,
+            target_value=2, star_reward=10, active=True,
+        )
+        UserChallenge.objects.create(user=self.user, challenge=self.started, progress=2)
+
+    def _get(self, **headers):
+        request = self.factory.get('/api/challenges/mine/', **headers)
+        request.user = self.user
+        return my_challenges_api(request)
+
+    def test_lists_progress_without_writing(self):
+        response = self._get()
+
+        progress = {c['name']: c['user_progress']['progress'] for c in json.loads(response.content)['challenges']}
+        self.assertEqual(progress, {'Started': 2, 'Fresh': 0})
+        self.assertEqual(UserChallenge.objects.count(), 1)
+
+    def test_etag_revalidation(self):
+        etag = self._get()['ETag']
+
+        self.assertEqual(self._get(HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        UserChallenge.objects.filter(challenge=self.started).update(progress=3, completed=True)
+        self.assertEqual(self._get(HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class ChallengeWindowTests(TestCase):
+    def _create(self, name, starts_at, ends_at=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Challenge.objects.create(
+                name=name, description='', type=ChallengeType.FINISH_COURSES, target_value=1,
+                star_reward=10, active=True, starts_at=starts_at, ends_at=ends_at,
+            )
+
+    def test_live_and_weekly_follow_windows(self):
+        now = timezone.now()
+        week = week_start(now)
+        open_ended = self._create('Open', now - timedelta(days=30))
+        this_week = self._create('This week', week, week + timedelta(days=7))
+        self._create('Ended', now - timedelta(days=30), now - timedelta(days=20))
+        self._create('Upcoming', now + timedelta(days=30))
+
+        live = {challenge.name for challenge in Challenge.objects.live(now)}
+        self.assertEqual(live, {'Open', 'This week'})
+        self.assertEqual(active_challenges.all(), (open_ended, this_week))
+        self.assertEqual(active_challenges.weekly(), (this_week,))
+        self.assertLessEqual(active_challenges.next_boundary(), week + timedelta(days=7))
+
+    def test_warmed_week_loads_without_queries(self):
+        challenge = self._create('Open', timezone.now() - timedelta(days=1))
+        self.assertEqual(active_challenges.warm(timezone.now()), 1)
+
+        # A fresh registry stands in for another worker reloading at a boundary.
+        with self.assertNumQueries(0):
+            self.assertEqual(ActiveChallengeRegistry().all(), (challenge,))
+
+
+class ReevaluateChallengeTests(TestCase):
+    def setUp(self):
+        star_action_catalog.invalidate()
+        courses = [Course.objects.create(title=f'Course {i}', description='') for i in range(2)]
+        self.ann = User.objects.create_user(username='ann', password='pass')
+        self.bob = User.objects.create_user(username='bob', password='pass')
+        for user, done in ((self.ann, courses), (self.bob, courses[:1])):
+            UserProfile.objects.get_or_create(user=user)
+            for course in done:
+                CourseProgress.objects.create(user=user, course=course, part='test')
+        self.challenge = Challenge.objects.create(
+            name='Finish 2', description='', type=ChallengeType.FINISH_COURSES,
+            target_value=2, star_reward=100, active=True,
+        )
+
+    def test_progress_and_rewards_for_all_users(self):
+        result = reevaluate_challenge(self.challenge)
+        self.assertEqual((result['users'], result['written'], result['completed']), (2, 2, 1))
+
+        progress = dict(UserChallenge.objects.values_list('user__username', 'progress'))
+        self.assertEqual(progress, {'ann': 2, 'bob': 1})
+        self.assertEqual(UserProfile.objects.get(user=self.ann).stars, 100)
+        self.assertEqual(UserProfile.objects.get(user=self.bob).stars, 0)
+
+        rerun = reevaluate_challenge(self.challenge)
+        self.assertEqual((rerun['written'], rerun['awarded']), (0, 0))
+
+    def test_bulk_completion_extends_streaks(self):
+        reevaluate_challenge(self.challenge)
+
+        self.assertEqual(ChallengeStreak.objects.get(user=self.ann).current_streak, 1)
+        self.assertFalse(ChallengeStreak.objects.filter(user=self.bob).exists())
+
+    def test_command_skips_challenges_that_are_not_live(self):
+        Challenge.objects.filter(pk=self.challenge.pk).update(active=False)
+
+        out = StringIO()
+        call_command('reevaluate_challenges', str(self.challenge.pk), stdout=out)
+        self.assertIn(f'outside their window: {self.challenge.pk}', out.getvalue())
+        self.assertFalse(UserChallenge.objects.exists())
+
+        call_command('reevaluate_challenges', str(self.challenge.pk), '--force', stdout=StringIO())
+        self.assertEqual(UserChallenge.objects.count(), 2)
+
+    def test_single_item_ignores_activity_before_the_window(self):
+        course = Course.objects.get(title='Course 1')
+        challenge = Challenge.objects.create(
+            name='Finish Course 1', description='', type=ChallengeType.FINISH_COURSES,
+            target_value=1, course_title='Course 1', star_reward=10, active=True,
+        )
+        self.assertEqual(list(challenge_counts(challenge)), [])
+
+        CourseProgress.objects.filter(user=self.ann, course=course).update(completed_at=timezone.now())
+        self.assertEqual(list(challenge_counts(challenge)), [(self.ann.pk, 1)])
+
+
+class ChallengeTargetTests(TestCase):
+    def test_title_resolves_to_ids(self):
+        course = Course.objects.create(title='Mindfulness', description='')
+        challenge = Challenge.objects.create(
+            name='Mindful', description='', type=ChallengeType.FINISH_COURSES,
+            target_value=1, course_title='Mindfulness', star_reward=10, active=True,
+        )
+        game = Challenge.objects.create(
+            name='Puzzler', description='', type=ChallengeType.FINISH_GAMES,
+            target_value=1, course_title=GameType.PUZZLES, star_reward=10, active=True,
+        )
+        self.assertEqual(challenge.target_course_id, course.pk)
+        self.assertEqual(game.target_game_type, GameType.PUZZLES)
+
+    def test_course_created_later_is_picked_up(self):
+        challenge = Challenge.objects.create(
+            name='Later', description='', type=ChallengeType.FINISH_COURSES,
+            target_value=1, course_title='Sleep Hygiene', star_reward=10, active=True,
+        )
+        self.assertIsNone(challenge.target_course_id)
+
+        course = Course.objects.create(title='Sleep Hygiene', description='')
+        challenge.refresh_from_db()
+        self.assertEqual(challenge.target_course_id, course.pk)
+
+    def test_deleted_target_moves_to_course_with_same_title(self):
+        first = Course.objects.create(title='Breathing', description='')
+        second = Course.objects.create(title='Breathing', description='')
+        challenge = Challenge.objects.create(
+            name='Breathe', description='', type=ChallengeType.FINISH_COURSES,
+            target_value=1, course_title='Breathing', star_reward=10, active=True,
+        )
+        self.assertEqual(challenge.target_course_id, first.pk)
+
+        first.delete()
+        challenge.refresh_from_db()
+        self.assertEqual(challenge.target_course_id, second.pk)
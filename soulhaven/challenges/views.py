@@ -3,20 +3,81 @@ from django.contrib.auth.decorators import login_required
 from django.views.decorators.csrf import csrf_exempt
 from django.http import JsonResponse
 from django.contrib import messages
-from datetime import datetime, timedelta
+from django.db.models import FilteredRelation, Q
+from django.views.decorators.http import require_GET
 from .models import Challenge, UserChallenge, ChallengeType
 from challenges.logic import check_course_challenges, check_game_challenges
 from courses.models import Course
-from achievements.utils import award_achievement
+from achievements.utils import evaluate_achievements
+from main.utils import conditional_response
+
+
+def _user_progress(progress, completed, completed_at):
+    """
+    Serializes a user's progress on a challenge; a challenge the user has not
+    started (no UserChallenge row) reports zero progress.
+    """
+    return {
+        'progress': progress or 0,
+        'completed': bool(completed),
+        'completed_at': completed_at.isoformat() if completed_at else None
+    }
+
+
+@require_GET
+@login_required
+def my_challenges_api(request):
+    """
+    Returns every live challenge with the current user's progress on it.
+
+    Logic:
+    - One query: live challenges (active and inside their window) LEFT JOINed
+      to the user's UserChallenge rows (FilteredRelation), so challenges the
+      user has not started need no rows and nothing is written.
+    - The response carries an ETag; a request whose If-None-Match matches gets
+      304 Not Modified with an empty body.
+
+    Returns:
+    - JSON response containing:
+        - challenges: list of challenges (id, name, description, type, target_value,
+          star_reward, course_title, ends_at) each with user_progress (progress, completed, completed_at)
+    """
+    rows = Challenge.objects.live().annotate(
+        mine=FilteredRelation('userchallenge', condition=Q(userchallenge__user=request.user)),
+    ).order_by('id').values_list(
+        'id', 'name', 'description', 'type', 'target_value', 'star_reward', 'course_title', 'ends_at',
+        'mine__progress', 'mine__completed', 'mine__completed_at',
+    )
+
+    challenges = [
+        {
+            'id': challenge_id,
+            'name': name,
+            'description': description,
+            'type': challenge_type,
+            'target_value': target_value,
+            'star_reward': star_reward,
+            'course_title': course_title,
+            'ends_at': ends_at.isoformat() if ends_at else None,
+            'user_progress': _user_progress(progress, completed, completed_at),
+        }
+        for (challenge_id, name, description, challenge_type, target_value, star_reward, course_title, ends_at,
+             progress, completed, completed_at) in rows
+    ]
+    return conditional_response(request, JsonResponse({'challenges': challenges}))
 
 
 @login_required
 def challenge_detail_api(request, challenge_id):
     """
     API view to return detailed challenge info for the authenticated user.
+
+    Notes:
+    - Read-only: a challenge the user has not started reports zero progress
+      instead of creating a UserChallenge row.
     """
     challenge = get_object_or_404(Challenge, id=challenge_id)
-    user_challenge, _ = UserChallenge.objects.get_or_create(user=request.user, challenge=challenge)
+    user_challenge = UserChallenge.objects.filter(user=request.user, challenge=challenge).first()
 
     return JsonResponse({
         'id': challenge.id,
@@ -27,11 +88,11 @@ def challenge_detail_api(request, challenge_id):
         'star_reward': challenge.star_reward,
         'course_title': challenge.course_title,
         'active': challenge.active,
-        'user_progress': {
-            'progress': user_challenge.progress,
-            'completed': user_challenge.completed,
-            'completed_at': user_challenge.completed_at.isoformat() if user_challenge.completed_at else None
-        }
+        'starts_at': challenge.starts_at.isoformat(),
+        'ends_at': challenge.ends_at.isoformat() if challenge.ends_at else None,
+        'user_progress': _user_progress(
+            user_challenge.progress, user_challenge.completed, user_challenge.completed_at
+        ) if user_challenge else _user_progress(None, None, None)
     })
 
 
@@ -51,59 +112,22 @@ def complete_challenge_api(request, challenge_id):
     user = request.user
     user_challenge, _ = UserChallenge.objects.get_or_create(user=user, challenge=challenge)
 
-    unlocked = []
-
     if user_challenge.completed:
         return JsonResponse({'message': 'Challenge already completed'}, status=200)
 
     # Evaluate challenge type
     if challenge.type == ChallengeType.FINISH_COURSES:
-        course = None
-        if challenge.target_value == 1 and challenge.course_title:
-            from courses.models import Course
-            course = Course.objects.filter(title=challenge.course_title).first()
+        # Only the id is compared, so the resolved target needs no query.
+        course = Course(pk=challenge.target_course_id) if challenge.target_course_id else None
         check_course_challenges(user, course)
 
     elif challenge.type == ChallengeType.FINISH_GAMES:
-        check_game_challenges(user, challenge.course_title)
+        check_game_challenges(user, challenge.target_game_type)
 
     user_challenge.refresh_from_db()
 
     if user_challenge.completed:
-        total_completed = UserChallenge.objects.filter(user=user, completed=True).count()
-
-        # Achievements
-        if total_completed == 1:
-            if award_achievement(user, "First Challenge Completed", "You completed your first challenge!", "achievements/first_challenge.png"):
-                unlocked.append({"name": "First Challenge Completed", "description": "You completed your first challenge!", "image": "achievements/first_challenge.png"})
-
-        if total_completed == 3:
-            if award_achievement(user, "Challenge Streak", "You’ve completed 3 challenges. Keep it up!", "achievements/challenge_streak.png"):
-                unlocked.append({"name": "Challenge Streak", "description": "You’ve completed 3 challenges. Keep it up!", "image": "achievements/challenge_streak.png"})
-
-        if total_completed == 10:
-            if award_achievement(user, "Challenge Master", "You’ve completed 10 challenges — you're unstoppable!", "achievements/challenge_master.png"):
-                unlocked.append({"name": "Challenge Master", "description": "You’ve completed 10 challenges — you're unstoppable!", "image": "achievements/challenge_master.png"})
-
-        # Weekly Completionist
-        start_of_week = datetime.today() - timedelta(days=datetime.today().weekday())
-        weekly_challenges = Challenge.objects.filter(active=True, created_at__gte=start_of_week)
-        completed_this_week = UserChallenge.objects.filter(user=user, challenge__in=weekly_challenges, completed=True).count()
-
-        if weekly_challenges.exists() and completed_this_week == weekly_challenges.count():
-            if award_achievement(user, "Weekly Completionist", "You've completed all challenges of the week!", "achievements/weekly_completionist.png"):
-                unlocked.append({"name": "Weekly Completionist", "description": "You've completed all challenges of the week!", "image": "achievements/weekly_completionist.png"})
-
-        # 14-Day Consistency
-        streak_days = 14
-        today = datetime.today().date()
-        streak_dates = [today - timedelta(days=i) for i in range(streak_days)]
-
-        has_streak = all(UserChallenge.objects.filter(user=user, completed=True, completed_at__date=day).exists() for day in streak_dates)
-
-        if has_streak:
-            if award_achievement(user, "Challenge Consistency", "You completed a challenge every day for 14 days!", "achievements/consistency_14.png"):
-                unlocked.append({"name": "Challenge Consistency", "description": "You completed a challenge every day for 14 days!", "image": "achievements/consistency_14.png"})
+        unlocked = evaluate_achievements(user, trigger='challenge')
 
         return JsonResponse({
             'status': 'completed',
@@ -1,6 +1,7 @@
 from django.contrib import admin
-from .models import Course, CourseProgress
+from .models import Course, CourseProgress, CourseProgressSummary
 
 
 admin.site.register(Course)
-admin.site.register(CourseProgress)
\ No newline at end of file
+admin.site.register(CourseProgress)
+admin.site.register(CourseProgressSummary)
@@ -0,0 +1,69 @@
+from django.core.cache import cache
+from django.utils.text import Truncator
+
+from main.caching import bump_version, get_version
+from main.pagination import encode_cursor
+from .models import Course
+
+CATALOG_NAMESPACE = 'courses.catalog'
+# Keys embed the catalog version, which every worker reads from the shared
+# cache, so edits retire pages immediately. The timeout bounds how long pages
+# of superseded versions linger in the cache.
+CATALOG_CACHE_TIMEOUT = 5 * 60
+DESCRIPTION_LENGTH = 160
+
+
+def catalog_page(after_id, limit):
+    """
+    Returns one page of the course catalog, from the shared cache when possible.
+
+    Parameters:
+    - after_id (int): Only courses with a greater id (0 for the first page).
+    - limit (int): Page size.
+
+    Logic:
+    - Pages are cached under a key made of the catalog version, after_id and limit,
+      so a steady-state request reads the version and the page from the shared
+      in-memory cache (Redis or Memcached, required outside DEBUG and tests; see
+      main.caching.require_shared_cache) and makes no database query.
+    - On a miss, one keyset query (id > after_id ORDER BY id LIMIT limit + 1)
+      builds the page.
+    - Course saves and deletes bump the version (see courses.signals), which
+      retires every cached page at once.
+
+    Returns:
+    - dict: {'courses': [{'id', 'title', 'description'}, ...], 'next_cursor': str or None}
+    """
+    key = f'courses:catalog:v{get_version(CATALOG_NAMESPACE)}:{after_id}:{limit}'
+    page = cache.get(key)
+    if page is not None:
+        return page
+
+    rows = list(
+        Course.objects.filter(id__gt=after_id).order_by('id').values_list('id', 'title', 'description')[:limit + 1]
+    )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][0])
+
+    page = {
+        'courses': [
+            {
+                'id': course_id,
+                'title': title,
+                'description': Truncator(description).chars(DESCRIPTION_LENGTH),
+            }
+            for course_id, title, description in rows
+        ],
+        'next_cursor': next_cursor,
+    }
+    cache.set(key, page, CATALOG_CACHE_TIMEOUT)
+    return page
+
+
+def invalidate_catalog():
+    """
+    Retires every cached catalog page by bumping the shared catalog version.
+    """
+    bump_version(CATALOG_NAMESPACE)
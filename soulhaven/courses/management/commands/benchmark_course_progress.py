@@ -0,0 +1,175 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Max, Min
+from courses.models import PART_BITS, CourseProgress, CourseProgressSummary, can_access_test
+
+MB = 1024 * 1024
+SCRATCH_SCHEMA = 'benchmark_course_progress'
+
+
+def _table_stats(model):
+    """
+    Returns (estimated rows, heap bytes, index bytes) of a model's table from the
+    PostgreSQL catalog, without scanning the table.
+    """
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.reltuples::bigint, pg_table_size(c.oid), pg_indexes_size(c.oid) "
+            "FROM pg_class c WHERE c.oid = %s::regclass",
+            [table],
+        )
+        return cursor.fetchone()
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    return (
+        statistics.median(samples) * 1000,
+        samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000,
+    )
+
+
+class Command(BaseCommand):
+    """
+    Compares the per-part CourseProgress table with the per-course CourseProgressSummary table.
+
+    Reports table and index sizes, bytes per (user, course), a projection to a
+    given number of users, and the latency of the "can this user take the test?"
+    lookup on both representations for randomly sampled (user, course) pairs.
+    Run it against a production-sized copy (e.g. staging) after the summary
+    backfill; ANALYZE both tables first so the catalog row estimates are current.
+
+    With --rows N the benchmark instead runs on N synthetic (user, course) pairs
+    generated in a scratch schema holding copies of both tables (same columns and
+    indexes). Everything runs in one transaction that is rolled back at the end,
+    so the scratch schema and its data never persist.
+
+    Examples:
+    - python manage.py benchmark_course_progress
+    - python manage.py benchmark_course_progress --samples 5000 --project-users 5000000 --courses-per-user 4
+    - python manage.py benchmark_course_progress --rows 5000000 --courses 40
+    """
+    help = 'Benchmark table size and lookup latency of CourseProgress vs CourseProgressSummary.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--samples', type=int, default=1000, help='Lookups timed per representation (default 1000).')
+        parser.add_argument('--project-users', type=int, default=1_000_000, help='Users to project sizes to (default 1,000,000).')
+        parser.add_argument('--courses-per-user', type=float, default=3.0, help='Courses started per user in the projection (default 3).')
+        parser.add_argument('--rows', type=int, help='Benchmark N synthetic (user, course) pairs in a scratch schema instead of the live tables.')
+        parser.add_argument('--courses', type=int, default=20, help='Distinct courses in the synthetic data (default 20).')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('This benchmark reads PostgreSQL catalog statistics.')
+
+        if not options['rows']:
+            self._benchmark(options)
+            return
+
+        with transaction.atomic():
+            started = time.monotonic()
+            self._generate(options['rows'], options['courses'])
+            self.stdout.write(f"Generated {options['rows']} synthetic pairs in {time.monotonic() - started:.1f}s.")
+            self._benchmark(options)
+            transaction.set_rollback(True)
+
+    def _generate(self, rows, courses):
+        """
+        Creates copies of both tables in the scratch schema, fills them with `rows`
+        (user, course) pairs with random part masks, analyzes them and points the
+        connection's search_path at them for the rest of the transaction.
+        """
+        qn = connection.ops.quote_name
+        summary, progress = CourseProgressSummary._meta.db_table, CourseProgress._meta.db_table
+        bits = ', '.join(f"('{part}', {bit})" for part, bit in PART_BITS.items())
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT current_schema()")
+            source = qn(cursor.fetchone()[0])
+            cursor.execute(f"CREATE SCHEMA {qn(SCRATCH_SCHEMA)}")
+            for table in (summary, progress):
+                cursor.execute(
+                    f"CREATE TABLE {qn(SCRATCH_SCHEMA)}.{qn(table)} (LIKE {source}.{qn(table)} INCLUDING ALL)"
+                )
+            cursor.execute(f"SET LOCAL search_path TO {qn(SCRATCH_SCHEMA)}")
+
+            cursor.execute(
+                f"INSERT INTO {qn(summary)} (user_id, course_id, parts, theory_at, practice_at, video_at, test_at, test_score) "
+                f"SELECT g / %s + 1, mod(g, %s) + 1, m, "
+                f"CASE WHEN m & {PART_BITS['theory']} > 0 THEN now() END, "
+                f"CASE WHEN m & {PART_BITS['practice']} > 0 THEN now() END, "
+                f"CASE WHEN m & {PART_BITS['video']} > 0 THEN now() END, "
+                f"CASE WHEN m & {PART_BITS['test']} > 0 THEN now() END, "
+                f"CASE WHEN m & {PART_BITS['test']} > 0 THEN 80 END "
+                f"FROM (SELECT g, 1 + floor(random() * 15)::int AS m FROM generate_series(0, %s - 1) g) pairs",
+                [courses, courses, rows],
+            )
+            cursor.execute(
+                f"INSERT INTO {qn(progress)} (user_id, course_id, part, completed_at, score) "
+                f"SELECT s.user_id, s.course_id, p.name, now(), CASE WHEN p.name = 'test' THEN 80 END "
+                f"FROM {qn(summary)} s JOIN (VALUES {bits}) p(name, bit) ON s.parts & p.bit > 0"
+            )
+            cursor.execute(f"ANALYZE {qn(summary)}")
+            cursor.execute(f"ANALYZE {qn(progress)}")
+
+    def _benchmark(self, options):
+        stats = {model: _table_stats(model) for model in (CourseProgress, CourseProgressSummary)}
+        self.stdout.write('Table sizes:')
+        for model, (rows, heap, indexes) in stats.items():
+            self.stdout.write(
+                f'  {model.__name__:<22} ~{rows} rows, {heap / MB:.1f} MB table, {indexes / MB:.1f} MB indexes'
+            )
+
+        # Every summary row is one (user, course) pair.
+        pairs_estimate = stats[CourseProgressSummary][0]
+        if pairs_estimate <= 0:
+            raise CommandError('CourseProgressSummary is empty (or not analyzed); run the backfill and ANALYZE first.')
+
+        projected_pairs = options['project_users'] * options['courses_per_user']
+        self.stdout.write(f"Projection to {options['project_users']} users x {options['courses_per_user']} courses:")
+        for model, (_, heap, indexes) in stats.items():
+            per_pair = (heap + indexes) / pairs_estimate
+            self.stdout.write(
+                f'  {model.__name__:<22} {per_pair:.0f} bytes per (user, course) -> {per_pair * projected_pairs / MB:.0f} MB'
+            )
+
+        pairs = self._sample_pairs(options['samples'])
+        if not pairs:
+            self.stdout.write(self.style.WARNING('No (user, course) pairs to sample; skipping the latency benchmark.'))
+            return
+        legacy, compact = [], []
+        for user_id, course_id in pairs:
+            started = time.perf_counter()
+            parts = CourseProgress.objects.filter(user_id=user_id, course_id=course_id).values_list('part', flat=True)
+            can_access_test(sum(PART_BITS.get(part, 0) for part in parts))
+            legacy.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            mask = CourseProgressSummary.objects.filter(user_id=user_id, course_id=course_id).values_list('parts', flat=True).first()
+            can_access_test(mask or 0)
+            compact.append(time.perf_counter() - started)
+
+        self.stdout.write(f'Test-access lookup over {len(pairs)} sampled (user, course) pairs:')
+        for name, samples in (('CourseProgress', legacy), ('CourseProgressSummary', compact)):
+            median, p95 = _percentiles(samples)
+            self.stdout.write(f'  {name:<22} median {median:.3f} ms, p95 {p95:.3f} ms')
+
+    def _sample_pairs(self, count):
+        """
+        Picks random existing (user, course) pairs by probing random ids, avoiding ORDER BY random().
+        """
+        bounds = CourseProgressSummary.objects.aggregate(low=Min('id'), high=Max('id'))
+        if bounds['low'] is None:
+            return []
+        pairs = []
+        for _ in range(count):
+            probe = random.randint(bounds['low'], bounds['high'])
+            pair = CourseProgressSummary.objects.filter(id__gte=probe).order_by('id').values_list('user_id', 'course_id').first()
+            if pair:
+                pairs.append(pair)
+        return pairs
@@ -0,0 +1,63 @@
+# Generated by Django 5.2 on 2026-10-18 10:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Case, IntegerField, Max, Min, Q, Sum, Value, When
+
+PART_BITS = {'theory': 1, 'practice': 2, 'video': 4, 'test': 8}
+
+
+def backfill_summaries(apps, schema_editor):
+    """
+    Builds one summary row per (user, course) from the existing CourseProgress rows,
+    with one grouped query streamed into batched inserts.
+    """
+    CourseProgress = apps.get_model('courses', 'CourseProgress')
+    CourseProgressSummary = apps.get_model('courses', 'CourseProgressSummary')
+
+    rows = CourseProgress.objects.filter(part__in=PART_BITS).values('user_id', 'course_id').annotate(
+        parts=Sum(Case(
+            *(When(part=part, then=Value(bit)) for part, bit in PART_BITS.items()),
+            output_field=IntegerField(),
+        )),
+        test_score=Max('score', filter=Q(part='test')),
+        **{f'{part}_at': Min('completed_at', filter=Q(part=part)) for part in PART_BITS},
+    ).order_by()
+
+    batch = []
+    for row in rows.iterator(chunk_size=5000):
+        batch.append(CourseProgressSummary(**row))
+        if len(batch) >= 5000:
+            CourseProgressSummary.objects.bulk_create(batch)
+            batch = []
+    CourseProgressSummary.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseProgressSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('parts', models.PositiveSmallIntegerField(default=0)),
+                ('theory_at', models.DateTimeField(blank=True, null=True)),
+                ('practice_at', models.DateTimeField(blank=True, null=True)),
+                ('video_at', models.DateTimeField(blank=True, null=True)),
+                ('test_at', models.DateTimeField(blank=True, null=True)),
+                ('test_score', models.IntegerField(blank=True, null=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='courses.course')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'course')},
+            },
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
@@ -36,6 +36,31 @@ class CoursePart(models.TextChoices):
     TEST = 'test', 'Test'
 
 
+# Compact encoding of a set of completed parts: one bit per CoursePart.
+PART_BITS = {
+    CoursePart.THEORY: 1,
+    CoursePart.PRACTICE: 2,
+    CoursePart.VIDEO: 4,
+    CoursePart.TEST: 8,
+}
+# Parts that must be completed before the test can be taken.
+TEST_PREREQUISITES_MASK = PART_BITS[CoursePart.THEORY] | PART_BITS[CoursePart.PRACTICE] | PART_BITS[CoursePart.VIDEO]
+
+
+def parts_from_mask(mask):
+    """
+    Decodes a parts bitmask into the list of completed part names, in course order.
+    """
+    return [part.value for part, bit in PART_BITS.items() if mask & bit]
+
+
+def can_access_test(mask):
+    """
+    Returns True if a parts bitmask includes every part required before the test.
+    """
+    return mask & TEST_PREREQUISITES_MASK == TEST_PREREQUISITES_MASK
+
+
 class CourseProgress(models.Model):
     """
     Tracks a user's progress through individual parts of a course.
@@ -64,3 +89,46 @@ class CourseProgress(models.Model):
 
     def __str__(self):
         return f"{self.user.username} - {self.course.title} - {self.get_part_display()}"
+
+
+class CourseProgressSummary(models.Model):
+    """
+    One row per (user, course) summarizing the user's progress on the course.
+
+    A compact alternative to CourseProgress (one row per part): the completed
+    parts are a bitmask (see PART_BITS), so checking test access reads a single
+    row. While reads still go to CourseProgress, every CourseProgress write is
+    mirrored here (see courses.signals); benchmark_course_progress compares the two.
+
+    Fields:
+    - user: The user progressing through the course.
+    - course: The course being taken.
+    - parts: Bitmask of completed parts.
+    - theory_at, practice_at, video_at, test_at: When each part was completed.
+    - test_score: Optional test score.
+
+    Meta:
+    - unique_together: One summary row per user/course combination.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    course = models.ForeignKey(Course, on_delete=models.CASCADE)
+    parts = models.PositiveSmallIntegerField(default=0)
+    theory_at = models.DateTimeField(null=True, blank=True)
+    practice_at = models.DateTimeField(null=True, blank=True)
+    video_at = models.DateTimeField(null=True, blank=True)
+    test_at = models.DateTimeField(null=True, blank=True)
+    test_score = models.IntegerField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ('user', 'course')
+
+    @property
+    def completed_parts(self):
+        return parts_from_mask(self.parts)
+
+    @property
+    def can_access_test(self):
+        return can_access_test(self.parts)
+
+    def __str__(self):
+        return f"{self.user.username} - {self.course.title} - {', '.join(self.completed_parts) or 'not started'}"
@@ -0,0 +1,66 @@
+from django.db import connection
+from django.db.models import F
+from .models import PART_BITS, CoursePart, CourseProgressSummary
+
+ALL_PARTS = sum(PART_BITS.values())
+
+
+def _columns(part):
+    opts = CourseProgressSummary._meta
+    qn = connection.ops.quote_name
+    return (
+        qn(opts.db_table),
+        *(qn(opts.get_field(name).column) for name in ('user', 'course', 'parts', f'{part}_at', 'test_score')),
+    )
+
+
+def record_part_in_summary(user_id, course_id, part, completed_at, score=None):
+    """
+    Mirrors a completed CourseProgress part into the user's CourseProgressSummary row.
+
+    Parameters:
+    - user_id (int), course_id (int): The summary row to update.
+    - part (str): The completed CoursePart.
+    - completed_at (datetime): When the part was completed.
+    - score (int, optional): Test score; only stored for the test part.
+
+    Logic:
+    - One INSERT ... ON CONFLICT DO UPDATE: ORs the part's bit into the mask and
+      keeps the earliest completion time, so replays and out-of-order writes are harmless.
+    - Unknown part names are ignored.
+    """
+    if part not in PART_BITS:
+        return
+    table, user_column, course_column, parts, part_at, test_score = _columns(part)
+    bit = PART_BITS[part]
+    score = score if part == CoursePart.TEST else None
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} ({user_column}, {course_column}, {parts}, {part_at}, {test_score}) "
+            f"VALUES (%s, %s, %s, %s, %s) "
+            f"ON CONFLICT ({user_column}, {course_column}) DO UPDATE SET "
+            f"{parts} = {table}.{parts} | EXCLUDED.{parts}, "
+            f"{part_at} = LEAST({table}.{part_at}, EXCLUDED.{part_at}), "
+            f"{test_score} = COALESCE(EXCLUDED.{test_score}, {table}.{test_score})",
+            [user_id, course_id, bit, completed_at, score],
+        )
+
+
+def remove_part_from_summary(user_id, course_id, part):
+    """
+    Clears a part from the user's CourseProgressSummary row after its CourseProgress row is deleted.
+
+    - A row whose only completed part was this one is deleted, so every summary
+      row has at least one part (and one row per started course remains true).
+    """
+    if part not in PART_BITS:
+        return
+    summary = CourseProgressSummary.objects.filter(user_id=user_id, course_id=course_id)
+    deleted, _ = summary.filter(parts=PART_BITS[part]).delete()
+    if deleted:
+        return
+    fields = {'parts': F('parts').bitand(ALL_PARTS ^ PART_BITS[part]), f'{part}_at': None}
+    if part == CoursePart.TEST:
+        fields['test_score'] = None
+    summary.update(**fields)
@@ -0,0 +1,31 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .catalog import invalidate_catalog
+from .models import Course, CourseProgress
+from .progress import record_part_in_summary, remove_part_from_summary
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def invalidate_course_catalog(sender, instance, **kwargs):
+    """
+    Signal: Retires the cached course catalog pages once a course change commits.
+    """
+    transaction.on_commit(invalidate_catalog)
+
+
+@receiver(post_save, sender=CourseProgress)
+def mirror_progress_to_summary(sender, instance, **kwargs):
+    """
+    Signal: Dual-writes every saved CourseProgress part (and test score) into CourseProgressSummary.
+    """
+    record_part_in_summary(instance.user_id, instance.course_id, instance.part, instance.completed_at, instance.score)
+
+
+@receiver(post_delete, sender=CourseProgress)
+def remove_progress_from_summary(sender, instance, **kwargs):
+    """
+    Signal: Keeps CourseProgressSummary in step when a CourseProgress part is deleted.
+    """
+    remove_part_from_summary(instance.user_id, instance.course_id, instance.part)
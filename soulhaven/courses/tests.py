@@ -1,2 +1,167 @@
-from django.test import TestCase
+import json
 
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import UserProfile
+from achievements.catalog import achievement_catalog
+from achievements.utils import rules_for
+from challenges.logic import _challenge_reward
+from challenges.models import Challenge, ChallengeType, UserChallenge
+from challenges.registry import active_challenges
+from main.pagination import decode_cursor
+from stars.catalog import star_action_catalog
+from .catalog import DESCRIPTION_LENGTH, catalog_page, invalidate_catalog
+from .models import Course, CourseProgress, CourseProgressSummary
+from .views import MARK_PART_COMPLETE_QUERY_BUDGET, course_progress_summary, mark_course_part_complete
+
+
+class CourseProgressSummaryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='jane', password='pass')
+        other = User.objects.create_user(username='kim', password='pass')
+        self.started, self.ready, self.untouched = (
+            Course.objects.create(title=title, description='') for title in ('Started', 'Ready', 'Untouched')
+        )
+        CourseProgress.objects.create(user=self.user, course=self.started, part='video')
+        for part in ('theory', 'practice', 'video'):
+            CourseProgress.objects.create(user=self.user, course=self.ready, part=part)
+        CourseProgress.objects.create(user=other, course=self.untouched, part='theory')
+
+    def test_every_course_in_one_response(self):
+        request = RequestFactory().get('/api/courses/progress/')
+        request.user = self.user
+
+        courses = {c['title']: c for c in json.loads(course_progress_summary(request).content)['courses']}
+
+        self.assertEqual(courses['Started']['completed_parts'], ['video'])
+        self.assertEqual(courses['Ready']['parts_mask'], 7)
+        self.assertTrue(courses['Ready']['can_access_test'])
+        self.assertEqual(courses['Untouched']['parts_mask'], 0)
+        self.assertFalse(courses['Untouched']['can_access_test'])
+
+
+class CourseProgressSummaryDualWriteTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='lena', password='pass')
+        self.course = Course.objects.create(title='Basics', description='')
+
+    def test_parts_and_score_are_mirrored(self):
+        for part in ('theory', 'practice', 'video'):
+            CourseProgress.objects.create(user=self.user, course=self.course, part=part)
+        test = CourseProgress.objects.create(user=self.user, course=self.course, part='test')
+        test.score = 90
+        test.save()
+
+        summary = CourseProgressSummary.objects.get(user=self.user, course=self.course)
+        self.assertEqual(summary.parts, 15)
+        self.assertEqual(summary.test_score, 90)
+        self.assertEqual(summary.test_at, test.completed_at)
+
+        CourseProgress.objects.filter(pk=test.pk).get().delete()
+        summary.refresh_from_db()
+        self.assertEqual((summary.parts, summary.test_at, summary.test_score), (7, None, None))
+        self.assertTrue(summary.can_access_test)
+
+    def test_row_is_deleted_with_its_last_part(self):
+        video = CourseProgress.objects.create(user=self.user, course=self.course, part='video')
+        video.delete()
+
+        self.assertFalse(CourseProgressSummary.objects.filter(user=self.user, course=self.course).exists())
+
+
+class MarkCoursePartCompleteTests(TestCase):
+    def setUp(self):
+        star_action_catalog.invalidate()
+        achievement_catalog.invalidate()
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user(username='mona', password='pass')
+        UserProfile.objects.get_or_create(user=self.user)
+        self.courses = [Course.objects.create(title=f'Course {i}', description='') for i in range(12)]
+
+    def _post(self, course, part, score=None):
+        request = self.factory.post(
+            '/api/courses/complete/',
+            data=json.dumps({'course_id': course.pk, 'part': part, 'score': score}),
+            content_type='application/json',
+        )
+        request.user = self.user
+        # Commit hooks run afterwards, so the catalogs remember the rows this call created.
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as ctx:
+                response = mark_course_part_complete(request)
+        queries = [
+            q for q in ctx.captured_queries
+            if not q['sql'].startswith(('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT'))
+        ]
+        return response, len(queries)
+
+    def _make_challenges(self, count):
+        start = Challenge.objects.count()
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(start, start + count):
+                Challenge.objects.create(
+                    name=f'Finish {i + 1}', description='', type=ChallengeType.FINISH_COURSES,
+                    target_value=i + 1, star_reward=10, active=True,
+                )
+        # Warm what a long-running worker already holds: the active challenges,
+        # their reward actions and the course achievements.
+        with self.captureOnCommitCallbacks(execute=True):
+            for challenge in active_challenges.all():
+                action_name, amount, _ = _challenge_reward(challenge)
+                star_action_catalog.get(action_name, amount)
+            for rule in rules_for('course'):
+                achievement_catalog.get_id(rule['name'], rule['description'], rule['image'])
+
+    def test_test_part_query_count_is_constant(self):
+        self._make_challenges(1)
+        _, first = self._post(self.courses[0], 'test', score=80)
+
+        self._make_challenges(20)
+        for course in self.courses[1:10]:
+            self._post(course, 'test', score=80)
+        _, later = self._post(self.courses[10], 'test', score=80)
+
+        self.assertEqual(first, later)
+        self.assertEqual(first, MARK_PART_COMPLETE_QUERY_BUDGET)
+        self.assertEqual(CourseProgress.objects.get(user=self.user, course=self.courses[0]).score, 80)
+        self.assertEqual(UserChallenge.objects.filter(user=self.user, completed=True).count(), 11)
+
+    def test_repeat_submission_changes_nothing(self):
+        self._post(self.courses[0], 'theory')
+        response, queries = self._post(self.courses[0], 'theory')
+
+        self.assertTrue(json.loads(response.content)['updated'])
+        self.assertEqual(queries, 2)
+        self.assertEqual(UserProfile.objects.get(user=self.user).stars, 200)
+
+    def test_invalid_part_is_rejected(self):
+        response, _ = self._post(self.courses[0], 'homework')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(CourseProgress.objects.exists())
+
+
+class CourseCatalogTests(TestCase):
+    def setUp(self):
+        invalidate_catalog()
+        self.courses = [
+            Course.objects.create(title=f'Course {i}', description='x' * 500) for i in range(3)
+        ]
+
+    def test_pages_are_cached_and_invalidated_on_save(self):
+        first = catalog_page(0, 2)
+        self.assertEqual([c['id'] for c in first['courses']], [c.pk for c in self.courses[:2]])
+        self.assertLessEqual(len(first['courses'][0]['description']), DESCRIPTION_LENGTH)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(catalog_page(0, 2), first)
+
+        after_id = decode_cursor(first['next_cursor'], 1)[0]
+        self.assertEqual([c['title'] for c in catalog_page(after_id, 2)['courses']], ['Course 2'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.courses[0].title = 'Renamed'
+            self.courses[0].save()
+        self.assertEqual(catalog_page(0, 2)['courses'][0]['title'], 'Renamed')
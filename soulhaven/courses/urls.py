@@ -2,6 +2,8 @@ from django.urls import path
 from . import views
 
 urlpatterns = [
+    path('', views.course_catalog, name='course_catalog'),
+    path('progress/', views.course_progress_summary, name='course_progress_summary'),
     path('<int:course_id>/progress/', views.get_course_progress, name='get_course_progress'),
     path('complete/', views.mark_course_part_complete, name='mark_course_part_complete'),
 ]
\ No newline at end of file
@@ -1,9 +1,15 @@
 from django.shortcuts import get_object_or_404
 from django.http import JsonResponse
+from django.db import IntegrityError, transaction
+from django.db.models import Case, FilteredRelation, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
 from django.views.decorators.csrf import csrf_exempt
-from .models import Course, CourseProgress, CoursePart
+from django.views.decorators.http import require_GET
+from .models import PART_BITS, Course, CourseProgress, CoursePart, can_access_test, parts_from_mask
 from django.contrib.auth.decorators import login_required
-from achievements.utils import award_achievement
+from achievements.utils import evaluate_achievements
+from main.pagination import decode_cursor, parse_page_size
+from .catalog import catalog_page
 from stars.models import StarAction, StarHistory
 from challenges.logic import check_course_challenges
 from stars.utils import award_stars
@@ -19,7 +25,7 @@ def get_course_progress(request, course_id):
     - course_id: ID of the course to check.
 
     Logic:
-    - Retrieves all completed parts for the course by the current user.
+    - Reads only the completed part names for the course by the current user.
     - Determines if the 'test' part can be accessed by checking if
       'theory', 'practice', and 'video' parts are completed.
 
@@ -29,17 +35,103 @@ def get_course_progress(request, course_id):
         - can_access_test: boolean flag if user can access the test part
     """
     course = get_object_or_404(Course, id=course_id)
-    progress = CourseProgress.objects.filter(user=request.user, course=course)
+    parts = CourseProgress.objects.filter(user=request.user, course=course).values_list('part', flat=True)
+    mask = sum(PART_BITS.get(part, 0) for part in parts)
 
-    completed_parts = [entry.part for entry in progress]
-    can_access_test = all(part in completed_parts for part in ['theory', 'practice', 'video'])
+    return JsonResponse({
+        'completed_parts': parts_from_mask(mask),
+        'can_access_test': can_access_test(mask),
+    })
+
+
+@require_GET
+@login_required
+def course_catalog(request):
+    """
+    Returns a page of the course catalog: ids, titles and trimmed descriptions.
+
+    Query parameters (all optional):
+    - limit: Page size (default 50, max 200).
+    - cursor: `next_cursor` value from the previous page.
+
+    Logic:
+    - Keyset pagination on course id; pages are cached and versioned
+      (see courses.catalog), so steady-state requests do not query the database.
+
+    Returns:
+    - 200: {'courses': [{'id', 'title', 'description'}, ...], 'next_cursor': str or None}
+    - 400: Invalid limit or cursor
+    """
+    try:
+        limit = parse_page_size(request.GET.get('limit'))
+        after_id = 0
+        cursor = request.GET.get('cursor')
+        if cursor:
+            after_id = int(decode_cursor(cursor, 1)[0])
+    except (ValueError, TypeError):
+        return JsonResponse({'error': 'Invalid limit or cursor'}, status=400)
+
+    return JsonResponse(catalog_page(after_id, limit))
+
+
+@require_GET
+@login_required
+def course_progress_summary(request):
+    """
+    Returns the current user's progress on every course in one response.
+
+    Logic:
+    - One grouped query: courses LEFT JOINed to the user's CourseProgress rows
+      (FilteredRelation), with the completed parts folded into a bitmask in the
+      database (theory=1, practice=2, video=4, test=8; see courses.models.PART_BITS).
+    - can_access_test is computed from the mask server-side.
+
+    Returns:
+    - JSON response containing:
+        - courses: list of {id, title, parts_mask, completed_parts, can_access_test},
+          ordered by course id
+    """
+    part_bit = Sum(
+        Case(
+            *(When(mine__part=part, then=Value(bit)) for part, bit in PART_BITS.items()),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    )
+    rows = Course.objects.annotate(
+        mine=FilteredRelation('courseprogress', condition=Q(courseprogress__user=request.user)),
+    ).values('id', 'title').annotate(mask=Coalesce(part_bit, 0)).order_by('id').values_list('id', 'title', 'mask')
 
     return JsonResponse({
-        'completed_parts': completed_parts,
-        'can_access_test': can_access_test,
+        'courses': [
+            {
+                'id': course_id,
+                'title': title,
+                'parts_mask': mask,
+                'completed_parts': parts_from_mask(mask),
+                'can_access_test': can_access_test(mask),
+            }
+            for course_id, title, mask in rows
+        ]
     })
 
 
+# SQL statements issued by one mark_course_part_complete call that completes a
+# course test (and one challenge), not counting transaction control
+# (SAVEPOINT/RELEASE) and with warm per-process catalogs (achievements, active
+# challenges, challenge reward actions). It is the same for any number of
+# active challenges or completed courses:
+#   course lookup 1, progress insert 1, summary + counter upserts 2,
+#   part stars 6 (StarAction lookup + insert, as every course part has its own
+#   new action name; history, profile update + read-back, leaderboard),
+#   challenges 8 (progress read, counter read, progress upsert, rewards 4, streak),
+#   achievements 2 (stat snapshot, insert).
+# A cold catalog adds one load per catalog plus a lookup per unseen action name.
+# Catalog version checks go to the shared in-memory cache (Redis or Memcached,
+# required by main.caching.require_shared_cache), so they are not SQL queries.
+MARK_PART_COMPLETE_QUERY_BUDGET = 20
+
+
 @csrf_exempt
 @login_required
 def mark_course_part_complete(request):
@@ -50,32 +142,42 @@ def mark_course_part_complete(request):
     - POST request containing course_id, part, and optional score (for 'test').
 
     Logic:
-    - If the part was not already completed, creates a new CourseProgress entry.
+    - Runs as one transaction, within MARK_PART_COMPLETE_QUERY_BUDGET queries.
+    - If the part was not already completed, inserts the CourseProgress entry
+      (with the score, for 'test') in one statement.
     - Awards 200 stars for first-time completion of any part.
-    - If the part is 'test', stores the score and checks for:
-        - Course challenge completion
-        - Course-based achievements:
-            - First Course Completed
-            - Course Explorer (3 completed)
+    - If the part is 'test', also checks for:
+        - Course challenge completion (see challenges.logic, fixed number of queries)
+        - Course-based achievements (see achievements.rules)
 
     Returns:
     - JSON response indicating:
         - status: 'ok'
-        - updated: whether this part was newly completed
+        - updated: whether this part had already been completed
         - achievements: any newly unlocked achievements (for frontend display)
     """
-    if request.method == 'POST':
+    if request.method != 'POST':
+        return JsonResponse({'status': 'error', 'message': 'Invalid request method'}, status=405)
+
+    try:
         data = json.loads(request.body)
-        course_id = data.get('course_id')
-        part = data.get('part')
-        score = data.get('score')
-        course = get_object_or_404(Course, id=course_id)
-
-        progress, created = CourseProgress.objects.get_or_create(
-            user=request.user,
-            course=course,
-            part=part
-        )
+    except json.JSONDecodeError:
+        return JsonResponse({'status': 'error', 'message': 'Invalid JSON'}, status=400)
+
+    part = data.get('part')
+    if part not in CoursePart.values:
+        return JsonResponse({'status': 'error', 'message': 'Invalid course part'}, status=400)
+    score = data.get('score') if part == CoursePart.TEST else None
+
+    with transaction.atomic():
+        course = get_object_or_404(Course.objects.only('id', 'title'), id=data.get('course_id'))
+
+        try:
+            with transaction.atomic():
+                CourseProgress.objects.create(user=request.user, course=course, part=part, score=score)
+            created = True
+        except IntegrityError:
+            created = False
 
         unlocked = []
 
@@ -84,45 +186,13 @@ def mark_course_part_complete(request):
             action_name = f"Course Part Completion: {course.title} - {part_title}"
             award_stars(request.user, action_name, amount=200)
 
-        if part == 'test' and created:
-            progress.score = score
-            progress.save()
-
+        if part == CoursePart.TEST and created:
             check_course_challenges(request.user, course)
 
-            completed_courses = CourseProgress.objects.filter(
-                user=request.user,
-                part='test'
-            ).values_list('course', flat=True).distinct().count()
-
-            if completed_courses == 1:
-                if award_achievement(
-                    request.user,
-                    name="First Course Completed",
-                    description="You completed your first full course!",
-                    image="achievements/first_course.png"
-                ):
-                    unlocked.append({
-                        'name': "First Course Completed",
-                        'description': "You completed your first full course!",
-                        'image': "achievements/first_course.png"
-                    })
-
-            if completed_courses == 3:
-                if award_achievement(
-                    request.user,
-                    name="Course Explorer",
-                    description="You’ve completed 3 courses — great learning streak!",
-                    image="achievements/three_courses.png"
-                ):
-                    unlocked.append({
-                        'name': "Course Explorer",
-                        'description': "You’ve completed 3 courses — great learning streak!",
-                        'image': "achievements/three_courses.png"
-                    })
-
-        return JsonResponse({
-            'status': 'ok',
-            'updated': not created,
-            'achievements': unlocked
-        })
\ No newline at end of file
+            unlocked = evaluate_achievements(request.user, trigger='course')
+
+    return JsonResponse({
+        'status': 'ok',
+        'updated': not created,
+        'achievements': unlocked
+    })
@@ -1,2 +1,16 @@
 from django.contrib import admin
+from .models import GameMonthlySummary, GamePlayStats
 
+
+@admin.register(GamePlayStats)
+class GamePlayStatsAdmin(admin.ModelAdmin):
+    list_display = ('user', 'game_type', 'play_count', 'first_played', 'last_played')
+    list_filter = ('game_type',)
+    readonly_fields = ('user', 'game_type', 'play_count', 'first_played', 'last_played')
+
+
+@admin.register(GameMonthlySummary)
+class GameMonthlySummaryAdmin(admin.ModelAdmin):
+    list_display = ('user', 'game_type', 'month', 'plays')
+    list_filter = ('game_type', 'month')
+    readonly_fields = ('user', 'game_type', 'month', 'plays', 'first_played', 'last_played')
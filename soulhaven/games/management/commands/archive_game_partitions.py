@@ -0,0 +1,42 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from games.partitions import archive_partition, expired_partitions
+
+
+class Command(BaseCommand):
+    """
+    Archives CompletedGame partitions older than the retention period into
+    GameMonthlySummary and detaches them. Intended to run monthly from cron.
+
+    Each month is archived in its own transaction (see games.partitions.archive_partition),
+    so an interrupted run can simply be repeated.
+
+    Examples:
+    - python manage.py archive_game_partitions --dry-run
+    - python manage.py archive_game_partitions --retention-months 6 --keep-detached
+    """
+    help = 'Summarize and drop CompletedGame partitions past the retention period.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retention-months', type=int, default=settings.GAME_HISTORY_RETENTION_MONTHS,
+            help=f'Months of raw history to keep (default {settings.GAME_HISTORY_RETENTION_MONTHS}).',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Only list the partitions that would be archived.')
+        parser.add_argument('--keep-detached', action='store_true', help='Detach archived partitions without dropping them.')
+
+    def handle(self, *args, **options):
+        expired = expired_partitions(options['retention_months'])
+        if options['dry_run']:
+            for month, name in expired:
+                self.stdout.write(f'  {month:%Y-%m} {name}')
+            self.stdout.write(self.style.SUCCESS(f'{len(expired)} partition(s) would be archived.'))
+            return
+
+        for month, name in expired:
+            started = time.monotonic()
+            written = archive_partition(month, drop=not options['keep_detached'])
+            self.stdout.write(f'  {name}: {written} summary row(s) in {time.monotonic() - started:.2f}s')
+        self.stdout.write(self.style.SUCCESS(f'{len(expired)} partition(s) archived.'))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from games.partitions import ensure_partitions
+
+
+class Command(BaseCommand):
+    """
+    Creates the upcoming monthly CompletedGame partitions. Intended to run daily
+    from cron; months that already have a partition are skipped.
+
+    Examples:
+    - python manage.py create_game_partitions
+    - python manage.py create_game_partitions --months-ahead 6
+    """
+    help = 'Create monthly CompletedGame partitions ahead of time.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, default=3, help='Future months to prepare (default 3).')
+
+    def handle(self, *args, **options):
+        created = ensure_partitions(months_ahead=options['months_ahead'])
+        for name in created:
+            self.stdout.write(f'  created {name}')
+        self.stdout.write(self.style.SUCCESS(f'{len(created)} partition(s) created.'))
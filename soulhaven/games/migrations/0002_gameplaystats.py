@@ -0,0 +1,53 @@
+# Generated by Django 5.2 on 2026-10-18 11:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, Min
+
+
+def backfill_stats(apps, schema_editor):
+    """
+    Builds the per-(user, game type) counters from existing CompletedGame rows
+    with one grouped query streamed into batched inserts.
+    """
+    CompletedGame = apps.get_model('games', 'CompletedGame')
+    GamePlayStats = apps.get_model('games', 'GamePlayStats')
+
+    rows = CompletedGame.objects.values('user_id', 'game_type').annotate(
+        play_count=Count('id'), first_played=Min('played_at'), last_played=Max('played_at'),
+    ).order_by()
+
+    batch = []
+    for row in rows.iterator(chunk_size=5000):
+        batch.append(GamePlayStats(**row))
+        if len(batch) >= 5000:
+            GamePlayStats.objects.bulk_create(batch)
+            batch = []
+    GamePlayStats.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GamePlayStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('game_type', models.CharField(choices=[('puzzles', 'Puzzles'), ('mandalas', 'Mandalas'), ('pop_bubbles', 'Pop the Bubble'), ('firefly', 'Firefly Rhythm'), ('phrases', 'Phrase Builder')], max_length=50)),
+                ('play_count', models.PositiveIntegerField(default=0)),
+                ('first_played', models.DateTimeField()),
+                ('last_played', models.DateTimeField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'game_type')},
+            },
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-18 11:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0002_gameplaystats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameMonthlySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('game_type', models.CharField(choices=[('puzzles', 'Puzzles'), ('mandalas', 'Mandalas'), ('pop_bubbles', 'Pop the Bubble'), ('firefly', 'Firefly Rhythm'), ('phrases', 'Phrase Builder')], max_length=50)),
+                ('month', models.DateField()),
+                ('plays', models.PositiveIntegerField(default=0)),
+                ('first_played', models.DateTimeField()),
+                ('last_played', models.DateTimeField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'game_type', 'month')},
+            },
+        ),
+    ]
@@ -0,0 +1,128 @@
+from datetime import date, datetime, time
+
+from django.db import migrations
+from django.utils import timezone
+
+TABLE = 'games_completedgame'
+LEGACY_TABLE = 'games_completedgame_unpartitioned'
+SEQUENCE = 'games_completedgame_partitioned_id_seq'
+MONTHS_AHEAD = 3
+
+
+def _add_month(month):
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _bound(month):
+    return timezone.make_aware(datetime.combine(month, time.min))
+
+
+def partition_completed_games(apps, schema_editor):
+    """
+    Rebuilds games_completedgame as a table range-partitioned by month on played_at.
+
+    - The existing table is renamed, a partitioned table with the same columns
+      is created (primary key (id, played_at), as PostgreSQL requires the
+      partition key in it), plus a default partition and monthly partitions
+      from the oldest play through MONTHS_AHEAD months ahead.
+    - Rows are copied over, the id sequence continues after the highest id,
+      and the old table is dropped. Takes an exclusive lock on the table for
+      the duration; run during a quiet period on large installations.
+    """
+    qn = schema_editor.quote_name
+    user_table = qn(apps.get_model('auth', 'User')._meta.db_table)
+    table, legacy, sequence = qn(TABLE), qn(LEGACY_TABLE), qn(SEQUENCE)
+
+    schema_editor.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+    # Frees the primary key's name for the new table.
+    schema_editor.execute(f"ALTER TABLE {legacy} RENAME CONSTRAINT {qn(TABLE + '_pkey')} TO {qn(LEGACY_TABLE + '_pkey')}")
+    schema_editor.execute(f"CREATE SEQUENCE {sequence}")
+    schema_editor.execute(
+        f"CREATE TABLE {table} ("
+        f"id bigint NOT NULL DEFAULT nextval('{SEQUENCE}'), "
+        f"game_type varchar(50) NOT NULL, "
+        f"played_at timestamp with time zone NOT NULL, "
+        f"user_id integer NOT NULL REFERENCES {user_table} (id) DEFERRABLE INITIALLY DEFERRED, "
+        f"PRIMARY KEY (id, played_at)"
+        f") PARTITION BY RANGE (played_at)"
+    )
+    schema_editor.execute(f"ALTER SEQUENCE {sequence} OWNED BY {table}.id")
+    schema_editor.execute(f"CREATE TABLE {qn(TABLE + '_default')} PARTITION OF {table} DEFAULT")
+    schema_editor.execute(f"CREATE INDEX {qn('games_completedgame_user_played_idx')} ON {table} (user_id, played_at)")
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"SELECT min(played_at) FROM {legacy}")
+        oldest = cursor.fetchone()[0]
+
+    today = timezone.localdate()
+    month = date(oldest.year, oldest.month, 1) if oldest else date(today.year, today.month, 1)
+    last = date(today.year, today.month, 1)
+    for _ in range(MONTHS_AHEAD):
+        last = _add_month(last)
+    while month <= last:
+        schema_editor.execute(
+            f"CREATE TABLE {qn(f'{TABLE}_p{month:%Y_%m}')} PARTITION OF {table} FOR VALUES FROM (%s) TO (%s)",
+            [_bound(month), _bound(_add_month(month))],
+        )
+        month = _add_month(month)
+
+    schema_editor.execute(
+        f"INSERT INTO {table} (id, game_type, played_at, user_id) "
+        f"SELECT id, game_type, played_at, user_id FROM {legacy}"
+    )
+    schema_editor.execute(f"SELECT setval('{SEQUENCE}', COALESCE((SELECT max(id) FROM {table}), 0) + 1, false)")
+    schema_editor.execute(f"DROP TABLE {legacy}")
+
+
+def unpartition_completed_games(apps, schema_editor):
+    """
+    Reverses partition_completed_games: copies the rows still in the partitions
+    into a plain games_completedgame table (bigint identity primary key on id,
+    indexed user_id foreign key, as created by 0001) and drops the partitioned
+    table with its partitions.
+
+    - Months already archived into GameMonthlySummary only exist as monthly
+      counts, so their individual plays cannot be restored.
+    """
+    qn = schema_editor.quote_name
+    user_table = qn(apps.get_model('auth', 'User')._meta.db_table)
+    table, partitioned = qn(TABLE), qn(TABLE + '_partitioned')
+
+    schema_editor.execute(f"ALTER TABLE {table} RENAME TO {partitioned}")
+    schema_editor.execute(f"ALTER TABLE {partitioned} RENAME CONSTRAINT {qn(TABLE + '_pkey')} TO {qn(TABLE + '_partitioned_pkey')}")
+    schema_editor.execute(
+        f"CREATE TABLE {table} ("
+        f"id bigint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY, "
+        f"game_type varchar(50) NOT NULL, "
+        f"played_at timestamp with time zone NOT NULL, "
+        f"user_id integer NOT NULL REFERENCES {user_table} (id) DEFERRABLE INITIALLY DEFERRED"
+        f")"
+    )
+    schema_editor.execute(
+        f"CREATE INDEX {qn(schema_editor._create_index_name(TABLE, ['user_id'], suffix=''))} ON {table} (user_id)"
+    )
+    schema_editor.execute(
+        f"INSERT INTO {table} (id, game_type, played_at, user_id) "
+        f"SELECT id, game_type, played_at, user_id FROM {partitioned}"
+    )
+    schema_editor.execute(
+        f"SELECT setval(pg_get_serial_sequence('{TABLE}', 'id'), COALESCE((SELECT max(id) FROM {table}), 0) + 1, false)"
+    )
+    schema_editor.execute(f"DROP TABLE {partitioned}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('games', '0003_gamemonthlysummary'),
+    ]
+
+    # Only the database changes: the model state keeps `id` as the primary key.
+    # The database key is (id, played_at) because PostgreSQL requires the
+    # partition key in it, but id alone stays unique (one sequence feeds every
+    # partition), so the ORM's single-column pk remains correct. Django cannot
+    # migrate an existing primary key to a CompositePrimaryKey.
+    operations = [
+        migrations.RunPython(partition_completed_games, unpartition_completed_games),
+    ]
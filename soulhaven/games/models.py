@@ -22,6 +22,11 @@ class CompletedGame(models.Model):
     """
     Tracks when a user plays a specific mini-game.
 
+    The table is range-partitioned by month on played_at (PostgreSQL declarative
+    partitioning, see games.partitions); its database primary key is (id, played_at).
+    Partitions older than the retention period are folded into
+    GameMonthlySummary and dropped.
+
     Fields:
     - user: The user who played the game.
     - game_type: The type of game played (from GameType).
@@ -36,3 +41,64 @@ class CompletedGame(models.Model):
 
     def __str__(self):
         return f"{self.user.username} - {self.get_game_type_display()} - {self.played_at.strftime('%Y-%m-%d %H:%M')}"
+
+
+class GamePlayStats(models.Model):
+    """
+    Per-user, per-game counters, updated with one upsert per completed game
+    (see games.stats.record_game_play), so first-play checks and stats pages
+    never count CompletedGame rows.
+
+    Fields:
+    - user: The player.
+    - game_type: The game (from GameType).
+    - play_count: Number of completed plays.
+    - first_played: When the game was first completed.
+    - last_played: When the game was last completed.
+
+    Meta:
+    - unique_together: One row per user/game type combination.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    game_type = models.CharField(max_length=50, choices=GameType.choices)
+    play_count = models.PositiveIntegerField(default=0)
+    first_played = models.DateTimeField()
+    last_played = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('user', 'game_type')
+
+    def __str__(self):
+        return f"{self.user.username} - {self.get_game_type_display()} - {self.play_count} plays"
+
+
+class GameMonthlySummary(models.Model):
+    """
+    Compact per-user, per-game, per-month record of archived CompletedGame rows.
+
+    Written when a monthly CompletedGame partition passes the retention period
+    (see games.partitions.archive_partition); queries spanning old and recent
+    months combine both (see games.partitions.monthly_play_counts).
+
+    Fields:
+    - user: The player.
+    - game_type: The game (from GameType).
+    - month: First day of the month summarized.
+    - plays: Number of completed plays in that month.
+    - first_played / last_played: First and last play within the month.
+
+    Meta:
+    - unique_together: One row per user/game type/month.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    game_type = models.CharField(max_length=50, choices=GameType.choices)
+    month = models.DateField()
+    plays = models.PositiveIntegerField(default=0)
+    first_played = models.DateTimeField()
+    last_played = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('user', 'game_type', 'month')
+
+    def __str__(self):
+        return f"{self.user.username} - {self.get_game_type_display()} - {self.month:%Y-%m} - {self.plays} plays"
@@ -0,0 +1,257 @@
+from datetime import date, datetime, time
+
+from django.conf import settings
+from django.db import IntegrityError, ProgrammingError, connection, transaction
+from django.db.models import Count, DateField, Max, Min
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+from psycopg import errors
+from .models import CompletedGame, GameMonthlySummary
+
+PARTITION_PREFIX = f'{CompletedGame._meta.db_table}_p'
+DEFAULT_PARTITION = f'{CompletedGame._meta.db_table}_default'
+
+
+def month_start(day):
+    """
+    Returns the first day of the month containing `day`.
+    """
+    return date(day.year, day.month, 1)
+
+
+def add_months(month, count):
+    """
+    Returns the first day of the month `count` months after `month` (negative counts go back).
+    """
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    """
+    Returns the table name of the CompletedGame partition for a month (e.g. games_completedgame_p2026_10).
+    """
+    return f'{PARTITION_PREFIX}{month:%Y_%m}'
+
+
+def _bound(month):
+    return timezone.make_aware(datetime.combine(month, time.min))
+
+
+def existing_partitions():
+    """
+    Returns:
+    - dict: {first day of month: partition table name} for every monthly partition
+            currently attached to the CompletedGame table (the default partition excluded).
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = %s",
+            [CompletedGame._meta.db_table],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = {}
+    for name in names:
+        suffix = name[len(PARTITION_PREFIX):] if name.startswith(PARTITION_PREFIX) else ''
+        try:
+            year, month = (int(part) for part in suffix.split('_'))
+        except ValueError:
+            continue
+        partitions[date(year, month, 1)] = name
+    return partitions
+
+
+def _create_partition(month):
+    """
+    Creates the CompletedGame partition for one month.
+
+    Logic:
+    - Normally a single CREATE TABLE ... PARTITION OF.
+    - If rows for the month already landed in the default partition, PostgreSQL
+      refuses that (check violation). The month's table is then created standalone,
+      the rows are moved into it from the default partition and it is attached, in
+      one transaction holding the default partition locked so no new row for the
+      month can land there meanwhile.
+
+    Returns:
+    - bool: False if the partition already existed (e.g. a concurrent run created it).
+    """
+    qn = connection.ops.quote_name
+    table, name, default = qn(CompletedGame._meta.db_table), qn(partition_name(month)), qn(DEFAULT_PARTITION)
+    columns = ', '.join(qn(field.column) for field in CompletedGame._meta.concrete_fields)
+    bounds = [_bound(month), _bound(add_months(month, 1))]
+
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            try:
+                with transaction.atomic():
+                    cursor.execute(f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES FROM (%s) TO (%s)", bounds)
+                return True
+            except IntegrityError as exc:
+                if not isinstance(exc.__cause__, errors.CheckViolation):
+                    raise
+
+            cursor.execute(f"LOCK TABLE {default} IN ACCESS EXCLUSIVE MODE")
+            cursor.execute(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+            cursor.execute(
+                f"WITH moved AS (DELETE FROM {default} WHERE played_at >= %s AND played_at < %s "
+                f"RETURNING {columns}) INSERT INTO {name} ({columns}) SELECT {columns} FROM moved",
+                bounds,
+            )
+            cursor.execute(f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM (%s) TO (%s)", bounds)
+            return True
+    except ProgrammingError as exc:
+        if not isinstance(exc.__cause__, errors.DuplicateTable):
+            raise
+        return False
+
+
+def ensure_partitions(months_ahead=3, start=None):
+    """
+    Creates the monthly CompletedGame partitions from `start` through `months_ahead` months from now.
+
+    Parameters:
+    - months_ahead (int, optional): How many future months to prepare.
+    - start (date, optional): First month to create; defaults to the current month.
+
+    Notes:
+    - Rows for a month without a partition land in the default partition; creating
+      the month later moves them into it (see _create_partition), which locks the
+      default partition while it runs. Run the create_game_partitions command well
+      ahead (e.g. daily from cron) so that stays rare.
+
+    Returns:
+    - list: Names of the partitions created by this call.
+    """
+    current = month_start(timezone.localdate())
+    month = month_start(start) if start else current
+    last = add_months(current, months_ahead)
+    existing = existing_partitions()
+
+    created = []
+    while month <= last:
+        if month not in existing and _create_partition(month):
+            created.append(partition_name(month))
+        month = add_months(month, 1)
+    return created
+
+
+def expired_partitions(retention_months=None):
+    """
+    Returns:
+    - list: (month, partition name) for attached partitions entirely older than the
+            retention period (GAME_HISTORY_RETENTION_MONTHS by default), oldest first.
+    """
+    if retention_months is None:
+        retention_months = settings.GAME_HISTORY_RETENTION_MONTHS
+    cutoff = add_months(month_start(timezone.localdate()), -retention_months)
+    return sorted((month, name) for month, name in existing_partitions().items() if month < cutoff)
+
+
+def archive_partition(month, drop=True):
+    """
+    Folds one monthly CompletedGame partition into GameMonthlySummary and removes it.
+
+    Parameters:
+    - month (date): First day of the month to archive.
+    - drop (bool, optional): Drop the detached partition (default); if False it is
+                             kept as a standalone table, e.g. for a manual export.
+
+    Logic:
+    - In one transaction: aggregates the month's rows per (user, game type) in the
+      database, adds them to any existing summaries for that month with one upsert,
+      then detaches (and drops) the partition. A failure rolls everything back, so
+      a month is never both summarized and still partitioned.
+
+    Returns:
+    - int: Number of summary rows written.
+    """
+    name = partition_name(month)
+    qn = connection.ops.quote_name
+
+    with transaction.atomic():
+        grouped = CompletedGame.objects.filter(
+            played_at__gte=_bound(month), played_at__lt=_bound(add_months(month, 1))
+        ).values('user_id', 'game_type').annotate(
+            plays=Count('id'), first_played=Min('played_at'), last_played=Max('played_at'),
+        ).order_by()
+        summaries = {
+            (row['user_id'], row['game_type']): GameMonthlySummary(month=month, **row)
+            for row in grouped
+        }
+
+        for user_id, game_type, plays, first_played, last_played in GameMonthlySummary.objects.filter(
+            month=month, user_id__in={user_id for user_id, _ in summaries}
+        ).values_list('user_id', 'game_type', 'plays', 'first_played', 'last_played'):
+            summary = summaries.get((user_id, game_type))
+            if summary is not None:
+                summary.plays += plays
+                summary.first_played = min(summary.first_played, first_played)
+                summary.last_played = max(summary.last_played, last_played)
+
+        GameMonthlySummary.objects.bulk_create(
+            summaries.values(),
+            batch_size=5000,
+            update_conflicts=True,
+            unique_fields=['user', 'game_type', 'month'],
+            update_fields=['plays', 'first_played', 'last_played'],
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {qn(CompletedGame._meta.db_table)} DETACH PARTITION {qn(name)}")
+            if drop:
+                cursor.execute(f"DROP TABLE {qn(name)}")
+
+    return len(summaries)
+
+
+def monthly_play_counts(user_ids, since=None):
+    """
+    Counts plays per (user, game type, month), across live partitions and archived summaries.
+
+    Parameters:
+    - user_ids (iterable of int): Users to count.
+    - since (date, optional): Only months from this one on.
+
+    Logic:
+    - One grouped query over CompletedGame (recent months) and one over
+      GameMonthlySummary (archived months); a month is only ever in one of them.
+
+    Returns:
+    - dict: {(user_id, game_type, month): plays}
+    """
+    user_ids = list(user_ids)
+    recent = CompletedGame.objects.filter(user_id__in=user_ids)
+    archived = GameMonthlySummary.objects.filter(user_id__in=user_ids)
+    if since is not None:
+        recent = recent.filter(played_at__gte=_bound(month_start(since)))
+        archived = archived.filter(month__gte=month_start(since))
+
+    counts = {
+        (row['user_id'], row['game_type'], row['month']): row['plays']
+        for row in recent.annotate(month=TruncMonth('played_at', output_field=DateField())).values(
+            'user_id', 'game_type', 'month'
+        ).annotate(plays=Count('id')).order_by()
+    }
+    for user_id, game_type, month, plays in archived.values_list('user_id', 'game_type', 'month', 'plays'):
+        key = (user_id, game_type, month)
+        counts[key] = counts.get(key, 0) + plays
+    return counts
+
+
+def played_game_types(user_ids):
+    """
+    Returns:
+    - dict: {user_id: set of game types ever played}, across live partitions and archived summaries.
+    """
+    user_ids = list(user_ids)
+    played = {}
+    for model in (CompletedGame, GameMonthlySummary):
+        rows = model.objects.filter(user_id__in=user_ids).values_list('user_id', 'game_type').distinct().order_by()
+        for user_id, game_type in rows:
+            played.setdefault(user_id, set()).add(game_type)
+    return played
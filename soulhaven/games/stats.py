@@ -0,0 +1,40 @@
+from django.db import connection
+from .models import GamePlayStats
+
+
+def record_game_play(user_id, game_type, played_at):
+    """
+    Counts one completed play in the user's GamePlayStats row.
+
+    Parameters:
+    - user_id (int): The player.
+    - game_type (str): The GameType value played.
+    - played_at (datetime): When the play was completed.
+
+    Logic:
+    - One INSERT ... ON CONFLICT DO UPDATE: creates the row on the first play,
+      otherwise increments play_count, moves first_played back and last_played
+      forward, so out-of-order plays leave the same range as the backfill's Min/Max.
+
+    Returns:
+    - int: The play count after this play (1 on a first play).
+    """
+    opts = GamePlayStats._meta
+    qn = connection.ops.quote_name
+    table = qn(opts.db_table)
+    user, game, count, first, last = (
+        qn(opts.get_field(name).column)
+        for name in ('user', 'game_type', 'play_count', 'first_played', 'last_played')
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} ({user}, {game}, {count}, {first}, {last}) VALUES (%s, %s, 1, %s, %s) "
+            f"ON CONFLICT ({user}, {game}) DO UPDATE SET "
+            f"{count} = {table}.{count} + 1, "
+            f"{first} = LEAST({table}.{first}, EXCLUDED.{first}), "
+            f"{last} = GREATEST({table}.{last}, EXCLUDED.{last}) "
+            f"RETURNING {count}",
+            [user_id, game_type, played_at, played_at],
+        )
+        return cursor.fetchone()[0]
@@ -1,2 +1,115 @@
+from datetime import date, datetime, timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.utils import timezone
+
+from .models import CompletedGame, GameMonthlySummary, GamePlayStats, GameType
+from .partitions import (
+    DEFAULT_PARTITION, add_months, archive_partition, ensure_partitions, existing_partitions,
+    expired_partitions, month_start, monthly_play_counts, partition_name, played_game_types,
+)
+from .stats import record_game_play
+
+
+class RecordGamePlayTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='gus', password='pass')
+
+    def test_counts_plays_and_tracks_first_and_last(self):
+        start = timezone.now()
+        counts = [
+            record_game_play(self.user.pk, GameType.FIREFLY, start + timedelta(minutes=offset))
+            for offset in (0, 5, -3)
+        ]
+        self.assertEqual(counts, [1, 2, 3])
+
+        stats = GamePlayStats.objects.get(user=self.user, game_type=GameType.FIREFLY)
+        self.assertEqual(stats.first_played, start - timedelta(minutes=3))
+        self.assertEqual(stats.last_played, start + timedelta(minutes=5))
+
+
+class PartitionHelperTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='mira', password='pass')
+
+    def test_add_months_crosses_year_boundaries(self):
+        self.assertEqual(add_months(date(2025, 11, 1), 3), date(2026, 2, 1))
+        self.assertEqual(add_months(date(2026, 1, 1), -1), date(2025, 12, 1))
+        self.assertEqual(add_months(date(2026, 1, 1), -12), date(2025, 1, 1))
+
+    def test_counts_combine_live_rows_and_archived_summaries(self):
+        now = timezone.now()
+        current = month_start(timezone.localdate())
+        archived = add_months(current, -14)
+        CompletedGame.objects.create(user=self.user, game_type=GameType.FIREFLY)
+        CompletedGame.objects.create(user=self.user, game_type=GameType.FIREFLY)
+        GameMonthlySummary.objects.create(
+            user=self.user, game_type=GameType.MANDALAS, month=archived,
+            plays=4, first_played=now - timedelta(days=430), last_played=now - timedelta(days=420),
+        )
+
+        counts = monthly_play_counts([self.user.pk])
+        self.assertEqual(counts, {
+            (self.user.pk, GameType.FIREFLY, current): 2,
+            (self.user.pk, GameType.MANDALAS, archived): 4,
+        })
+        self.assertEqual(monthly_play_counts([self.user.pk], since=current), {
+            (self.user.pk, GameType.FIREFLY, current): 2,
+        })
+        self.assertEqual(played_game_types([self.user.pk]), {
+            self.user.pk: {GameType.FIREFLY, GameType.MANDALAS},
+        })
+
+
+class PartitionArchiveTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='otto', password='pass')
+        self.current = month_start(timezone.localdate())
+        self.old = add_months(self.current, -14)
+
+    def _play(self, game_type, month, day=3):
+        game = CompletedGame.objects.create(user=self.user, game_type=game_type)
+        played_at = timezone.make_aware(datetime(month.year, month.month, day, 12))
+        # played_at is auto_now_add; the update moves the row into the month's partition.
+        CompletedGame.objects.filter(pk=game.pk).update(played_at=played_at)
+        return played_at
+
+    def test_ensure_partitions_reports_only_new_tables(self):
+        # The migration created the current month onwards.
+        created = ensure_partitions(months_ahead=0, start=self.old)
+        self.assertEqual(len(created), 14)
+        self.assertEqual(created[0], partition_name(self.old))
+        self.assertEqual(ensure_partitions(months_ahead=0, start=self.old), [])
+
+    def test_rows_in_the_default_partition_move_into_their_month(self):
+        played_at = self._play(GameType.PUZZLES, self.old)
+
+        self.assertIn(partition_name(self.old), ensure_partitions(months_ahead=0, start=self.old))
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT played_at FROM {partition_name(self.old)}')
+            self.assertEqual(cursor.fetchall(), [(played_at,)])
+            cursor.execute(f'SELECT count(*) FROM {DEFAULT_PARTITION}')
+            self.assertEqual(cursor.fetchone(), (0,))
+        self.assertEqual(CompletedGame.objects.get(user=self.user).played_at, played_at)
+
+    def test_archiving_folds_a_month_into_summaries(self):
+        ensure_partitions(months_ahead=0, start=self.old)
+        first = self._play(GameType.PUZZLES, self.old, day=3)
+        last = self._play(GameType.PUZZLES, self.old, day=20)
+        self._play(GameType.MANDALAS, self.old)
+        self._play(GameType.FIREFLY, self.current, day=1)
+        counts = monthly_play_counts([self.user.pk])
+        played = played_game_types([self.user.pk])
+
+        self.assertIn((self.old, partition_name(self.old)), expired_partitions(12))
+        self.assertEqual(archive_partition(self.old), 2)
 
+        summary = GameMonthlySummary.objects.get(user=self.user, game_type=GameType.PUZZLES, month=self.old)
+        self.assertEqual((summary.plays, summary.first_played, summary.last_played), (2, first, last))
+        self.assertNotIn(self.old, existing_partitions())
+        self.assertEqual(CompletedGame.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(monthly_play_counts([self.user.pk]), counts)
+        self.assertEqual(played_game_types([self.user.pk]), played)
@@ -1,6 +1,8 @@
 from django.urls import path
-from .views import complete_game
+from .views import complete_game, game_monthly_stats_api, game_stats_api
 
 urlpatterns = [
     path('complete/', complete_game, name='complete_game'),
+    path('stats/', game_stats_api, name='game_stats_api'),
+    path('stats/monthly/', game_monthly_stats_api, name='game_monthly_stats_api'),
 ]
@@ -1,41 +1,19 @@
 from django.contrib.auth.decorators import login_required
+from django.db import transaction
 from django.http import JsonResponse
-from .models import CompletedGame, GameType
+from django.views.decorators.http import require_GET
+from django.utils import timezone
+from main.pagination import parse_page_size
+from .models import CompletedGame, GamePlayStats, GameType
+from .partitions import add_months, month_start, monthly_play_counts
+from .stats import record_game_play
 from stars.models import StarAction, StarHistory
-from achievements.utils import award_achievement
+from achievements.utils import evaluate_counter_achievements
 from stars.utils import award_stars
 from django.views.decorators.csrf import csrf_exempt
 import json
 
 
-FIRST_GAME_TYPE_ACHIEVEMENTS = {
-    GameType.PUZZLES: {
-        "name": "Puzzle Starter",
-        "description": "You played a puzzle game for the first time!",
-        "image": "achievements/puzzle_starter.png"
-    },
-    GameType.MANDALAS: {
-        "name": "Mandala Beginner",
-        "description": "You colored your first mandala!",
-        "image": "achievements/mandala_beginner.png"
-    },
-    GameType.POP_BUBBLES: {
-        "name": "Bubble Popper",
-        "description": "You popped your first bubble!",
-        "image": "achievements/bubble_popper.png"
-    },
-    GameType.FIREFLY: {
-        "name": "Rhythm Rider",
-        "description": "You chased your first firefly!",
-        "image": "achievements/rhythm_rider.png"
-    },
-    GameType.PHRASES: {
-        "name": "Phrase Crafter",
-        "description": "You built your first phrase!",
-        "image": "achievements/phrase_crafter.png"
-    },
-}
-
 @csrf_exempt
 @login_required
 def complete_game(request):
@@ -46,9 +24,11 @@ def complete_game(request):
     - POST request containing 'game_type' as JSON.
 
     Logic:
-    - Records game play.
-    - Awards 50 stars.
-    - Checks if it's the first time user plays this game type, and awards achievement.
+    - In one transaction:
+        - Records game play and counts it in the user's GamePlayStats row (one upsert).
+        - Awards 50 stars.
+        - Awards the game achievements the new play count reaches (e.g. first play
+          of each game type, see achievements.rules) without counting past plays.
 
     Response:
     - JSON response with status, message, and any unlocked achievements.
@@ -61,26 +41,13 @@ def complete_game(request):
             if game_type not in GameType.values:
                 return JsonResponse({'status': 'error', 'message': 'Invalid game type'}, status=400)
 
-            CompletedGame.objects.create(user=request.user, game_type=game_type)
-
-            award_stars(request.user, f'Game Completion: {game_type.title()}', amount=50)
+            with transaction.atomic():
+                game = CompletedGame.objects.create(user=request.user, game_type=game_type)
+                play_count = record_game_play(request.user.pk, game_type, game.played_at)
 
-            unlocked = []
+                award_stars(request.user, f'Game Completion: {game_type.title()}', amount=50)
 
-            if CompletedGame.objects.filter(user=request.user, game_type=game_type).count() == 1:
-                achievement_data = FIRST_GAME_TYPE_ACHIEVEMENTS.get(game_type)
-                if achievement_data:
-                    if award_achievement(
-                        request.user,
-                        name=achievement_data['name'],
-                        description=achievement_data['description'],
-                        image=achievement_data['image']
-                    ):
-                        unlocked.append({
-                            'name': achievement_data['name'],
-                            'description': achievement_data['description'],
-                            'image': achievement_data['image']
-                        })
+                unlocked = evaluate_counter_achievements(request.user, f'games_played:{game_type}', play_count)
 
             return JsonResponse({
                 'status': 'ok',
@@ -91,4 +58,77 @@ def complete_game(request):
         except json.JSONDecodeError:
             return JsonResponse({'status': 'error', 'message': 'Invalid JSON'}, status=400)
 
-    return JsonResponse({'status': 'error', 'message': 'Invalid request method'}, status=405)
\ No newline at end of file
+    return JsonResponse({'status': 'error', 'message': 'Invalid request method'}, status=405)
+
+
+@require_GET
+@login_required
+def game_stats_api(request):
+    """
+    Returns the current user's play statistics for every game they have played.
+
+    Logic:
+    - Reads the user's GamePlayStats rows (one per game type), maintained on
+      every completion; no CompletedGame rows are counted.
+
+    Returns:
+    - JSON response containing:
+        - games: list of {game_type, name, play_count, first_played, last_played}
+        - total_plays: sum of play counts
+    """
+    rows = GamePlayStats.objects.filter(user=request.user).order_by('game_type').values_list(
+        'game_type', 'play_count', 'first_played', 'last_played'
+    )
+    games = [
+        {
+            'game_type': game_type,
+            'name': GameType(game_type).label if game_type in GameType.values else game_type,
+            'play_count': play_count,
+            'first_played': first_played.isoformat(),
+            'last_played': last_played.isoformat(),
+        }
+        for game_type, play_count, first_played, last_played in rows
+    ]
+    return JsonResponse({
+        'games': games,
+        'total_plays': sum(game['play_count'] for game in games),
+    })
+
+
+MAX_HISTORY_MONTHS = 60
+
+
+@require_GET
+@login_required
+def game_monthly_stats_api(request):
+    """
+    Returns the current user's plays per month and game type.
+
+    Query parameters:
+    - months: How many months back to report, including the current one (default 12, max 60).
+
+    Logic:
+    - Counts recent months from the CompletedGame partitions and older months
+      from GameMonthlySummary (see games.partitions.monthly_play_counts), so
+      the history stays complete after partitions are archived.
+
+    Returns:
+    - 200: {'months': [{'month': 'YYYY-MM', 'games': {game_type: plays}, 'total': int}, ...]}, newest first
+    - 400: Invalid months
+    """
+    try:
+        months = parse_page_size(request.GET.get('months'), 12, MAX_HISTORY_MONTHS)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid months'}, status=400)
+
+    since = add_months(month_start(timezone.localdate()), 1 - months)
+    by_month = {}
+    for (_, game_type, month), plays in monthly_play_counts([request.user.pk], since=since).items():
+        by_month.setdefault(month, {})[game_type] = plays
+
+    return JsonResponse({
+        'months': [
+            {'month': f'{month:%Y-%m}', 'games': games, 'total': sum(games.values())}
+            for month, games in sorted(by_month.items(), reverse=True)
+        ]
+    })
@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+
+VERSION_KEY_PREFIX = 'soulhaven:version:'
+SHARED_MEMORY_BACKENDS = (
+    'django.core.cache.backends.redis.RedisCache',
+    'django.core.cache.backends.memcached.PyMemcacheCache',
+    'django.core.cache.backends.memcached.PyLibMCCache',
+)
+
+
+def get_version(namespace):
+    """
+    Returns the current shared version number for a cached namespace.
+
+    Parameters:
+    - namespace (str): Name of the cached data set (e.g. "stars.actions").
+
+    Notes:
+    - Versions live in Django's cache so every worker sees the same value.
+      Outside DEBUG and tests that cache is Redis or Memcached (see
+      require_shared_cache), so the check never costs a database query.
+    """
+    key = VERSION_KEY_PREFIX + namespace
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, timeout=None)
+        version = cache.get(key, 1)
+    return version
+
+
+def bump_version(namespace):
+    """
+    Increments the shared version of a namespace, invalidating every
+    per-process copy built from an older version.
+
+    Returns:
+    - int: The new version number.
+    """
+    key = VERSION_KEY_PREFIX + namespace
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+        return cache.incr(key)
+
+
+def require_shared_cache():
+    """
+    Refuses to start a worker whose default cache is not a shared in-memory
+    backend, when settings.REQUIRE_SHARED_CACHE is set (everywhere but DEBUG and tests).
+
+    Logic:
+    - A per-process cache would leave every worker but the one that made an edit
+      with stale catalogs and pages; a database cache would add a query to every
+      version check and cached page.
+
+    Notes:
+    - Called from MainConfig.ready(), so it runs in every process, not only
+      when system checks do.
+    """
+    if not getattr(settings, 'REQUIRE_SHARED_CACHE', False):
+        return
+    backend = settings.CACHES.get('default', {}).get('BACKEND')
+    if backend not in SHARED_MEMORY_BACKENDS:
+        raise ImproperlyConfigured(
+            f'The default cache ({backend}) is not a shared in-memory backend; '
+            f'set REDIS_URL or configure Memcached (see CACHES in settings).'
+        )
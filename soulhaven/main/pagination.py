@@ -0,0 +1,55 @@
+import base64
+import json
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(*values):
+    """
+    Encodes the sort key of the last returned row into an opaque, URL-safe cursor.
+
+    Parameters:
+    - values: JSON-serializable parts of the sort key (e.g. ISO timestamp and id).
+
+    Returns:
+    - str: The cursor string to hand back to the client.
+    """
+    raw = json.dumps(list(values), separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, size):
+    """
+    Decodes a cursor produced by encode_cursor().
+
+    Parameters:
+    - cursor (str): The cursor received from the client.
+    - size (int): Number of sort-key parts the caller expects.
+
+    Raises:
+    - ValueError: If the cursor is malformed.
+
+    Returns:
+    - list: The sort-key parts, in the order they were encoded.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError('Invalid cursor')
+    return values
+
+
+def parse_page_size(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """
+    Parses the `limit` query parameter, clamping it to [1, maximum].
+
+    Raises:
+    - ValueError: If the value is not an integer.
+    """
+    if value in (None, ''):
+        return default
+    return max(1, min(int(value), maximum))
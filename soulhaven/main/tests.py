@@ -1,2 +1,43 @@
-from django.test import TestCase
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
 
+from .caching import require_shared_cache
+from .pagination import decode_cursor, encode_cursor, parse_page_size
+
+
+class PaginationTests(SimpleTestCase):
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor('2026-10-18T09:30:00+00:00', 42)
+        self.assertNotIn('=', cursor)
+        self.assertEqual(decode_cursor(cursor, 2), ['2026-10-18T09:30:00+00:00', 42])
+
+    def test_malformed_cursors_are_rejected(self):
+        for cursor in ('not-base64!', encode_cursor(1), encode_cursor(1, 2, 3), 'eyJhIjoxfQ'):
+            with self.subTest(cursor=cursor), self.assertRaises(ValueError):
+                decode_cursor(cursor, 2)
+
+    def test_page_size_is_clamped(self):
+        self.assertEqual(parse_page_size(None), 50)
+        self.assertEqual(parse_page_size('0'), 1)
+        self.assertEqual(parse_page_size('500'), 200)
+        with self.assertRaises(ValueError):
+            parse_page_size('ten')
+
+
+class RequireSharedCacheTests(SimpleTestCase):
+    def test_local_and_database_caches_are_refused(self):
+        for backend in ('django.core.cache.backends.locmem.LocMemCache', 'django.core.cache.backends.db.DatabaseCache'):
+            with self.subTest(backend=backend), override_settings(
+                REQUIRE_SHARED_CACHE=True, CACHES={'default': {'BACKEND': backend, 'LOCATION': 'soulhaven_cache'}},
+            ), self.assertRaises(ImproperlyConfigured):
+                require_shared_cache()
+
+    @override_settings(REQUIRE_SHARED_CACHE=True, CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://localhost:6379/0',
+    }})
+    def test_redis_passes(self):
+        require_shared_cache()
+
+    @override_settings(REQUIRE_SHARED_CACHE=False)
+    def test_not_required_in_development(self):
+        require_shared_cache()
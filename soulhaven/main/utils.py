@@ -0,0 +1,49 @@
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, set_response_etag
+from django.utils.dateparse import parse_date
+
+
+def parse_day(value):
+    """
+    Parses an optional YYYY-MM-DD query parameter.
+
+    Raises:
+    - ValueError: If the value is present but not a valid date.
+
+    Returns:
+    - date or None
+    """
+    if not value:
+        return None
+    day = parse_date(value)
+    if day is None:
+        raise ValueError('Invalid date')
+    return day
+
+
+def start_of_day(day):
+    """
+    Returns the timezone-aware datetime at which `day` begins, so date filters
+    stay range predicates on indexed datetime columns.
+    """
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def conditional_response(request, response, private=True):
+    """
+    Adds an ETag computed from the response body and answers 304 Not Modified
+    when it matches the request's If-None-Match header.
+
+    Parameters:
+    - request: The current HttpRequest.
+    - response: A fully rendered response (e.g. JsonResponse) for a GET request.
+    - private (bool, optional): Marks the response as per-user (Cache-Control: private).
+
+    Returns:
+    - HttpResponse: Either `response` with an ETag or an empty 304 response.
+    """
+    set_response_etag(response)
+    patch_cache_control(response, private=private, no_cache=True)
+    return get_conditional_response(request, etag=response['ETag'], response=response)
@@ -1,5 +1,5 @@
 from django.http import JsonResponse
-from challenges.models import Challenge
+from challenges.registry import active_challenges
 from articles.models import Article
 from experts.models import Expert
 
@@ -12,7 +12,15 @@ def homepage_data_api(request):
 
     This is used by the frontend to populate the dynamic content.
     """
-    challenges = Challenge.objects.filter(active=True).values('id', 'name', 'description', 'star_reward')
+    challenges = [
+        {
+            'id': challenge.id,
+            'name': challenge.name,
+            'description': challenge.description,
+            'star_reward': challenge.star_reward,
+        }
+        for challenge in active_challenges.all()
+    ]
     article = Article.objects.order_by('-published_date').first()
     experts = Expert.objects.all().values('id', 'name', 'specialization', 'experience')
 
@@ -29,7 +37,7 @@ def homepage_data_api(request):
     } if article else None
 
     return JsonResponse({
-        'challenges': list(challenges),
+        'challenges': challenges,
         'latest_article': article_data,
         'experts': list(experts),
     })
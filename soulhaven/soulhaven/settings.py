@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -94,6 +95,32 @@ DATABASES = {
 }
 
 
+# Cache
+# Shared by every worker: the per-process catalogs (stars, achievements, challenges)
+# compare a version number stored here and cached pages (course catalog) live here.
+# It must be a shared in-memory backend: a per-process cache would leave other
+# workers stale after an edit, and a database cache would add a query to every
+# version check. Production sets REDIS_URL; MainConfig.ready() refuses to start
+# without Redis or Memcached unless DEBUG (the single-process development server),
+# which falls back to local memory. Tests use soulhaven/test_settings.py.
+
+REQUIRE_SHARED_CACHE = not DEBUG
+
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -144,4 +171,14 @@ EMAIL_HOST_PASSWORD = 'your_app_password'  # Not your Gmail password. Use an app
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
 MEDIA_URL = '/media/'
-MEDIA_ROOT = BASE_DIR / 'media'
\ No newline at end of file
+MEDIA_ROOT = BASE_DIR / 'media'
+
+# Star rewards
+# Maximum number of StarAction names each worker keeps in its in-process catalog cache.
+
+STAR_ACTION_CACHE_SIZE = 1024
+
+# Mini-game history
+# Monthly CompletedGame partitions older than this are archived into GameMonthlySummary and dropped.
+
+GAME_HISTORY_RETENTION_MONTHS = 12
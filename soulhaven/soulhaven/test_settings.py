@@ -0,0 +1,17 @@
+"""
+Settings for the test runner:
+
+    python manage.py test --settings=soulhaven.test_settings
+"""
+
+from .settings import *  # noqa: F401,F403
+
+# The test runner is a single process, so local memory is shared by everything
+# it runs, and every run starts from an empty cache.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+REQUIRE_SHARED_CACHE = False
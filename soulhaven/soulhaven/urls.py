@@ -31,5 +31,6 @@ urlpatterns = [
     path('api/articles/', include('articles.urls')),
     path('api/challenges/', include('challenges.urls')),
     path('api/courses/', include('courses.urls')),
+    path('api/stars/', include('stars.urls')),
     path('api/accounts/', include('accounts.api_urls')),
 ]
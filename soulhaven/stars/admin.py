@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import StarAction
+from .models import StarAction, StarCampaign
 
 
 @admin.register(StarAction)
@@ -21,4 +21,29 @@ class StarActionAdmin(admin.ModelAdmin):
         return request.user.is_superuser
 
     def has_delete_permission(self, request, obj=None):
-        return request.user.is_superuser
\ No newline at end of file
+        return request.user.is_superuser
+
+
+@admin.register(StarCampaign)
+class StarCampaignAdmin(admin.ModelAdmin):
+    """
+    Read-only admin view of bulk star campaigns (run via the award_campaign_stars command).
+    """
+    list_display = ('key', 'action', 'amount', 'users_awarded', 'created_at')
+    search_fields = ('key',)
+    ordering = ('-created_at',)
+
+    def has_module_permission(self, request):
+        return request.user.is_superuser
+
+    def has_view_permission(self, request, obj=None):
+        return request.user.is_superuser
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
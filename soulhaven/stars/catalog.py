@@ -0,0 +1,120 @@
+import threading
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.db import transaction
+
+from main.caching import bump_version, get_version
+from .models import StarAction
+
+CATALOG_NAMESPACE = 'stars.actions'
+
+CachedStarAction = namedtuple('CachedStarAction', ['id', 'name', 'amount'])
+
+
+class StarActionCatalog:
+    """
+    Per-process LRU cache mapping StarAction names to their id and amount.
+
+    - Holds at most `maxsize` entries; the least recently used name is evicted first.
+    - Every lookup compares the local copy with the shared catalog version
+      (see main.caching) and drops all entries when another worker bumped it.
+    - Counts hits and misses so the cache's effectiveness can be inspected
+      through stats().
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    def _sync_version(self):
+        version = get_version(CATALOG_NAMESPACE)
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+
+    def _store(self, entry):
+        with self._lock:
+            self._entries[entry.name] = entry
+            self._entries.move_to_end(entry.name)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get(self, name, amount=None):
+        """
+        Returns the cached StarAction for `name`, creating the row if needed.
+
+        Parameters:
+        - name (str): Unique action name.
+        - amount (int, optional): Star amount the caller wants to award. Used as the
+                                  default for new actions; if it differs from the
+                                  stored amount, the row is updated and every
+                                  worker's catalog is invalidated once the
+                                  surrounding transaction commits.
+
+        Returns:
+        - CachedStarAction: (id, name, amount)
+        """
+        with self._lock:
+            self._sync_version()
+            entry = self._entries.get(name)
+            if entry is not None:
+                self._entries.move_to_end(name)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        created = False
+        if entry is None:
+            action, created = StarAction.objects.get_or_create(
+                name=name,
+                defaults={'amount': amount or 0}
+            )
+            entry = CachedStarAction(action.id, action.name, action.amount)
+
+        if amount is not None and amount != entry.amount:
+            StarAction.objects.filter(pk=entry.id).update(amount=amount)
+            # The version is bumped once the update commits; bumping earlier would
+            # let another worker cache the old amount under the new version.
+            transaction.on_commit(self.invalidate)
+            return entry._replace(amount=amount)
+
+        if created:
+            # A row created inside a transaction that later rolls back must not
+            # leave a dangling id behind in the cache.
+            transaction.on_commit(lambda: self._store(entry))
+        else:
+            self._store(entry)
+        return entry
+
+    def invalidate(self):
+        """
+        Drops the local entries and bumps the shared version so other workers
+        drop theirs on their next lookup.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._version = bump_version(CATALOG_NAMESPACE)
+
+    def stats(self):
+        """
+        Returns:
+        - dict: hits, misses, hit_rate, size and maxsize of this process's cache.
+        """
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+        }
+
+
+star_action_catalog = StarActionCatalog(
+    maxsize=getattr(settings, 'STAR_ACTION_CACHE_SIZE', 1024)
+)
@@ -0,0 +1,103 @@
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import Rank, RowNumber
+from django.utils import timezone
+from accounts.models import UserProfile
+from .models import LeaderboardEntry
+
+ENTRY_FIELDS = ('user_id', 'user__username', 'user__userprofile__nickname', 'stars', 'rank', 'position')
+
+
+def record_totals(totals):
+    """
+    Writes new star totals into the leaderboard in one upsert.
+
+    Parameters:
+    - totals (dict): {user_id: stars} for every user whose total just changed.
+
+    Notes:
+    - Only `stars` is updated; rank and position stay as computed by the last
+      refresh_leaderboard() run. Users seen for the first time are unranked until then.
+    """
+    if not totals:
+        return
+    LeaderboardEntry.objects.bulk_create(
+        [LeaderboardEntry(user_id=user_id, stars=stars) for user_id, stars in totals.items()],
+        update_conflicts=True,
+        unique_fields=['user'],
+        update_fields=['stars'],
+    )
+
+
+def refresh_leaderboard(chunk_size=5000):
+    """
+    Recomputes rank and position for every user from UserProfile.stars.
+
+    Parameters:
+    - chunk_size (int, optional): Number of entries upserted per statement.
+
+    Logic:
+    - Ranks are computed by the database with RANK() / ROW_NUMBER() window
+      functions over (stars DESC, user_id) and streamed back in chunks.
+    - Each chunk is upserted into LeaderboardEntry in one statement.
+
+    Returns:
+    - int: Number of ranked users.
+    """
+    now = timezone.now()
+    ranked = UserProfile.objects.annotate(
+        rank=Window(Rank(), order_by=F('stars').desc()),
+        position=Window(RowNumber(), order_by=[F('stars').desc(), F('user_id').asc()]),
+    ).values_list('user_id', 'stars', 'rank', 'position').iterator(chunk_size=chunk_size)
+
+    total = 0
+    batch = []
+    with transaction.atomic():
+        for user_id, stars, rank, position in ranked:
+            batch.append(LeaderboardEntry(
+                user_id=user_id, stars=stars, rank=rank, position=position, refreshed_at=now
+            ))
+            if len(batch) >= chunk_size:
+                total += _upsert_ranked(batch)
+                batch = []
+        total += _upsert_ranked(batch)
+    return total
+
+
+def _upsert_ranked(entries):
+    if entries:
+        LeaderboardEntry.objects.bulk_create(
+            entries,
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=['stars', 'rank', 'position', 'refreshed_at'],
+        )
+    return len(entries)
+
+
+def top_entries(limit):
+    """
+    Returns the first `limit` users by position, read through the position index.
+    """
+    return list(
+        LeaderboardEntry.objects.filter(position__lte=limit).order_by('position').values(*ENTRY_FIELDS)
+    )
+
+
+def entry_for(user):
+    """
+    Returns the user's leaderboard entry as a dict, or None if they are not on the board yet.
+    """
+    return LeaderboardEntry.objects.filter(user=user).values(*ENTRY_FIELDS, 'refreshed_at').first()
+
+
+def entries_around(position, radius):
+    """
+    Returns the entries within `radius` positions of `position` (inclusive).
+    """
+    return list(
+        LeaderboardEntry.objects.filter(
+            position__gte=max(1, position - radius),
+            position__lte=position + radius,
+        ).order_by('position').values(*ENTRY_FIELDS)
+    )
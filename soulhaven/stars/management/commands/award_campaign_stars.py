@@ -0,0 +1,57 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from stars.utils import bulk_award_stars
+
+
+class Command(BaseCommand):
+    """
+    Grants stars to many users at once under an idempotent campaign key.
+
+    Examples:
+    - python manage.py award_campaign_stars --campaign spring-2025 --action "Spring Promotion" --amount 100 --all-users
+    - python manage.py award_campaign_stars --campaign outage-0412 --action "Outage Compensation" --amount 50 --users-file ids.txt
+    """
+    help = 'Award stars to many users in bulk; re-running the same campaign only awards users who missed it.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--campaign', required=True, help='Unique campaign key used for idempotency.')
+        parser.add_argument('--action', required=True, help='StarAction name recorded in the history.')
+        parser.add_argument('--amount', type=int, required=True, help='Stars awarded to each user.')
+        targets = parser.add_mutually_exclusive_group(required=True)
+        targets.add_argument('--all-users', action='store_true', help='Award every active user.')
+        targets.add_argument('--users-file', help='File with one user id per line.')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Users per transaction (default 1000).')
+
+    def handle(self, *args, **options):
+        if options['amount'] <= 0:
+            raise CommandError('--amount must be positive.')
+
+        if options['all_users']:
+            user_ids = User.objects.filter(is_active=True).values_list('id', flat=True)
+        else:
+            try:
+                with open(options['users_file']) as fh:
+                    user_ids = [int(line) for line in fh if line.strip()]
+            except (OSError, ValueError) as exc:
+                raise CommandError(f'Could not read user ids: {exc}')
+
+        def report(processed, total):
+            self.stdout.write(f'  {processed}/{total} users processed')
+
+        try:
+            result = bulk_award_stars(
+                user_ids,
+                action_name=options['action'],
+                amount=options['amount'],
+                campaign_key=options['campaign'],
+                chunk_size=options['chunk_size'],
+                on_chunk=report,
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Campaign '{result['campaign']}': awarded {result['awarded']} users, "
+            f"skipped {result['skipped']} in {result['seconds']:.2f}s "
+            f"({result['users_per_second']:.0f} users/s)."
+        ))
@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+from stars.leaderboard import refresh_leaderboard
+
+
+class Command(BaseCommand):
+    """
+    Recomputes leaderboard ranks and positions. Intended to run periodically (e.g. every few minutes from cron).
+    """
+    help = 'Recompute rank and position of every user on the star leaderboard.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Entries upserted per statement (default 5000).')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        total = refresh_leaderboard(chunk_size=options['chunk_size'])
+        seconds = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f'Ranked {total} users in {seconds:.2f}s.'))
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+from stars.rollups import rollup_star_history
+
+
+class Command(BaseCommand):
+    """
+    Incrementally rolls StarHistory up into the daily star rollup tables.
+
+    Only history rows still pending rollup are consumed, so it is safe to run from cron as often as needed.
+    """
+    help = 'Roll new StarHistory rows up into per-user and global daily star rollups.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10000, help='History rows per transaction (default 10000).')
+        parser.add_argument('--max-batches', type=int, default=None, help='Stop after this many batches.')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        total = batches = 0
+
+        while options['max_batches'] is None or batches < options['max_batches']:
+            consumed = rollup_star_history(batch_size=options['batch_size'])
+            if not consumed:
+                break
+            total += consumed
+            batches += 1
+            self.stdout.write(f'  batch {batches}: {consumed} rows')
+
+        seconds = time.monotonic() - started
+        rate = total / seconds if seconds else 0.0
+        self.stdout.write(self.style.SUCCESS(
+            f'Rolled up {total} history rows in {seconds:.2f}s ({rate:.0f} rows/s).'
+        ))
@@ -0,0 +1,40 @@
+# Generated by Django 5.2 on 2026-10-18 10:41
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_amounts(apps, schema_editor):
+    """
+    Copies the action's current amount onto existing history rows.
+
+    Past per-award amounts were never stored, so the action's amount at
+    migration time is the best available value.
+    """
+    StarAction = apps.get_model('stars', 'StarAction')
+    StarHistory = apps.get_model('stars', 'StarHistory')
+    StarHistory.objects.filter(action__isnull=False).update(
+        amount=Subquery(StarAction.objects.filter(pk=OuterRef('action_id')).values('amount')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stars', '0002_remove_staraction_description'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='starhistory',
+            name='amount',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_amounts, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='starhistory',
+            index=models.Index(fields=['user', 'earned_at'], include=('amount',), name='stars_history_user_time_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2 on 2026-10-18 10:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stars', '0003_starhistory_amount'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StarCampaign',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=100, unique=True)),
+                ('amount', models.IntegerField()),
+                ('users_awarded', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('action', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to='stars.staraction')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='starhistory',
+            name='campaign',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to='stars.starcampaign'),
+        ),
+        migrations.AddConstraint(
+            model_name='starhistory',
+            constraint=models.UniqueConstraint(condition=models.Q(('campaign__isnull', False)), fields=('campaign', 'user'), name='stars_history_campaign_user_uniq'),
+        ),
+    ]
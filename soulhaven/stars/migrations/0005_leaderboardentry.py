@@ -0,0 +1,29 @@
+# Generated by Django 5.2 on 2026-10-18 10:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('stars', '0004_starcampaign'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('stars', models.IntegerField(default=0)),
+                ('rank', models.PositiveIntegerField(blank=True, null=True)),
+                ('position', models.PositiveIntegerField(blank=True, null=True)),
+                ('refreshed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['position'], name='stars_leaderboard_pos_idx')],
+            },
+        ),
+    ]
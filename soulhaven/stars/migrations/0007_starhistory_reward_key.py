@@ -0,0 +1,60 @@
+# Generated by Django 5.2 on 2026-10-18 10:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+CHALLENGE_PREFIX = 'Challenge Completion: '
+
+
+def backfill_challenge_reward_keys(apps, schema_editor):
+    """
+    Keys existing challenge rewards as "challenge:<id>" so they are not granted again.
+
+    - Only names that match exactly one challenge can be resolved.
+    - If a user was rewarded twice for the same challenge, only the earliest entry gets the key.
+    """
+    Challenge = apps.get_model('challenges', 'Challenge')
+    StarHistory = apps.get_model('stars', 'StarHistory')
+
+    ids_by_name = {}
+    for challenge_id, name in Challenge.objects.values_list('id', 'name'):
+        ids_by_name.setdefault(name, []).append(challenge_id)
+
+    seen = set()
+    pending = []
+    rows = StarHistory.objects.filter(action__name__startswith=CHALLENGE_PREFIX).order_by('id').values_list(
+        'id', 'user_id', 'action__name'
+    )
+    for entry_id, user_id, action_name in rows.iterator():
+        ids = ids_by_name.get(action_name[len(CHALLENGE_PREFIX):], [])
+        if len(ids) != 1:
+            continue
+        key = f'challenge:{ids[0]}'
+        if (user_id, key) in seen:
+            continue
+        seen.add((user_id, key))
+        pending.append(StarHistory(id=entry_id, reward_key=key))
+
+    StarHistory.objects.bulk_update(pending, ['reward_key'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stars', '0006_star_rollups'),
+        ('challenges', '0002_challenge_created_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='starhistory',
+            name='reward_key',
+            field=models.CharField(blank=True, max_length=150, null=True),
+        ),
+        migrations.RunPython(backfill_challenge_reward_keys, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='starhistory',
+            constraint=models.UniqueConstraint(condition=models.Q(('reward_key__isnull', False)), fields=('user', 'reward_key'), name='stars_history_reward_key_uniq'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2 on 2026-10-18 11:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def mark_pending_history(apps, schema_editor):
+    """
+    Flags the history rows past the rollup checkpoint as pending; rows at or
+    below it were already rolled up. Only the tail of the table is updated.
+    """
+    RollupCheckpoint = apps.get_model('stars', 'RollupCheckpoint')
+    StarHistory = apps.get_model('stars', 'StarHistory')
+
+    checkpoint = RollupCheckpoint.objects.filter(name='stars.daily').first()
+    last_id = checkpoint.last_id if checkpoint else 0
+    StarHistory.objects.filter(id__gt=last_id).update(rollup_pending=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stars', '0007_starhistory_reward_key'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Existing rows start as rolled up; new rows default to pending below.
+        migrations.AddField(
+            model_name='starhistory',
+            name='rollup_pending',
+            field=models.BooleanField(db_default=False, editable=False),
+        ),
+        migrations.RunPython(mark_pending_history, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='starhistory',
+            name='rollup_pending',
+            field=models.BooleanField(db_default=True, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='starhistory',
+            index=models.Index(condition=models.Q(('rollup_pending', True)), fields=['id'], name='stars_history_pending_idx'),
+        ),
+    ]
@@ -22,6 +22,31 @@ class StarAction(models.Model):
         return f"{self.name} (+{self.amount} ⭐)"
 
 
+class StarCampaign(models.Model):
+    """
+    A one-off bulk star grant (promotion, incident compensation, backfill).
+
+    Fields:
+    - key: Unique operator-chosen key; re-running a campaign with the same key
+           only awards users who have not received it yet.
+    - action: The StarAction recorded on every history row of the campaign.
+    - amount: Number of stars each user receives.
+    - users_awarded: Running count of users who received the campaign's stars.
+    - created_at: Timestamp of when the campaign was first run.
+
+    Methods:
+    - __str__(): Returns the key and amount (e.g. "spring-2025 (+100 ⭐)").
+    """
+    key = models.CharField(max_length=100, unique=True)
+    action = models.ForeignKey(StarAction, on_delete=models.SET_NULL, null=True)
+    amount = models.IntegerField()
+    users_awarded = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.key} (+{self.amount} ⭐)"
+
+
 class StarHistory(models.Model):
     """
     Records when a user earns stars and for which action.
@@ -29,14 +54,157 @@ class StarHistory(models.Model):
     Fields:
     - user: The user who earned the stars.
     - action: The StarAction that granted the stars (nullable on delete).
+    - amount: Number of stars actually awarded, frozen at award time so later
+              edits to the action's amount do not rewrite past entries.
+    - campaign: The StarCampaign that granted the stars, if any.
+    - reward_key: Optional idempotency key (e.g. "challenge:12"); a user can hold
+                  at most one entry per key, so a keyed reward is granted once.
     - earned_at: Timestamp of when the stars were awarded.
+    - rollup_pending: True until the entry has been added to the daily rollups
+                      (see stars.rollups); set by the database on insert.
+
+    Meta:
+    - indexes: (user, earned_at) covering `amount`, so per-user and per-period
+               SUM(amount) queries are answered from the index alone; a partial
+               index on id over the entries still pending rollup.
+    - constraints: A user can receive each campaign, and each reward key, at most once.
 
     Methods:
     - __str__(): Displays a summary like "username - Action Name (+Amount)".
     """
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     action = models.ForeignKey(StarAction, on_delete=models.SET_NULL, null=True)
+    amount = models.IntegerField(default=0)
+    campaign = models.ForeignKey(StarCampaign, on_delete=models.SET_NULL, null=True, blank=True, db_index=False)
+    reward_key = models.CharField(max_length=150, null=True, blank=True)
     earned_at = models.DateTimeField(auto_now_add=True)
+    rollup_pending = models.BooleanField(db_default=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'earned_at'], include=['amount'], name='stars_history_user_time_idx'),
+            models.Index(fields=['id'], condition=models.Q(rollup_pending=True), name='stars_history_pending_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['campaign', 'user'],
+                condition=models.Q(campaign__isnull=False),
+                name='stars_history_campaign_user_uniq',
+            ),
+            models.UniqueConstraint(
+                fields=['user', 'reward_key'],
+                condition=models.Q(reward_key__isnull=False),
+                name='stars_history_reward_key_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        action_name = self.action.name if self.action else 'Deleted action'
+        return f"{self.user.username} - {action_name} (+{self.amount})"
+
+
+class LeaderboardEntry(models.Model):
+    """
+    Materialized position of a user on the global star leaderboard.
+
+    Fields:
+    - user: The ranked user (also the primary key, so "my rank" is a single index lookup).
+    - stars: The user's current star total, kept up to date on every award.
+    - rank: Competition rank by stars as of the last refresh (ties share a rank);
+            null until the user is first ranked.
+    - position: Unique 1-based position as of the last refresh (ties broken by user id),
+                used for top-N and "around me" range scans.
+    - refreshed_at: When rank and position were last recomputed.
+
+    Meta:
+    - indexes: position, so top-N and neighbor lookups are index range scans.
+
+    Methods:
+    - __str__(): Returns a string like "#3 username (1200 ⭐)".
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True)
+    stars = models.IntegerField(default=0)
+    rank = models.PositiveIntegerField(null=True, blank=True)
+    position = models.PositiveIntegerField(null=True, blank=True)
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['position'], name='stars_leaderboard_pos_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.rank} {self.user.username} ({self.stars} ⭐)"
+
+
+class StarDailyRollup(models.Model):
+    """
+    Stars earned by one user on one day in one action category.
+
+    Filled incrementally from StarHistory by the `rollup_stars` management command.
+
+    Fields:
+    - user: The user who earned the stars.
+    - day: The (UTC) day the stars were earned.
+    - category: Action category, i.e. the action name up to the first ":"
+                (e.g. "Game Completion", "Daily Login Reward").
+    - stars: Total stars earned.
+    - awards: Number of StarHistory entries rolled up.
+
+    Meta:
+    - unique_together: One row per user, day and category.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    day = models.DateField()
+    category = models.CharField(max_length=100)
+    stars = models.IntegerField(default=0)
+    awards = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('user', 'day', 'category')
+
+    def __str__(self):
+        return f"{self.user.username} - {self.day} - {self.category} (+{self.stars})"
+
+
+class StarGlobalDailyRollup(models.Model):
+    """
+    Stars earned by all users on one day in one action category.
+
+    Fields:
+    - day: The (UTC) day the stars were earned.
+    - category: Action category (see StarDailyRollup).
+    - stars: Total stars earned.
+    - awards: Number of StarHistory entries rolled up.
+
+    Meta:
+    - unique_together: One row per day and category.
+    """
+    day = models.DateField()
+    category = models.CharField(max_length=100)
+    stars = models.BigIntegerField(default=0)
+    awards = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('day', 'category')
+
+    def __str__(self):
+        return f"{self.day} - {self.category} (+{self.stars})"
+
+
+class RollupCheckpoint(models.Model):
+    """
+    State of an incremental rollup job; runs lock its row to take turns.
+
+    Fields:
+    - name: Unique name of the job (e.g. "stars.daily").
+    - last_id: Highest source row id rolled up so far (informational; pending
+               rows are tracked on the source rows themselves).
+    - updated_at: When the checkpoint last advanced.
+    """
+    name = models.CharField(max_length=100, primary_key=True)
+    last_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f"{self.user.username} - {self.action.name} (+{self.action.amount})"
\ No newline at end of file
+        return f"{self.name} @ {self.last_id}"
@@ -0,0 +1,116 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from .models import RollupCheckpoint, StarDailyRollup, StarGlobalDailyRollup, StarHistory
+
+CHECKPOINT_NAME = 'stars.daily'
+UNCATEGORIZED = 'Other'
+
+
+def action_category(action_name):
+    """
+    Returns the reporting category of an action name: the part before the first ":"
+    ("Game Completion: Puzzles" -> "Game Completion"), or "Other" for deleted actions.
+    """
+    if not action_name:
+        return UNCATEGORIZED
+    return action_name.split(':', 1)[0].strip()[:100]
+
+
+def rollup_star_history(batch_size=10000):
+    """
+    Rolls up the next batch of StarHistory rows still pending rollup.
+
+    Parameters:
+    - batch_size (int, optional): Maximum number of history rows consumed.
+
+    Logic:
+    - Locks the checkpoint row, so concurrent runs process disjoint batches one at a time.
+    - Picks pending rows through the partial pending index. Rows are marked
+      individually rather than behind an id high-water mark, so a row whose
+      transaction commits after higher ids were rolled up is still picked up.
+    - Aggregates the batch in the database grouped by (user, day, action name),
+      folds action names into categories and adds the result to the per-user
+      and global daily rollups with one upsert each.
+    - Clears the batch's pending flags in the same transaction.
+
+    Returns:
+    - int: Number of history rows consumed (0 when caught up).
+    """
+    with transaction.atomic():
+        checkpoint, _ = RollupCheckpoint.objects.get_or_create(name=CHECKPOINT_NAME)
+        checkpoint = RollupCheckpoint.objects.select_for_update().get(pk=checkpoint.pk)
+
+        ids = list(
+            StarHistory.objects.filter(rollup_pending=True)
+            .order_by('id').values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return 0
+
+        grouped = StarHistory.objects.filter(id__in=ids).values(
+            'user_id', day=TruncDate('earned_at'), action_name=F('action__name')
+        ).annotate(stars=Sum('amount'), awards=Count('id')).order_by()
+
+        per_user = defaultdict(lambda: [0, 0])
+        per_day = defaultdict(lambda: [0, 0])
+        for row in grouped:
+            category = action_category(row['action_name'])
+            for totals in (per_user[(row['user_id'], row['day'], category)], per_day[(row['day'], category)]):
+                totals[0] += row['stars']
+                totals[1] += row['awards']
+
+        _add_user_rollups(per_user)
+        _add_global_rollups(per_day)
+
+        StarHistory.objects.filter(id__in=ids).update(rollup_pending=False)
+        checkpoint.last_id = max(checkpoint.last_id, ids[-1])
+        checkpoint.save()
+
+    return len(ids)
+
+
+def _add_user_rollups(per_user):
+    days = {day for _, day, _ in per_user}
+    existing = StarDailyRollup.objects.filter(
+        user_id__in={user_id for user_id, _, _ in per_user},
+        day__in=days,
+    ).values_list('user_id', 'day', 'category', 'stars', 'awards')
+    for user_id, day, category, stars, awards in existing:
+        key = (user_id, day, category)
+        if key in per_user:
+            per_user[key][0] += stars
+            per_user[key][1] += awards
+
+    StarDailyRollup.objects.bulk_create(
+        [
+            StarDailyRollup(user_id=user_id, day=day, category=category, stars=stars, awards=awards)
+            for (user_id, day, category), (stars, awards) in per_user.items()
+        ],
+        update_conflicts=True,
+        unique_fields=['user', 'day', 'category'],
+        update_fields=['stars', 'awards'],
+    )
+
+
+def _add_global_rollups(per_day):
+    existing = StarGlobalDailyRollup.objects.filter(
+        day__in={day for day, _ in per_day}
+    ).values_list('day', 'category', 'stars', 'awards')
+    for day, category, stars, awards in existing:
+        key = (day, category)
+        if key in per_day:
+            per_day[key][0] += stars
+            per_day[key][1] += awards
+
+    StarGlobalDailyRollup.objects.bulk_create(
+        [
+            StarGlobalDailyRollup(day=day, category=category, stars=stars, awards=awards)
+            for (day, category), (stars, awards) in per_day.items()
+        ],
+        update_conflicts=True,
+        unique_fields=['day', 'category'],
+        update_fields=['stars', 'awards'],
+    )
@@ -0,0 +1,33 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+from .catalog import star_action_catalog
+from .leaderboard import record_totals
+from .models import StarAction
+
+# Sent inside the awarding transaction whenever users' star totals change.
+# Keyword arguments: totals — {user_id: new star total}.
+stars_changed = Signal()
+
+
+@receiver(post_save, sender=StarAction)
+@receiver(post_delete, sender=StarAction)
+def invalidate_star_action_catalog(sender, instance, created=False, **kwargs):
+    """
+    Signal: Invalidates every worker's StarAction catalog cache when an action
+    is edited (e.g. through the admin) or deleted.
+
+    - Newly created actions cannot be stale in any cache, so they are skipped.
+    - The invalidation is deferred until the transaction commits, so no worker
+      can cache the pre-commit row after the version was bumped.
+    """
+    if not created:
+        transaction.on_commit(star_action_catalog.invalidate)
+
+
+@receiver(stars_changed)
+def update_leaderboard_totals(sender, totals, **kwargs):
+    """
+    Signal: Keeps leaderboard star totals current as stars are awarded.
+    """
+    record_totals(totals)
@@ -1,2 +1,285 @@
-from django.test import TestCase
+import threading
 
+from django.contrib.auth.models import AnonymousUser, User
+from django.db import connection, connections
+from django.test import RequestFactory, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import UserProfile
+from .catalog import StarActionCatalog, star_action_catalog
+from .leaderboard import entries_around, refresh_leaderboard, top_entries
+from .models import LeaderboardEntry, StarAction, StarDailyRollup, StarGlobalDailyRollup, StarHistory
+from .rollups import rollup_star_history
+from .utils import award_stars, bulk_award_stars, star_total
+from .views import leaderboard_around_me_api, leaderboard_me_api, leaderboard_top_api
+
+
+class AwardStarsTests(TestCase):
+    def setUp(self):
+        star_action_catalog.invalidate()
+        self.user = User.objects.create_user(username='alice', password='pass')
+        UserProfile.objects.get_or_create(user=self.user)
+
+    def test_award_updates_totals_and_level(self):
+        result = award_stars(self.user, 'Course Completion', amount=1200)
+
+        profile = UserProfile.objects.get(user=self.user)
+        self.assertEqual(result['stars'], profile.stars)
+        self.assertEqual(result['level'], 2)
+        self.assertEqual(profile.level, 2)
+        self.assertEqual(StarHistory.objects.filter(user=self.user).count(), 1)
+
+    def test_level_never_decreases(self):
+        UserProfile.objects.filter(user=self.user).update(level=5)
+
+        result = award_stars(self.user, 'Daily Login Reward', amount=50)
+
+        self.assertEqual(result['level'], 5)
+
+    def test_cached_profile_is_kept_in_sync(self):
+        profile = self.user.userprofile
+        award_stars(self.user, 'Daily Login Reward', amount=50)
+
+        profile.save()
+
+        self.assertEqual(UserProfile.objects.get(user=self.user).stars, profile.stars)
+
+    def test_award_uses_fewer_queries(self):
+        StarAction.objects.create(name='Daily Login Reward', amount=50)
+        award_stars(self.user, 'Daily Login Reward', amount=50)
+
+        with CaptureQueriesContext(connection) as ctx:
+            award_stars(self.user, 'Daily Login Reward', amount=50)
+
+        # History insert, profile UPDATE and the read-back, leaderboard upsert,
+        # plus the savepoint pair opened by transaction.atomic(); the action
+        # comes from the catalog.
+        self.assertLessEqual(len(ctx.captured_queries), 6)
+        self.assertFalse(any('stars_staraction' in q['sql'] for q in ctx.captured_queries))
+
+    def test_history_keeps_amount_awarded_at_the_time(self):
+        award_stars(self.user, 'Daily Login Reward', amount=50)
+        award_stars(self.user, 'Daily Login Reward', amount=75)
+
+        amounts = list(StarHistory.objects.filter(user=self.user).order_by('id').values_list('amount', flat=True))
+        self.assertEqual(amounts, [50, 75])
+        self.assertEqual(star_total(self.user), 125)
+        self.assertEqual(star_total(self.user), UserProfile.objects.get(user=self.user).stars)
+
+    def test_reward_key_is_granted_once(self):
+        first = award_stars(self.user, 'Challenge Completion: Read', amount=100, reward_key='challenge:1')
+        second = award_stars(self.user, 'Challenge Completion: Read', amount=100, reward_key='challenge:1')
+
+        self.assertTrue(first['awarded'])
+        self.assertFalse(second['awarded'])
+        self.assertEqual(UserProfile.objects.get(user=self.user).stars, 100)
+        self.assertEqual(StarHistory.objects.filter(user=self.user).count(), 1)
+
+
+class BulkAwardStarsTests(TestCase):
+    def setUp(self):
+        star_action_catalog.invalidate()
+        self.users = [User.objects.create_user(username=f'user{i}', password='pass') for i in range(5)]
+        for user in self.users:
+            UserProfile.objects.get_or_create(user=user)
+
+    def test_bulk_award_is_idempotent_per_campaign(self):
+        ids = [user.id for user in self.users]
+
+        first = bulk_award_stars(ids[:3], 'Spring Promotion', 1000, 'spring', chunk_size=2)
+        second = bulk_award_stars(ids, 'Spring Promotion', 1000, 'spring', chunk_size=2)
+
+        self.assertEqual(first['awarded'], 3)
+        self.assertEqual(second['awarded'], 2)
+        self.assertEqual(second['skipped'], 3)
+        for profile in UserProfile.objects.filter(user_id__in=ids):
+            self.assertEqual(profile.stars, 1000)
+            self.assertEqual(profile.level, 2)
+        self.assertEqual(StarHistory.objects.filter(campaign__key='spring').count(), 5)
+
+    def test_campaign_key_cannot_change_amount(self):
+        bulk_award_stars([self.users[0].id], 'Spring Promotion', 100, 'spring')
+
+        with self.assertRaises(ValueError):
+            bulk_award_stars([self.users[0].id], 'Spring Promotion', 200, 'spring')
+
+
+class LeaderboardTests(TestCase):
+    def setUp(self):
+        star_action_catalog.invalidate()
+        self.users = []
+        for i, stars in enumerate([300, 100, 300, 50]):
+            user = User.objects.create_user(username=f'player{i}', password='pass')
+            UserProfile.objects.get_or_create(user=user)
+            award_stars(user, 'Game Completion: Puzzles', amount=stars)
+            self.users.append(user)
+
+    def test_awards_update_live_totals(self):
+        entry = LeaderboardEntry.objects.get(user=self.users[1])
+        self.assertEqual(entry.stars, 100)
+        self.assertIsNone(entry.position)
+
+    def test_refresh_ranks_with_ties(self):
+        self.assertEqual(refresh_leaderboard(chunk_size=2), 4)
+
+        top = top_entries(3)
+        self.assertEqual([e['user_id'] for e in top], [self.users[0].id, self.users[2].id, self.users[1].id])
+        self.assertEqual([e['rank'] for e in top], [1, 1, 3])
+
+        around = entries_around(LeaderboardEntry.objects.get(user=self.users[3]).position, 1)
+        self.assertEqual([e['position'] for e in around], [3, 4])
+
+    def test_top_api_requires_login(self):
+        request = RequestFactory().get('/api/stars/leaderboard/')
+        request.user = AnonymousUser()
+        self.assertEqual(leaderboard_top_api(request).status_code, 302)
+
+        request.user = self.users[0]
+        self.assertEqual(leaderboard_top_api(request).status_code, 200)
+
+    def test_views_only_accept_get(self):
+        for view in (leaderboard_top_api, leaderboard_me_api, leaderboard_around_me_api):
+            request = RequestFactory().post('/api/stars/leaderboard/')
+            request.user = self.users[0]
+            with self.subTest(view=view.__name__):
+                self.assertEqual(view(request).status_code, 405)
+
+
+class StarRollupTests(TestCase):
+    def setUp(self):
+        star_action_catalog.invalidate()
+        self.user = User.objects.create_user(username='carol', password='pass')
+        UserProfile.objects.get_or_create(user=self.user)
+
+    def test_rollup_is_incremental(self):
+        award_stars(self.user, 'Game Completion: Puzzles', amount=50)
+        award_stars(self.user, 'Game Completion: Mandalas', amount=50)
+        self.assertEqual(rollup_star_history(batch_size=1), 1)
+        self.assertEqual(rollup_star_history(), 1)
+        self.assertEqual(rollup_star_history(), 0)
+
+        award_stars(self.user, 'Daily Login Reward', amount=10)
+        rollup_star_history()
+
+        rollups = {r.category: r for r in StarDailyRollup.objects.filter(user=self.user)}
+        self.assertEqual(rollups['Game Completion'].stars, 100)
+        self.assertEqual(rollups['Game Completion'].awards, 2)
+        self.assertEqual(rollups['Daily Login Reward'].stars, 10)
+        self.assertEqual(StarGlobalDailyRollup.objects.get(category='Game Completion').stars, 100)
+
+    def test_row_committed_after_higher_ids_is_not_skipped(self):
+        award_stars(self.user, 'Game Completion: Puzzles', amount=50)
+        award_stars(self.user, 'Game Completion: Mandalas', amount=30)
+        late = StarHistory.objects.filter(user=self.user).order_by('id').first()
+        # Stand-in for a transaction that took its id first but commits after the next run.
+        StarHistory.objects.filter(pk=late.pk).delete()
+
+        self.assertEqual(rollup_star_history(), 1)
+        StarHistory.objects.create(id=late.id, user=self.user, action_id=late.action_id, amount=late.amount)
+
+        self.assertEqual(rollup_star_history(), 1)
+        self.assertEqual(StarDailyRollup.objects.get(user=self.user, category='Game Completion').stars, 80)
+
+
+class StarActionCatalogTests(TestCase):
+    def setUp(self):
+        self.catalog = StarActionCatalog(maxsize=2)
+        self.catalog.invalidate()
+
+    def test_hits_and_misses_are_counted(self):
+        StarAction.objects.create(name='Daily Login Reward', amount=50)
+
+        self.catalog.get('Daily Login Reward')
+        with self.assertNumQueries(0):
+            entry = self.catalog.get('Daily Login Reward')
+
+        self.assertEqual(entry.amount, 50)
+        self.assertEqual(self.catalog.stats()['hits'], 1)
+        self.assertEqual(self.catalog.stats()['misses'], 1)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        for name in ('a', 'b', 'c'):
+            StarAction.objects.create(name=name, amount=1)
+            self.catalog.get(name)
+
+        self.assertEqual(self.catalog.stats()['size'], 2)
+        self.assertNotIn('a', self.catalog._entries)
+
+    def test_admin_edit_invalidates_catalog(self):
+        action = StarAction.objects.create(name='Daily Login Reward', amount=50)
+        self.catalog.get('Daily Login Reward')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            action.amount = 75
+            action.save()
+
+        self.assertEqual(self.catalog.get('Daily Login Reward').amount, 75)
+
+    def test_catalogs_sharing_a_version_key_invalidate_each_other(self):
+        # Two catalogs stand in for two workers; they only share the cached version key.
+        other = StarActionCatalog(maxsize=2)
+        StarAction.objects.create(name='Daily Login Reward', amount=50)
+        self.catalog.get('Daily Login Reward')
+        other.get('Daily Login Reward')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.catalog.get('Daily Login Reward', amount=75)
+
+        self.assertEqual(other.get('Daily Login Reward').amount, 75)
+        self.assertEqual(other.stats()['misses'], 2)
+
+    def test_version_is_bumped_only_on_commit(self):
+        action = StarAction.objects.create(name='Daily Login Reward', amount=50)
+        self.catalog.get('Daily Login Reward')
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            action.amount = 75
+            action.save()
+            # Before the commit another worker still reads the committed row, which
+            # must stay under the old version rather than be cached under a new one.
+            self.assertEqual(self.catalog.get('Daily Login Reward').amount, 50)
+
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        self.assertEqual(self.catalog.get('Daily Login Reward').amount, 75)
+
+
+class ConcurrentAwardStarsTests(TransactionTestCase):
+    THREADS = 8
+    AWARDS_PER_THREAD = 25
+    AMOUNT = 10
+
+    def setUp(self):
+        star_action_catalog.invalidate()
+        self.user = User.objects.create_user(username='bob', password='pass')
+        UserProfile.objects.get_or_create(user=self.user)
+        StarAction.objects.create(name='Game Completion: Puzzles', amount=self.AMOUNT)
+
+    def test_concurrent_awards_lose_no_updates(self):
+        errors = []
+        barrier = threading.Barrier(self.THREADS)
+
+        def worker():
+            user = User.objects.get(pk=self.user.pk)
+            try:
+                barrier.wait()
+                for _ in range(self.AWARDS_PER_THREAD):
+                    award_stars(user, 'Game Completion: Puzzles', amount=self.AMOUNT)
+            except Exception as exc:  # pragma: no cover - surfaced below
+                errors.append(exc)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+
+        awards = self.THREADS * self.AWARDS_PER_THREAD
+        profile = UserProfile.objects.get(user=self.user)
+        self.assertEqual(profile.stars, awards * self.AMOUNT)
+        self.assertEqual(profile.level, (awards * self.AMOUNT) // 1000 + 1)
+        self.assertEqual(StarHistory.objects.filter(user=self.user).count(), awards)
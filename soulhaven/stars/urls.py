@@ -0,0 +1,10 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('leaderboard/', views.leaderboard_top_api, name='leaderboard_top_api'),
+    path('leaderboard/me/', views.leaderboard_me_api, name='leaderboard_me_api'),
+    path('leaderboard/around-me/', views.leaderboard_around_me_api, name='leaderboard_around_me_api'),
+    path('reports/', views.star_report_api, name='star_report_api'),
+    path('reports/me/', views.my_star_report_api, name='my_star_report_api'),
+]
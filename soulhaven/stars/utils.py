@@ -1,55 +1,337 @@
-from .models import StarAction, StarHistory
+import time
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.db.models import F, Sum
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from .catalog import star_action_catalog
+from .models import StarCampaign, StarHistory
+from .signals import stars_changed
 from accounts.models import UserProfile
 
-def award_stars(user, action_name, amount=None):
+STARS_PER_LEVEL = 1000
+
+
+def level_expression(amount):
+    """
+    Builds the database-side expression for a profile's level after adding `amount` stars.
+
+    The level never goes down: it is the greater of the current level and
+    (new star total // STARS_PER_LEVEL) + 1. Both sides of the UPDATE's SET
+    clause see the pre-update row, so `stars` here is the old total.
+    """
+    return Greatest(F('level'), (F('stars') + amount) / STARS_PER_LEVEL + 1)
+
+
+def apply_star_delta(user_id, amount):
+    """
+    Atomically adds `amount` stars to a user's profile and recomputes the level.
+
+    Parameters:
+    - user_id (int): Primary key of the user whose profile is updated.
+    - amount (int): Number of stars to add.
+
+    Logic:
+    - Issues a single UPDATE with F() expressions, so concurrent awards for the
+      same user are serialized by the row lock instead of overwriting each other.
+    - Reads the new totals back while the row lock is still held (must be called
+      inside a transaction).
+
+    Returns:
+    - tuple: (stars, level) after the update.
+    """
+    UserProfile.objects.filter(user_id=user_id).update(
+        stars=F('stars') + amount,
+        level=level_expression(amount),
+    )
+    return UserProfile.objects.filter(user_id=user_id).values_list('stars', 'level').get()
+
+
+def _sync_cached_profile(user, stars, level):
+    """
+    Keeps an already-loaded `user.userprofile` in step with the database so a later
+    `profile.save()` on the same instance does not write stale totals back.
+    """
+    if User.userprofile.is_cached(user):
+        user.userprofile.stars = stars
+        user.userprofile.level = level
+
+
+def insert_history(rows):
+    """
+    Inserts StarHistory rows in one statement, skipping rows whose reward key
+    the user already holds.
+
+    Parameters:
+    - rows (list): (user_id, action_id, amount, reward_key) tuples; reward_key may be None.
+
+    Logic:
+    - INSERT ... ON CONFLICT DO NOTHING against the partial unique index on
+      (user, reward_key), so concurrent duplicate requests cannot both insert.
+
+    Returns:
+    - list: (user_id, amount) for every row actually inserted.
+    """
+    if not rows:
+        return []
+
+    opts = StarHistory._meta
+    qn = connection.ops.quote_name
+    columns = ', '.join(qn(opts.get_field(name).column) for name in ('user', 'action', 'amount', 'reward_key', 'earned_at'))
+    values = ', '.join(['(%s, %s, %s, %s, %s)'] * len(rows))
+    now = timezone.now()
+    params = [value for row in rows for value in (*row, now)]
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {qn(opts.db_table)} ({columns}) VALUES {values} "
+            f"ON CONFLICT ({qn('user_id')}, {qn('reward_key')}) WHERE {qn('reward_key')} IS NOT NULL DO NOTHING "
+            f"RETURNING {qn('user_id')}, {qn('amount')}",
+            params,
+        )
+        return cursor.fetchall()
+
+
+def award_stars(user, action_name, amount=None, reward_key=None):
     """
     Centralized function to award stars to a user for a specific action.
 
     Parameters:
     - user (User): The user receiving the stars.
     - action_name (str): A unique name describing the action (e.g., "Daily Login Reward").
-    - amount (int, optional): Override for star amount to award. 
+    - amount (int, optional): Override for star amount to award.
                               If None and the action exists, uses the stored amount.
+    - reward_key (str, optional): Idempotency key (e.g. "challenge:12"). A keyed
+                                  reward is granted at most once per user, even
+                                  under concurrent duplicate requests.
 
     Logic:
-    - Retrieves or creates a StarAction by name.
+    - Resolves the StarAction through the per-process catalog cache, creating it if needed.
     - If the action already exists and amount differs, updates the stored amount.
-    - Creates a StarHistory entry for the user and the action.
-    - Increases the user's star count and updates their level (1 level per 1000 stars).
+    - In one transaction, inserts the StarHistory entry (a no-op if the reward key
+      was already used), then increments the user's star count and level
+      (1 level per 1000 stars) with a single UPDATE and sends `stars_changed`
+      (which updates the leaderboard).
 
     Returns:
     - dict: {
         'name': str — name of the action,
         'amount': int — stars awarded,
-        'awarded': True,
-        'level': int — new user level,
-        'stars': int — total stars after award
+        'awarded': bool — False if the reward key had already been used,
+        'level': int or None — new user level (None if not awarded),
+        'stars': int or None — total stars after award (None if not awarded)
+      }
+    """
+    action = star_action_catalog.get(action_name, amount)
+    stars = level = None
+
+    with transaction.atomic():
+        awarded = bool(insert_history([(user.pk, action.id, action.amount, reward_key)]))
+        if awarded:
+            stars, level = apply_star_delta(user.pk, action.amount)
+            stars_changed.send(sender=StarHistory, totals={user.pk: stars})
+
+    if awarded:
+        _sync_cached_profile(user, stars, level)
+
+    return {
+        'name': action.name,
+        'amount': action.amount,
+        'awarded': awarded,
+        'level': level,
+        'stars': stars,
+    }
+
+
+def award_stars_many(user, awards):
+    """
+    Awards several star rewards to one user in one batch.
+
+    Parameters:
+    - user (User): The user receiving the stars.
+    - awards (list): (action_name, amount, reward_key) tuples; reward_key may be None.
+
+    Logic:
+    - Resolves every action through the catalog cache.
+    - Inserts all history rows with one INSERT ... ON CONFLICT DO NOTHING
+      (rewards whose key was already used are skipped).
+    - Applies the sum of the inserted amounts with a single profile UPDATE.
+
+    Returns:
+    - dict: {
+        'awarded': int — number of rewards actually granted,
+        'amount': int — total stars added,
+        'level': int or None — new user level (None if nothing was awarded),
+        'stars': int or None — total stars after award (None if nothing was awarded)
       }
     """
-    action, created = StarAction.objects.get_or_create(
-        name=action_name,
-        defaults={'amount': amount or 0}
+    rows = []
+    for action_name, amount, reward_key in awards:
+        action = star_action_catalog.get(action_name, amount)
+        rows.append((user.pk, action.id, action.amount, reward_key))
+
+    stars = level = None
+    with transaction.atomic():
+        inserted = insert_history(rows)
+        total = sum(amount for _, amount in inserted)
+        if inserted:
+            stars, level = apply_star_delta(user.pk, total)
+            stars_changed.send(sender=StarHistory, totals={user.pk: stars})
+
+    if inserted:
+        _sync_cached_profile(user, stars, level)
+
+    return {
+        'awarded': len(inserted),
+        'amount': total,
+        'level': level,
+        'stars': stars,
+    }
+
+
+def award_stars_to_users(user_ids, action_name, amount, reward_key):
+    """
+    Grants the same keyed reward to many users with a fixed number of queries.
+
+    Parameters:
+    - user_ids (iterable of int): Users who should receive the reward.
+    - action_name (str): StarAction recorded on every history row.
+    - amount (int): Stars each user receives.
+    - reward_key (str): Idempotency key (e.g. "challenge:12"); users who already
+                        hold it are skipped, so reruns and races never double-award.
+
+    Logic:
+    - One INSERT ... ON CONFLICT DO NOTHING for all history rows, one set-wise
+      profile UPDATE for the users actually inserted, and one read-back of their
+      totals for `stars_changed`, all in one transaction.
+
+    Returns:
+    - list: Ids of the users who were awarded.
+    """
+    action = star_action_catalog.get(action_name, amount)
+    with transaction.atomic():
+        inserted = insert_history([(user_id, action.id, action.amount, reward_key) for user_id in user_ids])
+        awarded = [user_id for user_id, _ in inserted]
+        if awarded:
+            UserProfile.objects.filter(user_id__in=awarded).update(
+                stars=F('stars') + action.amount,
+                level=level_expression(action.amount),
+            )
+            stars_changed.send(sender=StarHistory, totals=dict(
+                UserProfile.objects.filter(user_id__in=awarded).values_list('user_id', 'stars')
+            ))
+    return awarded
+
+
+def star_total(user, start=None, end=None):
+    """
+    Sums the stars a user earned, optionally within a time range.
+
+    Parameters:
+    - user (User): The user whose history is summed.
+    - start (datetime, optional): Inclusive lower bound on earned_at.
+    - end (datetime, optional): Exclusive upper bound on earned_at.
+
+    Notes:
+    - Reads StarHistory.amount only, which the (user, earned_at) covering index
+      serves without touching the table or joining StarAction.
+
+    Returns:
+    - int: Total stars earned (0 if there are no entries).
+    """
+    history = StarHistory.objects.filter(user=user)
+    if start is not None:
+        history = history.filter(earned_at__gte=start)
+    if end is not None:
+        history = history.filter(earned_at__lt=end)
+    return history.aggregate(total=Sum('amount'))['total'] or 0
+
+
+def bulk_award_stars(user_ids, action_name, amount, campaign_key, chunk_size=1000, on_chunk=None):
+    """
+    Awards the same number of stars to many users at once, at most once per user per campaign.
+
+    Parameters:
+    - user_ids (iterable of int): Users who should receive the stars.
+    - action_name (str): StarAction recorded on every history row (e.g. "Spring Promotion").
+    - amount (int): Stars each user receives.
+    - campaign_key (str): Unique key of the campaign; re-running with the same key
+                          skips users who were already awarded.
+    - chunk_size (int, optional): Number of users handled per transaction.
+    - on_chunk (callable, optional): Called as on_chunk(processed, total) after each chunk.
+
+    Logic:
+    - Gets or creates the StarCampaign and refuses to reuse a key with a different amount.
+    - Per chunk, in one transaction holding the campaign row lock (so concurrent runs
+      of the same campaign cannot double-award):
+        - selects users with a profile who have not received the campaign yet,
+        - inserts their StarHistory rows with one bulk_create,
+        - increments their stars and level with one set-wise UPDATE,
+        - sends `stars_changed` with the new totals.
+
+    Raises:
+    - ValueError: If the campaign already exists with a different amount.
+
+    Returns:
+    - dict: {
+        'campaign': str — campaign key,
+        'awarded': int — users awarded by this run,
+        'skipped': int — users already awarded or without a profile,
+        'seconds': float — wall-clock duration,
+        'users_per_second': float — throughput of this run
+      }
+    """
+    action = star_action_catalog.get(action_name, amount)
+    campaign, created = StarCampaign.objects.get_or_create(
+        key=campaign_key,
+        defaults={'action_id': action.id, 'amount': amount}
     )
+    if campaign.amount != amount:
+        raise ValueError(
+            f"Campaign '{campaign_key}' already awarded {campaign.amount} stars, not {amount}."
+        )
 
-    if amount is not None and not created and amount != action.amount:
-        action.amount = amount
-        action.save()
+    user_ids = sorted(set(user_ids))
+    awarded = 0
+    started = time.monotonic()
 
-    StarHistory.objects.create(user=user, action=action)
+    for offset in range(0, len(user_ids), chunk_size):
+        chunk = user_ids[offset:offset + chunk_size]
 
-    profile = user.userprofile
-    profile.stars += action.amount
+        with transaction.atomic():
+            StarCampaign.objects.select_for_update().filter(pk=campaign.pk).get()
 
-    new_level = (profile.stars // 1000) + 1
-    if new_level > profile.level:
-        profile.level = new_level
+            pending = list(
+                UserProfile.objects.filter(user_id__in=chunk).exclude(
+                    user_id__in=StarHistory.objects.filter(campaign=campaign).values('user_id')
+                ).values_list('user_id', flat=True)
+            )
+            if pending:
+                StarHistory.objects.bulk_create([
+                    StarHistory(user_id=user_id, action_id=campaign.action_id, amount=amount, campaign=campaign)
+                    for user_id in pending
+                ])
+                UserProfile.objects.filter(user_id__in=pending).update(
+                    stars=F('stars') + amount,
+                    level=level_expression(amount),
+                )
+                StarCampaign.objects.filter(pk=campaign.pk).update(
+                    users_awarded=F('users_awarded') + len(pending)
+                )
+                stars_changed.send(sender=StarHistory, totals=dict(
+                    UserProfile.objects.filter(user_id__in=pending).values_list('user_id', 'stars')
+                ))
+            awarded += len(pending)
 
-    profile.save()
+        if on_chunk:
+            on_chunk(offset + len(chunk), len(user_ids))
 
+    seconds = time.monotonic() - started
     return {
-        'name': action.name,
-        'amount': action.amount,
-        'awarded': True,
-        'level': profile.level,
-        'stars': profile.stars,
+        'campaign': campaign.key,
+        'awarded': awarded,
+        'skipped': len(user_ids) - awarded,
+        'seconds': seconds,
+        'users_per_second': awarded / seconds if seconds else 0.0,
     }
@@ -1,4 +1,203 @@
-from django.shortcuts import render
+from datetime import timedelta
+
 from django.contrib.auth.decorators import login_required
-from .models import StarHistory
+from django.db.models import F, Sum
+from django.db.models.functions import TruncWeek
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.http import require_GET
+from main.pagination import parse_page_size
+from main.utils import parse_day
+from .leaderboard import entries_around, entry_for, top_entries
+from .models import StarDailyRollup, StarGlobalDailyRollup
+
+MAX_LEADERBOARD_LIMIT = 100
+MAX_LEADERBOARD_RADIUS = 25
+DEFAULT_REPORT_DAYS = 30
+MAX_REPORT_DAYS = 366
+
+
+def _serialize_entry(entry):
+    return {
+        'position': entry['position'],
+        'rank': entry['rank'],
+        'username': entry['user__username'],
+        'nickname': entry['user__userprofile__nickname'],
+        'stars': entry['stars'],
+    }
+
+
+@require_GET
+@login_required
+def leaderboard_top_api(request):
+    """
+    API endpoint returning the top users by stars.
+
+    - Requires login: entries include usernames, which are login identifiers.
+
+    Query parameters:
+    - limit: Number of users to return (default 10, max 100).
+
+    Returns:
+    - 200: {'leaderboard': [...]}
+    - 400: Invalid limit
+
+    Method: GET
+    """
+    try:
+        limit = parse_page_size(request.GET.get('limit'), 10, MAX_LEADERBOARD_LIMIT)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid limit'}, status=400)
+
+    return JsonResponse({
+        'leaderboard': [_serialize_entry(entry) for entry in top_entries(limit)]
+    })
+
+
+@require_GET
+@login_required
+def leaderboard_me_api(request):
+    """
+    API endpoint returning the authenticated user's leaderboard rank.
+
+    - Rank and position are as of the last leaderboard refresh; stars are live.
+
+    Returns:
+    - 200: Entry fields plus 'refreshed_at'
+    - 404: The user has not been ranked yet
+
+    Method: GET
+    """
+    entry = entry_for(request.user)
+    if entry is None or entry['position'] is None:
+        return JsonResponse({'error': 'Not ranked yet'}, status=404)
+
+    data = _serialize_entry(entry)
+    data['refreshed_at'] = entry['refreshed_at'].isoformat()
+    return JsonResponse(data)
+
+
+@require_GET
+@login_required
+def leaderboard_around_me_api(request):
+    """
+    API endpoint returning the users ranked just above and below the authenticated user.
+
+    Query parameters:
+    - radius: Number of neighbors on each side (default 5, max 25).
+
+    Returns:
+    - 200: {'position': int, 'leaderboard': [...]}
+    - 400: Invalid radius
+    - 404: The user has not been ranked yet
+
+    Method: GET
+    """
+    try:
+        radius = parse_page_size(request.GET.get('radius'), 5, MAX_LEADERBOARD_RADIUS)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid radius'}, status=400)
+
+    entry = entry_for(request.user)
+    if entry is None or entry['position'] is None:
+        return JsonResponse({'error': 'Not ranked yet'}, status=404)
+
+    return JsonResponse({
+        'position': entry['position'],
+        'leaderboard': [_serialize_entry(e) for e in entries_around(entry['position'], radius)],
+    })
+
+
+def _report_rows(rollups, request):
+    """
+    Filters a rollup queryset by the report query parameters and groups it by period.
+
+    Query parameters:
+    - start / end: Inclusive date range (YYYY-MM-DD); defaults to the last 30 days,
+                   and may span at most 366 days.
+    - period: "day" (default) or "week" (weeks start on Monday).
+    - category: Only this action category (e.g. "Game Completion").
+
+    Raises:
+    - ValueError: On an invalid date, period or range.
+
+    Returns:
+    - list: [{'period': 'YYYY-MM-DD', 'category': str, 'stars': int, 'awards': int}, ...]
+    """
+    end = parse_day(request.GET.get('end')) or timezone.now().date()
+    start = parse_day(request.GET.get('start')) or end - timedelta(days=DEFAULT_REPORT_DAYS - 1)
+    if start > end or (end - start).days >= MAX_REPORT_DAYS:
+        raise ValueError('Invalid date range')
+
+    period = request.GET.get('period', 'day')
+    if period not in ('day', 'week'):
+        raise ValueError('Invalid period')
+
+    rollups = rollups.filter(day__gte=start, day__lte=end)
+    category = request.GET.get('category')
+    if category:
+        rollups = rollups.filter(category=category)
+
+    bucket = F('day') if period == 'day' else TruncWeek('day')
+    rows = rollups.values('category', bucket_start=bucket).annotate(
+        total_stars=Sum('stars'), total_awards=Sum('awards')
+    ).order_by('bucket_start', 'category')
+
+    return [
+        {
+            'period': row['bucket_start'].isoformat(),
+            'category': row['category'],
+            'stars': row['total_stars'],
+            'awards': row['total_awards'],
+        }
+        for row in rows
+    ]
+
+
+@login_required
+def star_report_api(request):
+    """
+    API endpoint returning platform-wide stars earned per day or week and action category.
+
+    - Staff only.
+    - Reads only the global daily rollups (see the rollup_stars command), never StarHistory.
+    - Query parameters: see _report_rows().
+
+    Returns:
+    - 200: {'report': [...]}
+    - 400: Invalid parameters
+    - 403: Not a staff user
+
+    Method: GET
+    """
+    if not request.user.is_staff:
+        return JsonResponse({'error': 'Forbidden'}, status=403)
+
+    try:
+        report = _report_rows(StarGlobalDailyRollup.objects.all(), request)
+    except ValueError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+
+    return JsonResponse({'report': report})
+
+
+@login_required
+def my_star_report_api(request):
+    """
+    API endpoint returning the authenticated user's stars per day or week and action category.
+
+    - Reads only the per-user daily rollups, never StarHistory.
+    - Query parameters: see _report_rows().
+
+    Returns:
+    - 200: {'report': [...]}
+    - 400: Invalid parameters
+
+    Method: GET
+    """
+    try:
+        report = _report_rows(StarDailyRollup.objects.filter(user=request.user), request)
+    except ValueError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
 
+    return JsonResponse({'report': report})